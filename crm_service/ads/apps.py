@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AdsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ads"
+
+    def ready(self) -> None:
+        """Подключает обработчики сигналов предрасчитанной статистики."""
+        from . import signals  # noqa: F401
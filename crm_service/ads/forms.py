@@ -1,11 +1,15 @@
 from django import forms
 from django.core.exceptions import ValidationError
-from core.base import BaseForm
+from core.base import BaseForm, ReferenceChoiceField
 
 from .models import AdsCompany
 from .services import AdsCompanyService
 
 
+class PromotionChannelChoiceField(ReferenceChoiceField):
+    dataset = "promotion_channels"
+
+
 class AdsCompanyForm(BaseForm):
     """Форма для создания рекламной компании."""
 
@@ -29,6 +33,9 @@ class AdsCompanyForm(BaseForm):
             "website": forms.TextInput(attrs={"class": "form-control"}),
             "channel": forms.Select(attrs={"class": "form-control"}),
         }
+        field_classes: dict[str, type[forms.Field]] = {
+            "channel": PromotionChannelChoiceField,
+        }
 
     def clean(self) -> dict:
         """Проверяет данные формы и передаёт их в сервис для валидации."""
@@ -0,0 +1,78 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from ads.models import AdsCompanyDailyStatistic
+
+
+class Command(BaseCommand):
+    """
+    Команды:
+        ./manage.py rebuild_ads_statistics
+
+        python manage.py rebuild_ads_statistics --batch-size 5000
+
+    Полностью пересобирает предрасчитанную статистику рекламных компаний
+    (таблицу AdsCompanyDailyStatistic) по лидам, клиентам и контрактам.
+    При развёртывании таблицу заполняет миграция ads.0004; вызовите эту команду
+    после массовых изменений в обход ORM (например, queryset.update
+    или загрузки дампа), при которых сигналы не срабатывают.
+    """
+
+    help = "Rebuild the per-day campaign statistics rollup."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many rollup rows to insert per query.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        lead = apps.get_model("leads", "Lead")
+        customer = apps.get_model("customers", "Customer")
+        buckets: dict[tuple[int, object], dict] = defaultdict(
+            lambda: {"leads_count": 0, "customers_count": 0, "income": Decimal(0)}
+        )
+
+        leads = (
+            lead.objects.annotate(day=TruncDate("created_at"))
+            .values("campaign_id", "day")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        for row in leads.iterator():
+            buckets[(row["campaign_id"], row["day"])]["leads_count"] = row["count"]
+
+        conversions = (
+            customer.objects.annotate(day=TruncDate("created_at"))
+            .values("lead__campaign_id", "day")
+            .annotate(count=Count("id"), income=Sum("contract__cost"))
+            .order_by()
+        )
+        for row in conversions.iterator():
+            bucket = buckets[(row["lead__campaign_id"], row["day"])]
+            bucket["customers_count"] = row["count"]
+            bucket["income"] = row["income"] or Decimal(0)
+
+        with transaction.atomic():
+            AdsCompanyDailyStatistic.objects.all().delete()
+            AdsCompanyDailyStatistic.objects.bulk_create(
+                (
+                    AdsCompanyDailyStatistic(
+                        campaign_id=campaign_id, date=day, **values
+                    )
+                    for (campaign_id, day), values in buckets.items()
+                ),
+                batch_size=options["batch_size"],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(buckets)} campaign statistic rows.")
+        )
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AdsCompanyDailyStatistic",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "leads_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Leads count"),
+                ),
+                (
+                    "customers_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Customers count"
+                    ),
+                ),
+                (
+                    "income",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=17,
+                        verbose_name="Income",
+                    ),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_statistics",
+                        to="ads.adscompany",
+                        verbose_name="Campaign",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Campaign daily statistic",
+                "verbose_name_plural": "Campaign daily statistics",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("campaign", "date"),
+                        name="unique_campaign_daily_statistic",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0002_adscompanydailystatistic"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="adscompany",
+            name="website_available",
+            field=models.BooleanField(
+                blank=True,
+                help_text="Result of the last website check, empty if not checked yet",
+                null=True,
+                verbose_name="Website available",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_statistics(apps, schema_editor):
+    """
+    Заполняет статистику рекламных компаний по уже существующим лидам
+    и клиентам (так же, как команда rebuild_ads_statistics).
+    """
+    Lead = apps.get_model("leads", "Lead")
+    Customer = apps.get_model("customers", "Customer")
+    AdsCompanyDailyStatistic = apps.get_model("ads", "AdsCompanyDailyStatistic")
+    buckets = defaultdict(
+        lambda: {"leads_count": 0, "customers_count": 0, "income": Decimal(0)}
+    )
+
+    leads = (
+        Lead.objects.annotate(day=TruncDate("created_at"))
+        .values("campaign_id", "day")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in leads.iterator():
+        buckets[(row["campaign_id"], row["day"])]["leads_count"] = row["count"]
+
+    conversions = (
+        Customer.objects.annotate(day=TruncDate("created_at"))
+        .values("lead__campaign_id", "day")
+        .annotate(count=Count("id"), income=Sum("contract__cost"))
+        .order_by()
+    )
+    for row in conversions.iterator():
+        bucket = buckets[(row["lead__campaign_id"], row["day"])]
+        bucket["customers_count"] = row["count"]
+        bucket["income"] = row["income"] or Decimal(0)
+
+    AdsCompanyDailyStatistic.objects.all().delete()
+    AdsCompanyDailyStatistic.objects.bulk_create(
+        (
+            AdsCompanyDailyStatistic(campaign_id=campaign_id, date=day, **values)
+            for (campaign_id, day), values in buckets.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0003_adscompany_website_available"),
+        ("contracts", "0001_initial"),
+        ("customers", "0002_alter_customer_contract"),
+        ("leads", "0002_alter_lead_campaign"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_daily_statistics, migrations.RunPython.noop),
+    ]
@@ -4,11 +4,21 @@ from typing import TYPE_CHECKING
 from django.utils.translation import gettext_lazy as _
 from django.db import models
 from django.db.models import (
+    BooleanField,
+    Case,
     CharField,
+    Count,
+    DateField,
     DecimalField,
+    F,
     ForeignKey,
     EmailField,
+    PositiveIntegerField,
+    Sum,
+    Value,
+    When,
 )
+from django.db.models.functions import Coalesce, Round
 
 from service_product.models import Product
 from utils.mixins import TimestampMixin, ActorMixin
@@ -19,6 +29,62 @@ if TYPE_CHECKING:
     from .services import AdsCompanyService
 
 
+class AdsCompanyQuerySet(models.QuerySet):
+    """QuerySet рекламных компаний с расчётом статистики на стороне базы данных."""
+
+    def with_statistics(self) -> "AdsCompanyQuerySet":
+        """
+        Аннотирует каждую компанию статистикой одним сгруппированным запросом.
+
+        Цепочка Lead -> Customer -> Contract не размножает строки
+        (у лида не более одного клиента, у клиента один контракт),
+        поэтому агрегаты считаются за один JOIN без подзапросов.
+
+        Аннотации:
+            stat_leads_count (int): Количество лидов.
+            stat_customers_count (int): Количество активных клиентов.
+            stat_income (Decimal): Общий доход по контрактам клиентов.
+            stat_profit (Decimal): Прибыль (доход за вычетом бюджета).
+            stat_roi (Decimal): Соотношение доходов к затратам.
+        """
+        money = DecimalField(max_digits=17, decimal_places=2)
+        income = Coalesce(
+            Sum("leads__customer__contract__cost"), Value(0), output_field=money
+        )
+        return self.annotate(
+            stat_leads_count=Count("leads"),
+            stat_customers_count=Count("leads__customer"),
+            stat_income=income,
+            stat_profit=Round(income - F("budget"), precision=2, output_field=money),
+            stat_roi=Case(
+                When(budget=0, then=Value(0)),
+                default=Round(income / F("budget"), precision=2),
+                output_field=money,
+            ),
+        )
+
+    def with_rollup_statistics(self) -> "AdsCompanyQuerySet":
+        """
+        Аннотирует компании статистикой из предрасчитанной таблицы
+        AdsCompanyDailyStatistic, не обращаясь к лидам, клиентам и контрактам.
+
+        Имена аннотаций совпадают с with_statistics().
+        """
+        money = DecimalField(max_digits=17, decimal_places=2)
+        income = Coalesce(Sum("daily_statistics__income"), Value(0), output_field=money)
+        return self.annotate(
+            stat_leads_count=Coalesce(Sum("daily_statistics__leads_count"), 0),
+            stat_customers_count=Coalesce(Sum("daily_statistics__customers_count"), 0),
+            stat_income=income,
+            stat_profit=Round(income - F("budget"), precision=2, output_field=money),
+            stat_roi=Case(
+                When(budget=0, then=Value(0)),
+                default=Round(income / F("budget"), precision=2),
+                output_field=money,
+            ),
+        )
+
+
 class AdsCompany(TimestampMixin, ActorMixin):
     """
     Модель для рекламной компании.
@@ -31,6 +97,7 @@ class AdsCompany(TimestampMixin, ActorMixin):
         country (str): Страна, в которой находится офис компании.
         email (str): Электронная почта для обращений.
         website (str): Вебсайт компании.
+        website_available (bool): Доступен ли вебсайт по результатам последней проверки.
     """
 
     class Meta:
@@ -81,6 +148,14 @@ class AdsCompany(TimestampMixin, ActorMixin):
         verbose_name=_("Website"),
         help_text=_("Link to the website company"),
     )
+    website_available: BooleanField = models.BooleanField(
+        blank=True,
+        null=True,
+        verbose_name=_("Website available"),
+        help_text=_("Result of the last website check, empty if not checked yet"),
+    )
+
+    objects = AdsCompanyQuerySet.as_manager()
 
     def __str__(self) -> str:
         """Возвращает название рекламной компании."""
@@ -96,19 +171,72 @@ class AdsCompany(TimestampMixin, ActorMixin):
     @property
     def leads_count(self) -> int:
         """Возвращает количество лидов рекламной компании."""
+        if hasattr(self, "stat_leads_count"):
+            return self.stat_leads_count
         return self._service.get_leads_count(self)
 
     @property
     def customers_count(self) -> int:
         """Возвращает количество активных клиентов рекламной компании."""
+        if hasattr(self, "stat_customers_count"):
+            return self.stat_customers_count
         return self._service.get_customers_count(self)
 
     @property
     def profit(self) -> float:
         """Возвращает прибыль для данной рекламной компании."""
+        if hasattr(self, "stat_profit"):
+            return self.stat_profit
         return self._service.calculate_profit(self)
 
     @property
     def roi(self) -> float:
         """Возвращает соотношение доходов к затратам."""
+        if hasattr(self, "stat_roi"):
+            return self.stat_roi
         return self._service.calculate_roi(self)
+
+
+class AdsCompanyDailyStatistic(models.Model):
+    """
+    Предрасчитанная статистика рекламной компании за один день.
+
+    Обновляется сигналами Lead, Customer и Contract (см. ads.signals)
+    и полностью пересобирается командой rebuild_ads_statistics.
+
+    Атрибуты:
+        campaign (ForeignKey): Рекламная компания.
+        date (date): День, за который собрана статистика.
+        leads_count (int): Количество лидов, созданных в этот день.
+        customers_count (int): Количество лидов, ставших клиентами в этот день.
+        income (Decimal): Доход по контрактам клиентов, ставших активными в этот день.
+    """
+
+    campaign: ForeignKey = models.ForeignKey(
+        to=AdsCompany,
+        on_delete=models.CASCADE,
+        related_name="daily_statistics",
+        verbose_name=_("Campaign"),
+    )
+    date: DateField = models.DateField(verbose_name=_("Date"))
+    leads_count: PositiveIntegerField = models.PositiveIntegerField(
+        default=0, verbose_name=_("Leads count")
+    )
+    customers_count: PositiveIntegerField = models.PositiveIntegerField(
+        default=0, verbose_name=_("Customers count")
+    )
+    income: DecimalField = models.DecimalField(
+        max_digits=17, decimal_places=2, default=0, verbose_name=_("Income")
+    )
+
+    class Meta:
+        verbose_name: str = _("Campaign daily statistic")
+        verbose_name_plural: str = _("Campaign daily statistics")
+        constraints: list[models.UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["campaign", "date"], name="unique_campaign_daily_statistic"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.campaign_id} {self.date}"
@@ -1,22 +1,27 @@
-from typing import TYPE_CHECKING
+import datetime
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from django.apps import apps
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Sum
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-import requests
-from requests import Response
-
 from ads.dto_ads_company import AdsCompanyCreateDTO, AdsCompanyUpdateDTO
-from ads.models import AdsCompany
+from ads.models import AdsCompany, AdsCompanyDailyStatistic
+from ads.website_checker import WebsiteReachabilityChecker
 
 from utils.mixins.services_mixins import BadWordsMixin
 from core.check_user_service import UserRoleService
 
 if TYPE_CHECKING:
     from contracts.models import Contract
+    from customers.models import Customer
+    from leads.models import Lead
+
+StatisticBucket = tuple[int, datetime.date]
 
 
 class AdsCompanyService(BadWordsMixin, UserRoleService):
@@ -30,21 +35,31 @@ class AdsCompanyService(BadWordsMixin, UserRoleService):
     def create_company(cls, dto: AdsCompanyCreateDTO) -> AdsCompany:
         """Создает рекламную компанию."""
         cls._checking_before_creation(dto)
+        website_available = cls._check_worked_website(dto.website)
 
         with transaction.atomic():
-            company = AdsCompany.objects.create(**dto.to_dict())
+            company = AdsCompany.objects.create(
+                **dto.to_dict(), website_available=website_available
+            )
             company.save()
+            if website_available is None:
+                WebsiteReachabilityChecker.check_later(company.pk, company.website)
         return company
 
     @classmethod
-    def update_company(cls, dto: AdsCompanyUpdateDTO) -> AdsCompany:
-        """Обновляет рекламную компанию."""
+    def update_company(
+        cls, dto: AdsCompanyUpdateDTO, instance: Optional[AdsCompany] = None
+    ) -> AdsCompany:
+        """Обновляет рекламную компанию. instance - уже загруженная компания, если есть."""
         cls._checking_before_update(dto)
+        website_available = cls._check_worked_website(dto.website)
 
         with transaction.atomic():
-            AdsCompany.objects.filter(id=dto.id).update(**dto.to_dict())
-            company = AdsCompany.objects.get(id=dto.id)
-            company.save()
+            company = cls._update_from_dto(
+                AdsCompany, dto, instance, website_available=website_available
+            )
+            if website_available is None:
+                WebsiteReachabilityChecker.check_later(company.pk, company.website)
 
         return company
 
@@ -91,7 +106,6 @@ class AdsCompanyService(BadWordsMixin, UserRoleService):
         cls._validate_common_fields(dto)
         cls._check_existing_name(dto.name)
         cls._check_for_bad_words(dto)
-        cls._check_worked_website(dto.website)
         cls._check_permissions_user(dto.created_by)
 
     @classmethod
@@ -99,7 +113,6 @@ class AdsCompanyService(BadWordsMixin, UserRoleService):
         """Проверяет данные перед обновлением рекламной компании."""
         cls._validate_common_fields(dto)
         cls._check_for_bad_words(dto)
-        cls._check_worked_website(dto.website)
 
     @classmethod
     def _check_existing_name(cls, name: str) -> None:
@@ -114,10 +127,16 @@ class AdsCompanyService(BadWordsMixin, UserRoleService):
     def _check_for_bad_words(
         cls, dto: AdsCompanyCreateDTO | AdsCompanyUpdateDTO
     ) -> None:
-        """Проверяет наличие запрещенных слов в имени и веб-сайте."""
+        """
+        Проверяет наличие запрещенных слов в имени и веб-сайте.
+        В адресе сайта слова ищутся как подстроки, так как они могут быть
+        склеены с другими словами (например, в домене).
+        """
         bad_words = cls._get_bad_words()
         cls._check_field_for_bad_words("name", dto.name, bad_words)
-        cls._check_field_for_bad_words("website", dto.website, bad_words)
+        cls._check_field_for_bad_words(
+            "website", dto.website, bad_words, whole_words=False
+        )
 
     @classmethod
     def _check_permissions_user(cls, user) -> None:
@@ -126,16 +145,16 @@ class AdsCompanyService(BadWordsMixin, UserRoleService):
         cls._check_user_role(user=user, service_name=service_name)
 
     @staticmethod
-    def _check_worked_website(website: str) -> bool:
-        """Проверяет доступность вебсайта."""
-        try:
-            response: Response = requests.get(website, timeout=5)
-            response.raise_for_status()
-            return True
-        except requests.exceptions.HTTPError as e:
-            raise ValidationError(_(f"The site returned an error: {e}")) from e
-        except requests.exceptions.RequestException as e:
-            raise ValidationError(_(f"The site is unavailable: {e}")) from e
+    def _check_worked_website(website: str) -> bool | None:
+        """
+        Проверяет доступность вебсайта.
+        В отложенном режиме проверка не выполняется и возвращается None,
+        а сайт проверяется в фоне после сохранения компании.
+        """
+        if WebsiteReachabilityChecker.is_deferred():
+            return None
+        WebsiteReachabilityChecker.ensure_reachable(website)
+        return True
 
     @staticmethod
     def get_leads_count(company: AdsCompany) -> int:
@@ -173,3 +192,84 @@ class AdsCompanyService(BadWordsMixin, UserRoleService):
             )["income"]
             or 0
         )
+
+
+class AdsCompanyStatisticService:
+    """Сервис поддержки предрасчитанной статистики рекламных компаний.
+
+    Статистика хранится по корзинам (компания, день) в AdsCompanyDailyStatistic.
+    При изменении лида, клиента или контракта пересчитываются только
+    затронутые корзины, а не вся таблица.
+    """
+
+    @classmethod
+    def refresh_buckets(cls, buckets: Iterable[StatisticBucket]) -> None:
+        """Пересчитывает статистику указанных корзин (компания, день)."""
+        for campaign_id, day in set(buckets):
+            if campaign_id is not None and day is not None:
+                cls._refresh_bucket(campaign_id, day)
+
+    @classmethod
+    def refresh_buckets_on_commit(cls, buckets: Iterable[StatisticBucket]) -> None:
+        """Откладывает пересчёт корзин до фиксации текущей транзакции."""
+        buckets = set(buckets)
+        if buckets:
+            transaction.on_commit(lambda: cls.refresh_buckets(buckets))
+
+    @staticmethod
+    def bucket_day(moment: datetime.datetime | None) -> datetime.date | None:
+        """Возвращает день корзины для момента времени в текущем часовом поясе."""
+        if moment is None:
+            return None
+        return timezone.localdate(moment)
+
+    @staticmethod
+    def _day_bounds(day: datetime.date) -> tuple[datetime.datetime, datetime.datetime]:
+        """
+        Возвращает границы дня [начало, начало следующего дня).
+        Фильтр по диапазону, в отличие от created_at__date, использует индекс.
+        """
+        start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        return start, start + datetime.timedelta(days=1)
+
+    @classmethod
+    def _refresh_bucket(cls, campaign_id: int, day: datetime.date) -> None:
+        """Пересчитывает одну корзину по лидам и клиентам за день."""
+        lead: type["Lead"] = apps.get_model("leads", "Lead")
+        customer: type["Customer"] = apps.get_model("customers", "Customer")
+        start, end = cls._day_bounds(day)
+
+        leads_count = lead.objects.filter(
+            campaign_id=campaign_id, created_at__gte=start, created_at__lt=end
+        ).count()
+        conversions = customer.objects.filter(
+            lead__campaign_id=campaign_id, created_at__gte=start, created_at__lt=end
+        ).aggregate(
+            customers_count=Count("id"),
+            income=Coalesce(
+                Sum("contract__cost"),
+                Value(0),
+                output_field=DecimalField(max_digits=17, decimal_places=2),
+            ),
+        )
+
+        if not leads_count and not conversions["customers_count"]:
+            AdsCompanyDailyStatistic.objects.filter(
+                campaign_id=campaign_id, date=day
+            ).delete()
+            return
+        # INSERT ... ON CONFLICT DO UPDATE: две транзакции, пересчитывающие одну
+        # новую корзину, не столкнутся на уникальном ключе (campaign, date).
+        AdsCompanyDailyStatistic.objects.bulk_create(
+            [
+                AdsCompanyDailyStatistic(
+                    campaign_id=campaign_id,
+                    date=day,
+                    leads_count=leads_count,
+                    **conversions,
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["campaign", "date"],
+            update_fields=["leads_count", "customers_count", "income"],
+        )
@@ -0,0 +1,124 @@
+"""
+Поддержка предрасчитанной статистики рекламных компаний в актуальном состоянии.
+
+При инициализации модели запоминаются значения, от которых зависит корзина
+статистики (компания, день), чтобы при сохранении пересчитать как старую,
+так и новую корзину без дополнительных запросов к базе.
+Значения читаются из __dict__, чтобы отложенные поля (only/defer)
+не подгружались отдельным запросом на каждый объект.
+"""
+
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .services import AdsCompanyStatisticService, StatisticBucket
+
+if TYPE_CHECKING:
+    from contracts.models import Contract
+    from customers.models import Customer
+    from leads.models import Lead
+
+
+def _campaign_buckets(lead_days: set[tuple[int, object]]) -> set[StatisticBucket]:
+    """Переводит пары (id лида, день) в корзины (id компании, день) одним запросом."""
+    lead: type["Lead"] = apps.get_model("leads", "Lead")
+    lead_ids = {lead_id for lead_id, _ in lead_days if lead_id is not None}
+    if not lead_ids:
+        return set()
+    campaigns = dict(
+        lead.objects.filter(pk__in=lead_ids).values_list("pk", "campaign_id")
+    )
+    return {
+        (campaigns.get(lead_id), day)
+        for lead_id, day in lead_days
+        if lead_id in campaigns
+    }
+
+
+@receiver(post_init, sender="leads.Lead")
+def remember_lead_bucket(sender, instance: "Lead", **kwargs) -> None:
+    """Запоминает компанию лида, с которой он был загружен."""
+    instance._statistic_campaign_id = instance.__dict__.get("campaign_id")
+
+
+@receiver(post_save, sender="leads.Lead")
+def refresh_lead_statistic(sender, instance: "Lead", **kwargs) -> None:
+    """
+    Пересчитывает корзины старой и новой компании лида, а при смене
+    компании - и корзины конверсии клиента, созданного из этого лида.
+    """
+    previous = getattr(instance, "_statistic_campaign_id", None)
+    campaigns = {previous, instance.campaign_id}
+    day = AdsCompanyStatisticService.bucket_day(instance.created_at)
+    buckets = {(campaign_id, day) for campaign_id in campaigns}
+    if previous is not None and previous != instance.campaign_id:
+        customer: type["Customer"] = apps.get_model("customers", "Customer")
+        for created_at in customer.objects.filter(lead_id=instance.pk).values_list(
+            "created_at", flat=True
+        ):
+            conversion_day = AdsCompanyStatisticService.bucket_day(created_at)
+            buckets |= {(campaign_id, conversion_day) for campaign_id in campaigns}
+    AdsCompanyStatisticService.refresh_buckets_on_commit(buckets)
+    instance._statistic_campaign_id = instance.campaign_id
+
+
+@receiver(post_delete, sender="leads.Lead")
+def refresh_deleted_lead_statistic(sender, instance: "Lead", **kwargs) -> None:
+    """Пересчитывает корзину удалённого лида."""
+    day = AdsCompanyStatisticService.bucket_day(instance.created_at)
+    AdsCompanyStatisticService.refresh_buckets_on_commit({(instance.campaign_id, day)})
+
+
+@receiver(post_init, sender="customers.Customer")
+def remember_customer_bucket(sender, instance: "Customer", **kwargs) -> None:
+    """Запоминает лида, с которым клиент был загружен."""
+    instance._statistic_lead_id = instance.__dict__.get("lead_id")
+
+
+@receiver(post_save, sender="customers.Customer")
+def refresh_customer_statistic(sender, instance: "Customer", **kwargs) -> None:
+    """Пересчитывает корзины клиента: конверсии и доход по его контракту."""
+    day = AdsCompanyStatisticService.bucket_day(instance.created_at)
+    buckets = _campaign_buckets(
+        {
+            (getattr(instance, "_statistic_lead_id", None), day),
+            (instance.lead_id, day),
+        }
+    )
+    AdsCompanyStatisticService.refresh_buckets_on_commit(buckets)
+    instance._statistic_lead_id = instance.lead_id
+
+
+@receiver(post_delete, sender="customers.Customer")
+def refresh_deleted_customer_statistic(sender, instance: "Customer", **kwargs) -> None:
+    """Пересчитывает корзину удалённого клиента."""
+    day = AdsCompanyStatisticService.bucket_day(instance.created_at)
+    buckets = _campaign_buckets({(instance.lead_id, day)})
+    AdsCompanyStatisticService.refresh_buckets_on_commit(buckets)
+
+
+@receiver(post_init, sender="contracts.Contract")
+def remember_contract_cost(sender, instance: "Contract", **kwargs) -> None:
+    """Запоминает стоимость контракта, с которой он был загружен."""
+    instance._statistic_cost = instance.__dict__.get("cost")
+
+
+@receiver(post_save, sender="contracts.Contract")
+def refresh_contract_statistic(
+    sender, instance: "Contract", created: bool, **kwargs
+) -> None:
+    """Пересчитывает доход компаний, клиенты которых заключили этот контракт."""
+    if created or getattr(instance, "_statistic_cost", None) == instance.cost:
+        return
+    customer: type["Customer"] = apps.get_model("customers", "Customer")
+    buckets = {
+        (campaign_id, AdsCompanyStatisticService.bucket_day(created_at))
+        for campaign_id, created_at in customer.objects.filter(
+            contract_id=instance.pk
+        ).values_list("lead__campaign_id", "created_at")
+    }
+    AdsCompanyStatisticService.refresh_buckets_on_commit(buckets)
+    instance._statistic_cost = instance.cost
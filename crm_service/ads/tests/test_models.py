@@ -0,0 +1,32 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.apps import apps
+
+from ads.services import AdsCompanyService
+
+AdsCompany = apps.get_model("ads", "AdsCompany")
+
+
+def test_statistics_properties_use_annotations() -> None:
+    """Аннотированные значения читаются без обращения к сервису."""
+    company = AdsCompany(name="Test Company", budget=Decimal("1000.00"))
+    company.stat_leads_count = 5
+    company.stat_customers_count = 2
+    company.stat_profit = Decimal("500.00")
+    company.stat_roi = Decimal("1.50")
+
+    with patch.object(AdsCompanyService, "total_income") as total_income:
+        assert company.leads_count == 5
+        assert company.customers_count == 2
+        assert company.profit == Decimal("500.00")
+        assert company.roi == Decimal("1.50")
+        total_income.assert_not_called()
+
+
+def test_roi_without_annotations_falls_back_to_service() -> None:
+    company = AdsCompany(name="Test Company", budget=Decimal("1000.00"))
+
+    with patch.object(AdsCompanyService, "total_income", return_value=Decimal("2500")):
+        assert company.roi == Decimal("2.50")
+        assert company.profit == Decimal("1500.00")
@@ -0,0 +1,161 @@
+import datetime
+import importlib
+import io
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.utils import timezone
+
+from ads.models import AdsCompany, AdsCompanyDailyStatistic
+from ads.services import AdsCompanyStatisticService
+from core.testing import capture_queries
+from leads.models import Lead
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def other_campaign(campaign, admin_user) -> AdsCompany:
+    return AdsCompany.objects.create(
+        name="Other campaign",
+        product=campaign.product,
+        channel=campaign.channel,
+        budget=500,
+        email="other@example.com",
+        created_by=admin_user,
+    )
+
+
+@pytest.fixture
+def commit(django_capture_on_commit_callbacks):
+    """Выполняет отложенный до фиксации транзакции пересчёт корзин."""
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def rollup(campaign: AdsCompany) -> tuple[int, int, int]:
+    statistic = AdsCompany.objects.with_rollup_statistics().get(pk=campaign.pk)
+    return (
+        statistic.stat_leads_count,
+        statistic.stat_customers_count,
+        statistic.stat_income,
+    )
+
+
+def live(campaign: AdsCompany) -> tuple[int, int, int]:
+    statistic = AdsCompany.objects.with_statistics().get(pk=campaign.pk)
+    return (
+        statistic.stat_leads_count,
+        statistic.stat_customers_count,
+        statistic.stat_income,
+    )
+
+
+def test_lead_create_and_delete(campaign, make_lead, commit) -> None:
+    with commit():
+        lead = make_lead()
+        make_lead()
+    assert rollup(campaign) == (2, 0, 0)
+
+    with commit():
+        lead.delete()
+    assert rollup(campaign) == (1, 0, 0)
+
+
+def test_customer_create_update_and_delete(
+    campaign, make_lead, make_contract, make_customer, commit
+) -> None:
+    with commit():
+        customer = make_customer(contract=make_contract(cost=700))
+    assert rollup(campaign) == (1, 1, 700)
+
+    with commit():
+        customer.contract = make_contract(cost=300)
+        customer.save()
+    assert rollup(campaign) == (1, 1, 300)
+
+    with commit():
+        customer.delete()
+    assert rollup(campaign) == (1, 0, 0)
+
+
+def test_customer_moves_to_lead_of_other_campaign(
+    campaign, other_campaign, make_lead, make_customer, commit
+) -> None:
+    with commit():
+        customer = make_customer()
+        other_lead = make_lead(campaign=other_campaign)
+
+    with commit():
+        customer.lead = other_lead
+        customer.save()
+
+    assert rollup(campaign) == live(campaign) == (1, 0, 0)
+    assert rollup(other_campaign) == live(other_campaign) == (1, 1, 1000)
+
+
+def test_lead_changing_campaign_moves_its_customer(
+    campaign, other_campaign, make_lead, make_customer, commit
+) -> None:
+    # Лид и клиент попадают в корзины разных дней.
+    lead = make_lead()
+    Lead.objects.filter(pk=lead.pk).update(
+        created_at=timezone.now() - datetime.timedelta(days=3)
+    )
+    lead.refresh_from_db()
+    with commit():
+        make_customer(lead=lead)
+    call_command("rebuild_ads_statistics", stdout=io.StringIO())
+
+    with commit():
+        lead.campaign = other_campaign
+        lead.save()
+
+    assert rollup(campaign) == live(campaign) == (0, 0, 0)
+    assert rollup(other_campaign) == live(other_campaign) == (1, 1, 1000)
+    assert not AdsCompanyDailyStatistic.objects.filter(campaign=campaign).exists()
+
+
+def test_contract_cost_change_updates_income(
+    campaign, make_contract, make_customer, commit
+) -> None:
+    contract = make_contract(cost=1000)
+    with commit():
+        make_customer(contract=contract)
+
+    with commit():
+        contract.cost = 2500
+        contract.save()
+
+    assert rollup(campaign) == live(campaign) == (1, 1, 2500)
+
+
+def test_bucket_refresh_is_a_single_upsert(campaign, make_lead) -> None:
+    lead = make_lead()
+    day = AdsCompanyStatisticService.bucket_day(lead.created_at)
+    # Корзину успела создать параллельная транзакция, с устаревшими значениями.
+    AdsCompanyDailyStatistic.objects.update_or_create(
+        campaign=campaign, date=day, defaults={"leads_count": 5}
+    )
+
+    with capture_queries() as queries:
+        AdsCompanyStatisticService.refresh_buckets([(campaign.pk, day)])
+
+    table = AdsCompanyDailyStatistic._meta.db_table
+    statements = [sql for sql in queries if table in sql]
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "ON CONFLICT" in statements[0]
+    assert rollup(campaign) == live(campaign) == (1, 0, 0)
+
+
+def test_backfill_migration(campaign, other_campaign, make_lead, make_customer) -> None:
+    migration = importlib.import_module("ads.migrations.0004_backfill_daily_statistics")
+    make_customer()
+    make_lead()
+    make_lead(campaign=other_campaign)
+    AdsCompanyDailyStatistic.objects.all().delete()
+
+    migration.fill_daily_statistics(apps, None)
+
+    assert rollup(campaign) == live(campaign) == (2, 1, 1000)
+    assert rollup(other_campaign) == live(other_campaign) == (1, 0, 0)
@@ -0,0 +1,165 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from ads.dto_ads_company import AdsCompanyCreateDTO
+from ads.models import AdsCompany
+from ads.services import AdsCompanyService
+from ads.website_checker import WebsiteReachabilityChecker
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Заглушка сайта: "/" отвечает на HEAD, "/no-head" только на GET, "/broken" - 500."""
+
+    requests_log: list[tuple[str, str]] = []
+
+    def do_HEAD(self) -> None:
+        self.requests_log.append(("HEAD", self.path))
+        if self.path == "/no-head":
+            self.send_response(405)
+        elif self.path == "/broken":
+            self.send_response(500)
+        else:
+            self.send_response(200)
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.requests_log.append(("GET", self.path))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_site():
+    """Фикстура с локальным HTTP-сервером, возвращает его базовый адрес."""
+    cache.clear()
+    StubHandler.requests_log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    cache.clear()
+
+
+def test_head_first_and_result_cached(stub_site) -> None:
+    assert WebsiteReachabilityChecker.check(f"{stub_site}/") == (True, "")
+    assert WebsiteReachabilityChecker.check(f"{stub_site}/") == (True, "")
+    assert StubHandler.requests_log == [("HEAD", "/")]
+
+
+def test_result_is_cached_per_url(stub_site) -> None:
+    assert WebsiteReachabilityChecker.check(f"{stub_site}/broken")[0] is False
+    assert WebsiteReachabilityChecker.check(f"{stub_site}/") == (True, "")
+    assert WebsiteReachabilityChecker.check(f"{stub_site}/?page=2") == (True, "")
+    assert StubHandler.requests_log == [
+        ("HEAD", "/broken"),
+        ("HEAD", "/"),
+        ("HEAD", "/?page=2"),
+    ]
+
+
+def test_equivalent_urls_share_result(stub_site) -> None:
+    port = stub_site.rsplit(":", 1)[1]
+    WebsiteReachabilityChecker.check(f"{stub_site}/")
+    WebsiteReachabilityChecker.check(stub_site)
+    WebsiteReachabilityChecker.check(f"HTTP://127.0.0.1:{port}/#contacts")
+    assert StubHandler.requests_log == [("HEAD", "/")]
+
+
+def test_default_port_is_dropped() -> None:
+    normalize = WebsiteReachabilityChecker._normalize
+    assert normalize("HTTPS://Example.COM:443") == "https://example.com/"
+    assert normalize("http://example.com:8080/a?b=1#c") == (
+        "http://example.com:8080/a?b=1"
+    )
+
+
+def test_get_fallback_when_head_not_allowed(stub_site) -> None:
+    assert WebsiteReachabilityChecker.check(f"{stub_site}/no-head")[0] is True
+    assert StubHandler.requests_log == [("HEAD", "/no-head"), ("GET", "/no-head")]
+
+
+def test_failure_is_cached(stub_site) -> None:
+    with pytest.raises(ValidationError):
+        WebsiteReachabilityChecker.ensure_reachable(f"{stub_site}/broken")
+    with pytest.raises(ValidationError):
+        WebsiteReachabilityChecker.ensure_reachable(f"{stub_site}/broken")
+    assert StubHandler.requests_log == [("HEAD", "/broken")]
+
+
+def test_unreachable_site() -> None:
+    cache.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    closed_port = server.server_port
+    server.server_close()
+
+    is_available, error = WebsiteReachabilityChecker.check(
+        f"http://127.0.0.1:{closed_port}/"
+    )
+    assert is_available is False
+    assert error
+
+
+def test_connection_failure_is_cached_per_host(monkeypatch) -> None:
+    cache.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    closed_port = server.server_port
+    server.server_close()
+    probed = []
+    probe = WebsiteReachabilityChecker._probe
+    monkeypatch.setattr(
+        WebsiteReachabilityChecker,
+        "_probe",
+        lambda website: probed.append(website) or probe(website),
+    )
+
+    first = WebsiteReachabilityChecker.check(f"http://127.0.0.1:{closed_port}/")
+    second = WebsiteReachabilityChecker.check(f"http://127.0.0.1:{closed_port}/a")
+
+    assert first == second
+    assert first[0] is False
+    assert probed == [f"http://127.0.0.1:{closed_port}/"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deferred_check_flags_unreachable_site(
+    settings, tmp_path, monkeypatch, campaign, admin_user
+) -> None:
+    settings.WEBSITE_CHECK_MODE = "deferred"
+    settings.BAD_WORDS_FILE = tmp_path / "bad_words.txt"
+    settings.BAD_WORDS_FILE.write_text("casino\n")
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(WebsiteReachabilityChecker, "_executor", executor)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    closed_port = server.server_port
+    server.server_close()
+    dto = AdsCompanyCreateDTO(
+        name="Deferred campaign",
+        product=campaign.product,
+        channel=campaign.channel,
+        budget=campaign.budget,
+        country="Russia",
+        email="deferred@example.com",
+        website=f"https://127.0.0.1:{closed_port}/",
+        created_by=admin_user,
+    )
+
+    # Сохранение не ждёт сеть: сайт ещё не проверен.
+    company = AdsCompanyService.create_company(dto)
+    assert company.website_available is None
+
+    # Проверка запланирована после фиксации и выполняется в фоновом потоке.
+    executor.shutdown(wait=True)
+    company.refresh_from_db()
+    assert company.website_available is False
@@ -2,6 +2,7 @@ from django.urls import path
 
 from .views import (
     AdsCompanyListView,
+    AdsCompanyExportView,
     AdsCompanyCreateView,
     AdsCompanyDetailView,
     AdsCompanyDeleteView,
@@ -13,6 +14,11 @@ app_name: str = "ads"
 
 urlpatterns: list[path] = [
     path("", AdsCompanyListView.as_view(), name="ads_list"),
+    path(
+        "export/<str:file_format>/",
+        AdsCompanyExportView.as_view(),
+        name="ads_export",
+    ),
     path("new/", AdsCompanyCreateView.as_view(), name="ads_create"),
     path("<int:pk>/", AdsCompanyDetailView.as_view(), name="ads_detail"),
     path("<int:pk>/delete/", AdsCompanyDeleteView.as_view(), name="ads_delete"),
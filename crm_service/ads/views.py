@@ -1,5 +1,4 @@
 from django.contrib.auth.mixins import PermissionRequiredMixin, LoginRequiredMixin
-from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.http import HttpResponse, HttpRequest
 from django.shortcuts import redirect
@@ -11,15 +10,22 @@ from django.views.generic import (
     DetailView,
 )
 from django.db import transaction
+from django.db.models import QuerySet
 
-from core.base import MyDeleteView
+from core.base import MyDeleteView, QuerySetShapingMixin
+from core.exports import ExportColumn, ExportView
 from .dto_ads_company import AdsCompanyCreateDTO, AdsCompanyUpdateDTO
 from .models import AdsCompany
 from .forms import AdsCompanyForm
 from .services import AdsCompanyService
 
 
-class AdsCompanyListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class AdsCompanyListView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    ListView,
+):
     """Представление для списка всех рекламных компаний в системе."""
 
     permission_required: str = "ads.view_adscompany"
@@ -29,6 +35,26 @@ class AdsCompanyListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     ordering: tuple[str,] = ("budget",)
 
 
+class AdsCompanyExportView(ExportView):
+    """Потоковая выгрузка рекламных компаний в CSV или XLSX."""
+
+    permission_required: str = "ads.view_adscompany"
+    model: AdsCompany = AdsCompany
+    filename: str = "campaigns"
+    columns: tuple[ExportColumn, ...] = (
+        "id",
+        "name",
+        "product__name",
+        "channel__name",
+        "budget",
+        "country",
+        "email",
+        "website",
+        "website_available",
+        "created_at",
+    )
+
+
 class AdsCompanyCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     """Представление для маркетологов и всех у кого есть право на создание рекламных компаний."""
 
@@ -39,7 +65,7 @@ class AdsCompanyCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateVi
     def form_valid(self, form: AdsCompanyForm) -> HttpResponse:
         """Проверка корректности данных из формы, а так же добавляет информацию
         о пользователе, который создаёт новую рекламную компанию."""
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         ads_company_dto = AdsCompanyCreateDTO(
             **form.cleaned_data,
             created_by=user,
@@ -53,12 +79,22 @@ class AdsCompanyCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateVi
         return redirect("ads:ads_detail", pk=company.pk)
 
 
-class AdsCompanyDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class AdsCompanyDetailView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    DetailView,
+):
     """Представление для детального просмотра рекламной компании."""
 
     permission_required: str = "ads.view_adscompany"
     model: AdsCompany = AdsCompany
     context_object_name: str = "company"
+    select_related_fields: tuple[str, ...] = ("product", "channel")
+    deferred_fields: tuple[str, ...] = (
+        "product__description",
+        "product__search_vector",
+    )
 
 
 class AdsCompanyUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
@@ -71,12 +107,14 @@ class AdsCompanyUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateVi
 
     def form_valid(self, form: AdsCompanyForm) -> HttpResponse:
         """Обрабатывает валидную форму и сохраняет изменения."""
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         ads_company_dto = AdsCompanyUpdateDTO(
             **form.cleaned_data, updated_by=user, id=self.object.pk
         )
         try:
-            company = AdsCompanyService.update_company(dto=ads_company_dto)
+            company = AdsCompanyService.update_company(
+                dto=ads_company_dto, instance=self.object
+            )
         except ValidationError as error:
             form.add_error(None, str(error))
             return self.form_invalid(form)
@@ -97,9 +135,13 @@ class AdsCompanyDeleteView(LoginRequiredMixin, PermissionRequiredMixin, MyDelete
         return super().delete(request, *args, **kwargs)
 
 
-class AdsCompanyStatisticsView(LoginRequiredMixin, ListView):
+class AdsCompanyStatisticsView(LoginRequiredMixin, QuerySetShapingMixin, ListView):
     """Представление для статистики рекламных компаний."""
 
     template_name: str = "ads/adscompany_statistic.html"
     model: AdsCompany = AdsCompany
     context_object_name: str = "ads"
+
+    def get_queryset(self) -> QuerySet[AdsCompany]:
+        """Возвращает компании со статистикой из предрасчитанной таблицы."""
+        return super().get_queryset().with_rollup_statistics()
@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+from django.utils.translation import gettext_lazy as _
+
+logger = logging.getLogger("services")
+
+# (доступен ли сайт, сообщение об ошибке)
+ReachabilityResult = tuple[bool, str]
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class WebsiteReachabilityChecker:
+    """
+    Проверка доступности вебсайтов рекламных компаний.
+
+    Результаты кэшируются по нормализованному адресу: успешные на
+    WEBSITE_CHECK_SUCCESS_TTL, неуспешные на WEBSITE_CHECK_FAILURE_TTL, поэтому
+    повторная отправка формы не ждёт сеть. Ошибки соединения относятся ко всему
+    хосту и кэшируются для него, чтобы не ждать таймаут на каждом адресе.
+    Сначала выполняется HEAD-запрос, и только если сервер его не поддерживает -
+    GET. Все запросы идут через общую сессию с пулом соединений.
+
+    В режиме WEBSITE_CHECK_MODE = "deferred" проверка выполняется в фоновом
+    потоке после фиксации транзакции, а результат записывается в
+    AdsCompany.website_available.
+    """
+
+    _session: Optional[requests.Session] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_deferred(cls) -> bool:
+        """Проверяет, включён ли отложенный режим проверки."""
+        return settings.WEBSITE_CHECK_MODE == "deferred"
+
+    @classmethod
+    def ensure_reachable(cls, website: str) -> None:
+        """
+        Проверяет доступность сайта.
+        Raises:
+            ValidationError: если сайт недоступен или вернул ошибку.
+        """
+        is_available, error = cls.check(website)
+        if not is_available:
+            raise ValidationError(error)
+
+    @classmethod
+    def check(cls, website: str) -> ReachabilityResult:
+        """Возвращает результат проверки сайта из кэша или проверяет его."""
+        url_key = cls._cache_key(website)
+        host_key = cls._host_cache_key(website)
+        cached = cache.get_many([host_key, url_key])
+        result: Optional[ReachabilityResult] = cached.get(host_key) or cached.get(
+            url_key
+        )
+        if result is None:
+            key = url_key
+            try:
+                cls._probe(website)
+                result = True, ""
+            except requests.exceptions.HTTPError as e:
+                result = False, str(_("The site returned an error: {}").format(e))
+            except requests.exceptions.ConnectionError as e:
+                # Хост недоступен (в том числе после перенаправления на него).
+                key = cls._host_cache_key(e.request.url if e.request else website)
+                result = False, str(_("The site is unavailable: {}").format(e))
+            except requests.exceptions.RequestException as e:
+                result = False, str(_("The site is unavailable: {}").format(e))
+            timeout = (
+                settings.WEBSITE_CHECK_SUCCESS_TTL
+                if result[0]
+                else settings.WEBSITE_CHECK_FAILURE_TTL
+            )
+            cache.set(key, result, timeout=timeout)
+        return result
+
+    @classmethod
+    def check_later(cls, company_id: int, website: str) -> None:
+        """Планирует фоновую проверку сайта после фиксации транзакции."""
+        transaction.on_commit(
+            lambda: cls._get_executor().submit(cls._check_and_flag, company_id, website)
+        )
+
+    @classmethod
+    def _check_and_flag(cls, company_id: int, website: str) -> None:
+        """Проверяет сайт и сохраняет результат в рекламной компании."""
+        from .models import AdsCompany
+
+        try:
+            is_available, error = cls.check(website)
+            AdsCompany.objects.filter(pk=company_id, website=website).update(
+                website_available=is_available
+            )
+            if not is_available:
+                logger.warning(
+                    "Website %s of company %s is unavailable: %s",
+                    website,
+                    company_id,
+                    error,
+                )
+        except Exception:  # фоновый поток не должен падать молча
+            logger.exception("Website check failed for company %s", company_id)
+        finally:
+            close_old_connections()
+
+    @classmethod
+    def _probe(cls, website: str) -> None:
+        """
+        Проверяет сайт по сети: HEAD, а при 405/501 - GET без чтения тела.
+        Raises:
+            requests.exceptions.RequestException: если сайт недоступен
+                или вернул ошибку.
+        """
+        session = cls._get_session()
+        timeout = settings.WEBSITE_CHECK_TIMEOUT
+        response = session.head(website, timeout=timeout, allow_redirects=True)
+        if response.status_code in (405, 501):
+            response = session.get(website, timeout=timeout, stream=True)
+            response.close()
+        response.raise_for_status()
+
+    @staticmethod
+    def _normalize(website: str) -> str:
+        """
+        Приводит адрес к каноническому виду: схема и хост в нижнем регистре,
+        без порта по умолчанию и фрагмента, пустой путь заменён на "/".
+        """
+        parts = urlsplit(website.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").rstrip(".")
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        netloc = f"[{host}]" if ":" in host else host
+        if port and port != DEFAULT_PORTS.get(scheme):
+            netloc = f"{netloc}:{port}"
+        return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+    @classmethod
+    def _cache_key(cls, website: str) -> str:
+        """
+        Возвращает ключ кэша результата проверки адреса. Адрес хэшируется:
+        он может быть длинным и содержать недопустимые в ключе символы.
+        """
+        digest = hashlib.sha256(cls._normalize(website).encode()).hexdigest()
+        return f"website_reachability:{digest}"
+
+    @classmethod
+    def _host_cache_key(cls, website: str) -> str:
+        """Возвращает ключ кэша ошибки соединения с хостом (и портом) сайта."""
+        scheme, netloc = urlsplit(cls._normalize(website))[:2]
+        return f"website_reachability_host:{scheme}://{netloc}"
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Возвращает общую для процесса HTTP-сессию с пулом соединений."""
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """Возвращает пул фоновых потоков для отложенных проверок."""
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=settings.WEBSITE_CHECK_WORKERS,
+                        thread_name_prefix="website-check",
+                    )
+        return cls._executor
@@ -5,6 +5,9 @@ from ninja import NinjaAPI
 from ninja.responses import Response
 
 
+from api.routers.ads_router import router as ads_router
+from api.routers.contract_router import router as contract_router
+from api.routers.lead_router import router as lead_router
 from api.routers.product_router import router as product_router
 from api.schemas.ads_schemas import (
     AdsCompanyResponseSchema1,
@@ -18,6 +21,9 @@ if TYPE_CHECKING:
 
 api = NinjaAPI()
 api.add_router(router=product_router, prefix="/products")
+api.add_router(router=ads_router, prefix="/ads")
+api.add_router(router=lead_router, prefix="/leads")
+api.add_router(router=contract_router, prefix="/contracts")
 
 
 @api.get("/company_schema")
@@ -0,0 +1,115 @@
+"""
+Курсорная (keyset) пагинация для роутеров Ninja.
+
+Вместо OFFSET следующая страница выбирается условием по значениям ключа
+сортировки последней записи предыдущей страницы, например
+(created_at, id) < (последний created_at, последний id), поэтому любая
+страница читается по индексу так же быстро, как первая.
+Курсор - это непрозрачная для клиента строка (base64 от значений ключа).
+"""
+
+import base64
+import binascii
+import json
+from typing import Generic, Optional, TypeVar
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Q
+from ninja import Field, Schema
+from ninja.errors import HttpError
+from pydantic import PositiveInt
+
+PageItem = TypeVar("PageItem")
+
+
+class CursorPagination(Schema):
+    limit: PositiveInt = Field(20, le=100)
+    cursor: Optional[str] = Field(
+        None, description="### next_cursor from the previous page"
+    )
+
+
+class CursorPage(Schema, Generic[PageItem]):
+    results: list[PageItem]
+    next_cursor: Optional[str] = None
+
+
+def paginate_by_cursor(
+    queryset: models.QuerySet,
+    ordering: tuple[str, ...],
+    pagination: CursorPagination,
+) -> tuple[list[models.Model], Optional[str]]:
+    """
+    Возвращает страницу записей и курсор следующей страницы.
+    Args:
+        queryset: отфильтрованный queryset без сортировки
+        ordering: ключ сортировки из полей модели, последним должно быть
+            уникальное поле, например ("-created_at", "-id")
+        pagination: параметры запроса (limit и cursor)
+    Returns:
+        (записи страницы, курсор следующей страницы или None, если страница последняя)
+    Raises:
+        HttpError(400): если курсор повреждён или от другой сортировки
+    """
+    if pagination.cursor:
+        values = _decode_cursor(queryset.model, ordering, pagination.cursor)
+        queryset = queryset.filter(_after(ordering, values))
+
+    # Лишняя запись показывает, есть ли следующая страница, без COUNT(*).
+    page = list(queryset.order_by(*ordering)[: pagination.limit + 1])
+    if len(page) <= pagination.limit:
+        return page, None
+
+    page = page[: pagination.limit]
+    return page, _encode_cursor(page[-1], ordering)
+
+
+def _field_names(ordering: tuple[str, ...]) -> list[str]:
+    return [field.lstrip("-") for field in ordering]
+
+
+def _after(ordering: tuple[str, ...], values: list) -> Q:
+    """
+    Строит условие "после записи с такими значениями ключа":
+    a > x OR (a = x AND b > y) ... с учётом направления сортировки.
+    Дополнительное условие по первому полю (a >= x) позволяет базе
+    начать чтение индекса сразу с нужного места.
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        step = Q()
+        for previous_name, previous_value in zip(
+            _field_names(ordering[:index]), values[:index]
+        ):
+            step &= Q(**{previous_name: previous_value})
+        condition |= step & Q(**{f"{name}__{lookup}": values[index]})
+
+    first = ordering[0]
+    bound = "lte" if first.startswith("-") else "gte"
+    return Q(**{f"{first.lstrip('-')}__{bound}": values[0]}) & condition
+
+
+def _encode_cursor(instance: models.Model, ordering: tuple[str, ...]) -> str:
+    values = [
+        instance._meta.get_field(name).value_to_string(instance)
+        for name in _field_names(ordering)
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(
+    model: type[models.Model], ordering: tuple[str, ...], cursor: str
+) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError(cursor)
+        return [
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(_field_names(ordering), values)
+        ]
+    except (ValueError, TypeError, binascii.Error, ValidationError) as error:
+        raise HttpError(400, "Invalid cursor.") from error
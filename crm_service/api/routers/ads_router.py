@@ -0,0 +1,39 @@
+from typing import TYPE_CHECKING
+
+from ninja import Router
+
+from ads.models import AdsCompany
+from api.schemas.ads_schemas import AdsCompanyStatisticSchema
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+router = Router(tags=["Ads"])
+
+
+@router.get("/statistics", response=list[AdsCompanyStatisticSchema])
+def get_companies_statistics(request: "HttpRequest") -> list[AdsCompanyStatisticSchema]:
+    """## Статистика рекламных компаний из предрасчитанной таблицы."""
+    companies = AdsCompany.objects.with_rollup_statistics().values(
+        "id",
+        "name",
+        "budget",
+        "stat_leads_count",
+        "stat_customers_count",
+        "stat_income",
+        "stat_profit",
+        "stat_roi",
+    )
+    return [
+        AdsCompanyStatisticSchema(
+            id=company["id"],
+            name=company["name"],
+            budget=company["budget"],
+            leads_count=company["stat_leads_count"],
+            customers_count=company["stat_customers_count"],
+            income=company["stat_income"],
+            profit=company["stat_profit"],
+            roi=company["stat_roi"],
+        )
+        for company in companies
+    ]
@@ -0,0 +1,55 @@
+import datetime
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from ninja import Field, Query, Router, Schema
+from ninja.responses import Response
+from ninja.security import django_auth
+
+from api.pagination import CursorPage, CursorPagination, paginate_by_cursor
+from api.schemas.contract_schemas import ExpiringContractSchema
+from contracts.models import Contract
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+router = Router(tags=["Contracts"])
+
+# Ключ курсорной пагинации, под него есть индекс в Contract.Meta.
+SOONEST_FIRST = ("end_date", "id")
+
+
+class ExpiringFilter(Schema):
+    within_days: int = Field(
+        settings.CONTRACT_EXPIRY_REMINDER_DAYS,
+        ge=0,
+        le=366,
+        description="### Сколько дней вперёд, начиная с сегодняшнего",
+    )
+
+
+@router.get("/expiring", response=CursorPage[ExpiringContractSchema], auth=django_auth)
+def get_expiring_contracts(
+    request: "HttpRequest",
+    filters: Query[ExpiringFilter],
+    pagination: Query[CursorPagination],
+) -> CursorPage[ExpiringContractSchema]:
+    """
+    ## Контракты, срок которых заканчивается в ближайшие within_days дней.
+
+    Контракты идут от ближайшей даты окончания, вместе с клиентами и их
+    рекламными компаниями; вся страница читается одним запросом.
+    """
+    if not request.user.has_perm("contracts.view_contract"):
+        return Response({"error": "Permission denied."}, status=403)
+    contracts, next_cursor = paginate_by_cursor(
+        Contract.objects.expiring(
+            within=datetime.timedelta(days=filters.within_days)
+        ).with_customers(),
+        SOONEST_FIRST,
+        pagination,
+    )
+    return CursorPage[ExpiringContractSchema](
+        results=[ExpiringContractSchema.from_orm(contract) for contract in contracts],
+        next_cursor=next_cursor,
+    )
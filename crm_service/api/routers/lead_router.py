@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from ninja import File, Router
+from ninja.files import UploadedFile
+from ninja.responses import Response
+from ninja.security import django_auth
+
+from api.schemas.lead_schemas import LeadImportReportSchema
+from exception.exc import LeadImportInterrupted
+from leads.readers import detect_format, read_lead_rows
+from leads.services import LeadService
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+router = Router(tags=["Leads"])
+
+
+@router.post("/import", response=LeadImportReportSchema, auth=django_auth)
+def import_leads(
+    request: "HttpRequest", file: UploadedFile = File(...)
+) -> LeadImportReportSchema:
+    """
+    ## Массовый импорт лидов из CSV или XLSX файла.
+
+    Колонки: first_name, middle_name, last_name, email, phone_number, campaign (id).
+    Строки с ошибками пропускаются и возвращаются в отчёте.
+    Для очень больших файлов используйте команду `manage.py import_leads`.
+    """
+    try:
+        file_format = detect_format(file.name)
+        report = LeadService.import_leads(
+            read_lead_rows(file.file, file_format), created_by=request.user
+        )
+    except LeadImportInterrupted as error:
+        # Файл перестал читаться: уже импортированные порции остаются в базе.
+        return Response(
+            {
+                "error": "; ".join(error.messages),
+                **LeadImportReportSchema.from_orm(error.report).dict(),
+            },
+            status=400,
+        )
+    except ValidationError as error:
+        # Неподдерживаемый формат или файл, который не удалось прочитать.
+        return Response({"error": "; ".join(error.messages)}, status=400)
+    except ImproperlyConfigured as error:
+        # Для XLSX не установлен openpyxl.
+        return Response({"error": str(error)}, status=400)
+    except ValueError as error:
+        # Ошибки чтения файла приходят как ValidationError (см. leads.readers),
+        # ValueError остаётся только у проверки роли пользователя.
+        return Response({"error": str(error)}, status=403)
+    return report
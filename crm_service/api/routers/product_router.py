@@ -2,30 +2,38 @@ import datetime
 from typing import TYPE_CHECKING
 
 from django.db import connection
-from django.db.models import F, Q, FloatField
-from django.db.models.functions import Cast, Greatest
+from django.db.models import Count, F, Q, FloatField, Window
+from django.db.models.functions import Cast
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.search import (
-    SearchVector,
     SearchQuery,
     SearchRank,
     TrigramSimilarity,
 )
+from django.utils import timezone
 from ninja import Router, Query
 from ninja.responses import Response
 
+from api.pagination import CursorPage, CursorPagination, paginate_by_cursor
 from api.schemas.product_schemas import (
     ProductSchema,
     CreateProductSchema,
     UpdateProductSchema,
     ProductFilter,
     PaginationFilter,
+    ProductSuggestionSchema,
+    Similarity,
 )
 from api.schemas.common_schemas import ApiResponse
 from api.schemas.product_schemas.schemas import CategorySchema
 
+from service_product.autocomplete import product_name_index
 from service_product.models import Product, Category
-from utils.keyboard import switch_layout
+from service_product.search import (
+    SEARCH_CONFIG,
+    get_layout_detector,
+    search_products_by_similarity,
+)
 from django.db import connection
 
 if TYPE_CHECKING:
@@ -33,6 +41,10 @@ if TYPE_CHECKING:
 
 router = Router(tags=["Products"])
 
+# Ключи курсорной пагинации, под них есть индексы в Product.Meta.
+NEWEST_FIRST = ("-created_at", "-id")
+MOST_EXPENSIVE_FIRST = ("-cost", "-id")
+
 User = get_user_model()
 
 
@@ -49,13 +61,19 @@ def get_product_by_id(
         return Response({"error": str(error)}, status=404)
 
 
-@router.get("/")
-def get_products_list(request: "HttpRequest"):
-    products = [
-        ProductSchema.from_orm(product)
-        for product in Product.objects.filter(archived=False).order_by("-id")
-    ]
-    return {"count": len(products), "page": 1, "products": products}
+@router.get("/", response=CursorPage[ProductSchema])
+def get_products_list(
+    request: "HttpRequest",
+    pagination: Query[CursorPagination],
+) -> CursorPage[ProductSchema]:
+    """## Список неархивных услуг, от новых к старым."""
+    products, next_cursor = paginate_by_cursor(
+        Product.objects.filter(archived=False), NEWEST_FIRST, pagination
+    )
+    return CursorPage[ProductSchema](
+        results=[ProductSchema.from_orm(product) for product in products],
+        next_cursor=next_cursor,
+    )
 
 
 @router.post("/")
@@ -103,11 +121,31 @@ def search_data_by_products(
     return [ProductSchema.from_orm(product) for product in product_list]
 
 
+@router.get("/autocomplete", response=list[ProductSuggestionSchema])
+def autocomplete_products(
+    request: "HttpRequest",
+    q: str,
+    limit: int = Query(10, ge=1, le=50),
+) -> list[ProductSuggestionSchema]:
+    """
+    ## Подсказки по названию услуги.
+
+    Отвечает из индекса в памяти процесса без запроса к базе: сначала услуги,
+    слово в названии которых начинается с q, затем похожие (опечатки),
+    с учётом ошибки раскладки клавиатуры.
+    """
+    product_name_index.ensure_current()
+    return [
+        ProductSuggestionSchema(id=product_id, name=name)
+        for product_id, name in product_name_index.search(q, limit=limit)
+    ]
+
+
 @router.get("/search_cheap_service")
 def search_cheap_service(
     request: "HttpRequest",
     filters: Query[ProductFilter],
-    pagination: Query[PaginationFilter],
+    pagination: Query[CursorPagination],
 ) -> list[ProductSchema]:
     """Поиск услуг, которые дешевле указанной цены."""
     qs = Product.objects.filter(archived=False)
@@ -115,48 +153,52 @@ def search_cheap_service(
     if filters.search is not None:
         qs = qs.filter(cost__lt=filters.search)
 
-    qs = qs.order_by("-cost", "id")
-
-    start = pagination.offset
-    limit = pagination.limit
-    qs = qs[start : start + limit]
-    all_availability = (
-        len([prod for prod in Product.objects.filter(archived=False)]) - start - limit
-    )
-    if all_availability <= 0:
-        all_availability = "В базе больше нет доступных услуг."
+    # COUNT(*) OVER () считается в том же запросе после WHERE (с учётом фильтра
+    # цены и курсора), но до LIMIT - это число услуг от начала страницы до конца.
+    qs = qs.annotate(left_from_page=Window(Count("id")))
+    page, next_cursor = paginate_by_cursor(qs, MOST_EXPENSIVE_FIRST, pagination)
+    remaining = page[0].left_from_page - len(page) if page else 0
 
     return {
-        "result": [ProductSchema.from_orm(p) for p in qs],
+        "result": [ProductSchema.from_orm(p) for p in page],
         "search": filters.search,
-        "limit": limit,
-        "offset": start,
-        "Сколько_ещё_доступно": all_availability,
+        "limit": pagination.limit,
+        "next_cursor": next_cursor,
+        "remaining": remaining,
     }
 
 
-@router.get("/last_products_by_last_10_days", response=list[ProductSchema])
+@router.get("/last_products_by_last_10_days", response=CursorPage[ProductSchema])
 def get_services_by_last_10_days(
     request: "HttpRequest",
-    pagination: Query[PaginationFilter],
-) -> list[ProductSchema]:
-    today = datetime.date.today()
-    product_list = Product.objects.filter(created_at__lte=today).order_by(
-        "-created_at"
-    )[pagination.offset : pagination.limit]
-    return [ProductSchema.from_orm(product) for product in product_list]
+    pagination: Query[CursorPagination],
+) -> CursorPage[ProductSchema]:
+    """## Услуги, созданные за последние 10 дней, от новых к старым."""
+    since = timezone.now() - datetime.timedelta(days=10)
+    product_list, next_cursor = paginate_by_cursor(
+        Product.objects.filter(created_at__gte=since), NEWEST_FIRST, pagination
+    )
+    return CursorPage[ProductSchema](
+        results=[ProductSchema.from_orm(product) for product in product_list],
+        next_cursor=next_cursor,
+    )
 
 
-@router.get("get_by_category", response=list[ProductSchema])
+@router.get("get_by_category", response=CursorPage[ProductSchema])
 def get_services_by_category(
     request: "HttpRequest",
     filters: Query[ProductFilter],
-    pagination: Query[PaginationFilter],
-) -> list[ProductSchema]:
-    product_list = Product.objects.filter(
-        category__title__icontains=filters.search
-    ).order_by("-created_at")[pagination.offset : pagination.limit]
-    return [ProductSchema.from_orm(product) for product in product_list]
+    pagination: Query[CursorPagination],
+) -> CursorPage[ProductSchema]:
+    product_list, next_cursor = paginate_by_cursor(
+        Product.objects.filter(category__title__icontains=filters.search),
+        NEWEST_FIRST,
+        pagination,
+    )
+    return CursorPage[ProductSchema](
+        results=[ProductSchema.from_orm(product) for product in product_list],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("get_full_text", response=list[ProductSchema])
@@ -165,18 +207,19 @@ def get_by_text(
     filters: Query[ProductFilter],
     pagination: Query[PaginationFilter],
 ) -> list[ProductSchema]:
-    term = filters.search
-    vector = SearchVector("name", weight="A", config="russian") + SearchVector(
-        "description", weight="B", config="russian"
-    )
-    query = SearchQuery(term, config="russian")
+    """
+    ## Полнотекстовый поиск по названию (вес A) и описанию (вес B).
 
+    Поиск идёт по хранимому Product.search_vector через GIN-индекс.
+    """
+    query = SearchQuery(filters.search, config=SEARCH_CONFIG)
+    start = pagination.offset
     qs = (
-        Product.objects.annotate(rank=SearchRank(vector, query))
-        .filter(rank__gt=0)
-        .order_by("-rank", "id")[pagination.offset : pagination.limit]
+        Product.objects.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "id")[start : start + pagination.limit]
     )
-    return [ProductSchema.from_orm(p) for p in qs[:50]]
+    return [ProductSchema.from_orm(p) for p in qs]
 
 
 @router.get("/matching_search")
@@ -184,7 +227,7 @@ def get_by_matching(
     request: "HttpRequest",
     search_term: str,
     pagination: Query[PaginationFilter],
-    min_similarity: float = 0.3,
+    min_similarity: Similarity = 0.3,
 ) -> list[ProductSchema]:
     """
     Поиск по триграммной схожести
@@ -233,41 +276,26 @@ def search_if_there_is_an_error_in_the_keyboard_layout(
     request: "HttpRequest",
     search_term: str,
     pagination: Query[PaginationFilter],
-    min_similarity: float = 0.25,
+    min_similarity: Similarity = 0.25,
 ):
-    # 1) варианты запроса (как есть, en->ru, ru->en)
-    v0, v_en2ru, v_ru2en = switch_layout(search_term)
-    variants = [x for x in {v0, v_en2ru, v_ru2en} if x]
+    """
+    ## Нечёткий поиск с учётом ошибки раскладки клавиатуры.
+
+    Из вариантов запроса (как есть, en->ru, ru->en) по частотам биграмм
+    выбираются один-два самых правдоподобных, и они проверяются одним
+    UNION-запросом по триграммным индексам,
+    min_similarity - порог похожести названия или описания (0.0-1.0).
+    """
+    variants = get_layout_detector().best_variants(search_term, limit=2)
     if not variants:
         return {"result": [], "variants": []}
 
-    qs = Product.objects.filter(archived=False)
-
-    # 2) Для КАЖДОГО варианта добавляем аннотацию с уникальным именем
-    sim_aliases = []
-    for idx, v in enumerate(variants):
-        alias = f"sim_{idx}"
-        sim_expr = TrigramSimilarity("name", v) + TrigramSimilarity("description", v)
-        qs = qs.annotate(**{alias: sim_expr})
-        sim_aliases.append(alias)
-
-    # 3) Фильтр: (sim_0>=thr) OR (sim_1>=thr) ...
-    cond = Q()
-    for alias in sim_aliases:
-        cond |= Q(**{f"{alias}__gte": min_similarity})
-    qs = qs.filter(cond)
-
-    # 4) Лучшая схожесть для сортировки
-    if len(sim_aliases) == 1:
-        qs = qs.annotate(best_sim=F(sim_aliases[0]))
-    else:
-        qs = qs.annotate(best_sim=Greatest(*(F(a) for a in sim_aliases)))
-
-    qs = qs.order_by("-best_sim", "-id")
-    # 5) Пагинация
-    start = pagination.offset or 0
-    limit = pagination.limit or 20
-    page = qs[start : start + limit]
+    page = search_products_by_similarity(
+        variants,
+        min_similarity=min_similarity,
+        limit=pagination.limit,
+        offset=pagination.offset,
+    )
     products = [ProductSchema.from_orm(p) for p in page]
 
     return {
@@ -2,6 +2,7 @@ __all__ = (
     "AdsCompanyCreateSchemaModel",
     "AdsCompanyResponseSchema",
     "AdsCompanyResponseSchema1",
+    "AdsCompanyStatisticSchema",
     )
 
 
@@ -9,4 +10,5 @@ from .schemas import (
     AdsCompanyCreateSchemaModel,
     AdsCompanyResponseSchema,
     AdsCompanyResponseSchema1,
+    AdsCompanyStatisticSchema,
     )
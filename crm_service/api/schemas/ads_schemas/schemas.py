@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from ninja import Schema, ModelSchema
 
 
@@ -75,4 +77,18 @@ class AdsCompanyCreateSchemaModel(ModelSchema):
             "updated_at",
             "created_by",
             "updated_by",
+            "website_available",
         ]
+
+
+class AdsCompanyStatisticSchema(Schema):
+    """Статистика рекламной компании."""
+
+    id: int
+    name: str
+    budget: Decimal
+    leads_count: int
+    customers_count: int
+    income: Decimal
+    profit: Decimal
+    roi: Decimal
@@ -0,0 +1,10 @@
+__all__ = (
+    "ExpiringContractCustomerSchema",
+    "ExpiringContractSchema",
+    )
+
+
+from .schemas import (
+    ExpiringContractCustomerSchema,
+    ExpiringContractSchema,
+    )
@@ -0,0 +1,36 @@
+import datetime
+from decimal import Decimal
+from typing import Optional
+
+from django.utils import timezone
+from ninja import Schema
+
+
+class ExpiringContractCustomerSchema(Schema):
+    """Клиент контракта и рекламная компания, из которой пришёл его лид."""
+
+    id: int
+    first_name: str
+    last_name: str
+    campaign_id: int
+    campaign: str
+
+
+class ExpiringContractSchema(Schema):
+    """Контракт, срок действия которого скоро заканчивается."""
+
+    id: int
+    name: str
+    end_date: datetime.date
+    days_left: int
+    cost: Decimal
+    customers: list[ExpiringContractCustomerSchema]
+
+    @staticmethod
+    def resolve_days_left(contract) -> int:
+        return (contract.end_date - timezone.localdate()).days
+
+    @staticmethod
+    def resolve_customers(contract) -> list[dict]:
+        customers: Optional[list[dict]] = getattr(contract, "customers", None)
+        return customers or []
@@ -0,0 +1,10 @@
+__all__ = (
+    "LeadImportErrorSchema",
+    "LeadImportReportSchema",
+    )
+
+
+from .schemas import (
+    LeadImportErrorSchema,
+    LeadImportReportSchema,
+    )
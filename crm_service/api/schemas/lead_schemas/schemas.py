@@ -0,0 +1,15 @@
+from ninja import Schema
+
+
+class LeadImportErrorSchema(Schema):
+    """Ошибка импорта одной строки файла."""
+
+    row: int
+    message: str
+
+
+class LeadImportReportSchema(Schema):
+    """Итог массового импорта лидов."""
+
+    created: int
+    errors: list[LeadImportErrorSchema]
@@ -4,6 +4,8 @@ from .schemas import (
     UpdateProductSchema,
     ProductFilter,
     PaginationFilter,
+    ProductSuggestionSchema,
+    Similarity,
 )
 
 
@@ -12,5 +14,7 @@ __all__ = [
     "CreateProductSchema",
     "UpdateProductSchema",
     "ProductFilter",
-    "PaginationFilter"
+    "PaginationFilter",
+    "ProductSuggestionSchema",
+    "Similarity",
 ]
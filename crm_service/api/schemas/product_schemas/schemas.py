@@ -6,6 +6,8 @@ from pydantic import NonNegativeFloat, NonNegativeInt, PositiveInt
 from service_product.models import Product
 
 type NotNegativeLenStr = Annotated[str, Field(min_length=1, max_length=255)]
+# Порог похожести pg_trgm: вне [0, 1] PostgreSQL отклоняет запрос.
+type Similarity = Annotated[float, Field(ge=0, le=1)]
 
 
 class CategorySchema(Schema):
@@ -31,7 +33,7 @@ class ProductSchema(ModelSchema):
     class Meta:
         model = Product
         # fields = "__all__"
-        exclude = ["category"]
+        exclude = ["category", "search_vector"]
 
 class CreateProductSchema(ModelSchema):
     created_by: int = Field(..., description="User ID of the creator")
@@ -44,6 +46,7 @@ class CreateProductSchema(ModelSchema):
             "updated_at",
             "archived",
             "updated_by",
+            "search_vector",
         ]
 
 
@@ -53,3 +56,8 @@ class UpdateProductSchema(Schema):
     cost: Optional[NonNegativeFloat] = Field(..., description="Product cost")
     discount: Optional[NonNegativeInt] = Field(..., description="Product discount")
     status: Optional[str] = Field(..., description="Product status")
+
+
+class ProductSuggestionSchema(Schema):
+    id: int
+    name: str
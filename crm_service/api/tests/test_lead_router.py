@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from leads.models import Lead
+
+URL = "/api/leads/import"
+
+
+def upload(client, name: str, content: bytes):
+    return client.post(URL, {"file": SimpleUploadedFile(name, content)})
+
+
+def csv_file(campaign_id: int) -> bytes:
+    return (
+        "first_name,last_name,email,phone_number,campaign\n"
+        f"Ivan,Petrov,ivan@example.com,+79170000000,{campaign_id}\n"
+    ).encode()
+
+
+@pytest.mark.django_db
+def test_import(admin_client, campaign) -> None:
+    response = upload(admin_client, "leads.csv", csv_file(campaign.pk))
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 1, "errors": []}
+    assert Lead.objects.filter(email="ivan@example.com").exists()
+
+
+@pytest.mark.django_db
+def test_user_without_role_is_forbidden(client, django_user_model, campaign) -> None:
+    user = django_user_model.objects.create_user("marketer")
+    user.groups.add(Group.objects.create(name="marketer"))
+    client.force_login(user)
+
+    response = upload(client, "leads.csv", csv_file(campaign.pk))
+
+    assert response.status_code == 403
+    assert not Lead.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name, content",
+    [
+        ("leads.json", b"[]"),
+        ("leads.csv", "first_name\nИван\n".encode("cp1251")),
+        ("leads.csv", b'first_name\n"' + b"x" * 200_000 + b'"\n'),
+        ("leads.xlsx", b"not a zip archive"),
+    ],
+    ids=["format", "encoding", "csv", "xlsx"],
+)
+def test_unreadable_file_is_a_bad_request(admin_client, name, content) -> None:
+    if name.endswith(".xlsx"):
+        pytest.importorskip("openpyxl")
+
+    response = upload(admin_client, name, content)
+
+    assert response.status_code == 400
+    assert response.json()["error"]
+
+
+@pytest.mark.django_db
+def test_error_in_the_middle_reports_imported_leads(admin_client, campaign) -> None:
+    rows = "".join(
+        f"Ivan,Petrov,lead{number}@example.com,+7917{number:07d},{campaign.pk}\n"
+        for number in range(1500)
+    )
+    content = f"first_name,last_name,email,phone_number,campaign\n{rows}".encode()
+
+    response = upload(admin_client, "leads.csv", content + b"\xff\n")
+
+    assert response.status_code == 400
+    assert response.json()["error"]
+    assert response.json()["created"] == Lead.objects.count() == 1000
+
+
+@pytest.mark.django_db
+def test_xlsx_without_openpyxl_is_a_bad_request(admin_client, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "openpyxl", None)
+
+    response = upload(admin_client, "leads.xlsx", b"PK\x03\x04")
+
+    assert response.status_code == 400
+    assert "openpyxl" in response.json()["error"]
@@ -0,0 +1,112 @@
+import datetime
+
+import pytest
+from django.db.models import Q
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from api.pagination import _after, _decode_cursor, _encode_cursor
+from service_product.models import Category, Product
+
+ORDERING = ("-created_at", "-id")
+
+
+def test_cursor_round_trip() -> None:
+    created_at = datetime.datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.UTC)
+    product = Product(id=42, created_at=created_at, category_id=1)
+
+    cursor = _encode_cursor(product, ORDERING)
+
+    assert _decode_cursor(Product, ORDERING, cursor) == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "WzFd", "W10="])
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(HttpError):
+        _decode_cursor(Product, ORDERING, cursor)
+
+
+def test_after_respects_ordering_direction() -> None:
+    condition = _after(("-cost", "id"), [10.0, 5])
+
+    assert condition == Q(cost__lte=10.0) & (
+        Q(cost__lt=10.0) | (Q(cost=10.0) & Q(id__gt=5))
+    )
+
+
+@pytest.fixture
+def paged_products(admin_user) -> None:
+    """
+    12 услуг категории Cleaning по три с одинаковыми created_at и cost,
+    одна архивная, одна старше 10 дней и одна другой категории.
+    """
+    cleaning = Category.objects.create(title="Cleaning")
+    now = timezone.now()
+    for number in range(12):
+        product = Product.objects.create(
+            name=f"Service {number}",
+            cost=100 * (number // 3 + 1),
+            category=cleaning,
+            archived=number == 5,
+            created_by=admin_user,
+        )
+        created_at = now - datetime.timedelta(hours=number // 3)
+        if number == 11:
+            created_at = now - datetime.timedelta(days=20)
+        Product.objects.filter(pk=product.pk).update(created_at=created_at)
+    Product.objects.create(name="Other category", cost=100, created_by=admin_user)
+
+
+PAGED_ENDPOINTS = {
+    "list": (
+        "/api/products/",
+        {},
+        "results",
+        Q(archived=False),
+        ("-created_at", "-id"),
+    ),
+    "cheap": (
+        "/api/products/search_cheap_service",
+        {"search": "350"},
+        "result",
+        Q(archived=False, cost__lt=350),
+        ("-cost", "-id"),
+    ),
+    "last_10_days": (
+        "/api/products/last_products_by_last_10_days",
+        {},
+        "results",
+        Q(created_at__gte=timezone.now() - datetime.timedelta(days=9)),
+        ("-created_at", "-id"),
+    ),
+    "category": (
+        "/api/products/get_by_category",
+        {"search": "clean"},
+        "results",
+        Q(category__title="Cleaning"),
+        ("-created_at", "-id"),
+    ),
+}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", PAGED_ENDPOINTS.values(), ids=PAGED_ENDPOINTS)
+def test_cursor_pages_cover_rows_once(admin_client, paged_products, endpoint) -> None:
+    url, params, results, condition, ordering = endpoint
+    expected = list(
+        Product.objects.filter(condition)
+        .order_by(*ordering)
+        .values_list("id", flat=True)
+    )
+    seen, cursor = [], None
+    for __ in range(len(expected)):
+        page = admin_client.get(
+            url, {**params, "limit": 2, **({"cursor": cursor} if cursor else {})}
+        ).json()
+        seen += [product["id"] for product in page[results]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert cursor is None
+    assert seen == expected
@@ -0,0 +1,68 @@
+import pytest
+
+from service_product.models import Product
+from service_product.search import search_products_by_similarity
+
+SIMILARITY_URLS = [
+    "/api/products/matching_search",
+    "/api/products/search_if_there_is_an_error_in_the_keyboard_layout",
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", SIMILARITY_URLS)
+@pytest.mark.parametrize("min_similarity", ["-0.1", "1.5", "nan"])
+def test_min_similarity_out_of_range(admin_client, url, min_similarity) -> None:
+    response = admin_client.get(
+        url, {"search_term": "уборка", "min_similarity": min_similarity}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "min_similarity"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", SIMILARITY_URLS)
+def test_min_similarity_bounds_are_accepted(admin_client, admin_user, url) -> None:
+    Product.objects.create(name="Уборка офиса", cost=100, created_by=admin_user)
+
+    for min_similarity in ("0", "1"):
+        response = admin_client.get(
+            url, {"search_term": "уборка", "min_similarity": min_similarity}
+        )
+        assert response.status_code == 200
+
+
+def test_search_rejects_out_of_range_similarity() -> None:
+    with pytest.raises(ValueError):
+        search_products_by_similarity(["уборка"], min_similarity=2, limit=10)
+
+
+@pytest.mark.django_db
+def test_cheap_services_remaining_follows_filter_and_cursor(
+    admin_client, admin_user
+) -> None:
+    for number, cost in enumerate([100, 200, 300, 400, 500, 600, 5000]):
+        Product.objects.create(
+            name=f"Service {number}", cost=cost, created_by=admin_user
+        )
+    Product.objects.create(
+        name="Archived", cost=150, archived=True, created_by=admin_user
+    )
+    url = "/api/products/search_cheap_service"
+
+    first = admin_client.get(url, {"search": "1000", "limit": 2}).json()
+    second = admin_client.get(
+        url, {"search": "1000", "limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+    last = admin_client.get(
+        url, {"search": "1000", "limit": 2, "cursor": second["next_cursor"]}
+    ).json()
+
+    assert [product["cost"] for product in first["result"]] == [600, 500]
+    assert first["remaining"] == 4
+    assert [product["cost"] for product in second["result"]] == [400, 300]
+    assert second["remaining"] == 2
+    assert [product["cost"] for product in last["result"]] == [200, 100]
+    assert last["remaining"] == 0
+    assert last["next_cursor"] is None
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import Client, override_settings
+
+from .seed import BenchmarkData, seed_benchmark_data
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@pytest.fixture(scope="session")
+def benchmark_data(
+    request, django_db_setup, django_db_blocker, tmp_path_factory
+) -> BenchmarkData:
+    """
+    Один раз за сессию заполняет тестовую базу.
+    Загруженные файлы (документ контрактов) пишутся во временный каталог.
+    """
+    with override_settings(MEDIA_ROOT=tmp_path_factory.mktemp("media")):
+        with django_db_blocker.unblock():
+            data = seed_benchmark_data(
+                scale=request.config.getoption("--benchmark-scale")
+            )
+        yield data
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    """
+    Базовые значения из baseline.json: {"имя адреса": {"queries": 3, ...}}.
+    С --benchmark-update измеренные значения записываются в файл в конце сессии.
+    """
+    values = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    yield values
+    if request.config.getoption("--benchmark-update"):
+        BASELINE_PATH.write_text(
+            json.dumps(dict(sorted(values.items())), indent=2, ensure_ascii=False)
+            + "\n"
+        )
+
+
+@pytest.fixture
+def benchmark_client(benchmark_data, db) -> Client:
+    caches["default"].clear()
+    client = Client()
+    client.force_login(get_user_model().objects.get(pk=benchmark_data.user_id))
+    return client
+
+
+@pytest.fixture
+def check_baseline(request, baseline):
+    """Сравнивает измерения с baseline.json или обновляет его."""
+    tolerance = request.config.getoption("--benchmark-tolerance")
+    update = request.config.getoption("--benchmark-update")
+
+    def check(name: str, measured: dict) -> None:
+        if update:
+            baseline[name] = measured
+            return
+        expected = baseline.get(name)
+        if expected is None:
+            pytest.fail(f"No baseline for {name!r}, run with --benchmark-update")
+        # Количество запросов не зависит от машины и сравнивается точно.
+        assert (
+            measured["queries"] <= expected["queries"]
+        ), f"{name}: {measured['queries']} queries, baseline {expected['queries']}"
+        for metric in ("seconds", "peak_kib"):
+            if metric in expected:
+                assert (
+                    measured[metric] <= expected[metric] * tolerance
+                ), f"{name}: {metric} {measured[metric]}, baseline {expected[metric]}"
+
+    return check
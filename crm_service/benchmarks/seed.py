@@ -0,0 +1,62 @@
+"""Заполнение тестовой базы объёмами, близкими к рабочим (см. seed_crm)."""
+
+import io
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from ads.models import AdsCompany
+from ads.models_as_description import PromotionChannel
+from contracts.models import Contract
+from customers.models import Customer
+from leads.models import Lead
+from service_product.models import Product
+
+# Объёмы при --benchmark-scale=1. Контрактов seed_crm создаст не больше,
+# чем услуг (связь один к одному).
+VOLUMES: dict[str, int] = {
+    "products": 10_000,
+    "campaigns": 1_000,
+    "leads": 100_000,
+    "contracts": 50_000,
+    "customers": 10_000,
+}
+
+
+@dataclass
+class BenchmarkData:
+    """Записи, на которые ссылаются адреса бенчмарков."""
+
+    user_id: int
+    product_id: int
+    channel_id: int
+    campaign_id: int
+    lead_id: int
+    customer_id: int
+    contract_id: int
+    search_term: str
+
+
+def seed_benchmark_data(scale: float = 1.0) -> BenchmarkData:
+    """Заполняет базу командой seed_crm и возвращает записи для адресов."""
+    call_command(
+        "seed_crm",
+        user="benchmark",
+        stdout=io.StringIO(),
+        **{name: max(1, round(count * scale)) for name, count in VOLUMES.items()},
+    )
+
+    def first(model) -> int:
+        return model.objects.order_by("pk").values_list("pk", flat=True).first()
+
+    return BenchmarkData(
+        user_id=get_user_model().objects.get(username="benchmark").pk,
+        product_id=first(Product),
+        channel_id=first(PromotionChannel),
+        campaign_id=first(AdsCompany),
+        lead_id=first(Lead),
+        customer_id=first(Customer),
+        contract_id=first(Contract),
+        search_term="контекстной рекламы",
+    )
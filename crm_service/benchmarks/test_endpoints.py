@@ -0,0 +1,264 @@
+"""
+Бенчмарки всех страниц и эндпоинтов API на объёмах, близких к рабочим.
+
+Запуск (нужен PostgreSQL, как и для приложения):
+    pytest benchmarks --benchmark
+    pytest benchmarks --benchmark --benchmark-scale 0.1
+    pytest benchmarks --benchmark --benchmark-update  # записать baseline.json
+"""
+
+import itertools
+import time
+import tracemalloc
+import uuid
+from functools import partial
+from typing import Callable, NamedTuple
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+
+from core.testing import capture_queries
+from service_product.models import get_default_category
+from .seed import BenchmarkData
+
+pytestmark = pytest.mark.benchmark
+
+
+class Endpoint(NamedTuple):
+    name: str
+    url: Callable[[BenchmarkData], str]
+    method: str = "get"
+    payload: Callable[[BenchmarkData], dict] = lambda data: {}
+    # Причина, по которой эндпоинт сейчас отвечает ошибкой.
+    broken: str = ""
+
+
+def page(name: str, pk_field: str | None = None) -> Callable[[BenchmarkData], str]:
+    def url(data: BenchmarkData) -> str:
+        if pk_field is None:
+            return reverse(name)
+        return reverse(name, kwargs={"pk": getattr(data, pk_field)})
+
+    return url
+
+
+def export(name: str, file_format: str) -> Callable[[BenchmarkData], str]:
+    return lambda data: reverse(name, kwargs={"file_format": file_format})
+
+
+imported_leads = itertools.count()
+
+
+def lead_import_file(data: BenchmarkData) -> dict:
+    rows = "\n".join(
+        f"Иван,,Петров,import{n}@example.com,+7917{n:07d},{data.campaign_id}"
+        for n in itertools.islice(imported_leads, 100)
+    )
+    content = f"first_name,middle_name,last_name,email,phone_number,campaign\n{rows}\n"
+    return {"data": {"file": SimpleUploadedFile("leads.csv", content.encode())}}
+
+
+ENDPOINTS = [
+    # crm_service/urls.py
+    Endpoint("home", page("home")),
+    Endpoint("login", page("accounts:login")),
+    Endpoint("admin", lambda data: "/admin/"),
+    Endpoint("products_list", page("service_product:service_list")),
+    Endpoint("products_create", page("service_product:service_create")),
+    Endpoint("products_detail", page("service_product:service_detail", "product_id")),
+    Endpoint("products_edit", page("service_product:service_edit", "product_id")),
+    Endpoint("products_delete", page("service_product:service_delete", "product_id")),
+    Endpoint("ads_list", page("ads:ads_list")),
+    Endpoint("ads_create", page("ads:ads_create")),
+    Endpoint("ads_detail", page("ads:ads_detail", "campaign_id")),
+    Endpoint("ads_edit", page("ads:ads_edit", "campaign_id")),
+    Endpoint("ads_delete", page("ads:ads_delete", "campaign_id")),
+    Endpoint("ads_statistic", page("ads:ads_statistic")),
+    Endpoint("leads_list", page("leads:leads_list")),
+    Endpoint("leads_create", page("leads:leads_create")),
+    Endpoint("leads_detail", page("leads:leads_detail", "lead_id")),
+    Endpoint("leads_edit", page("leads:leads_edit", "lead_id")),
+    Endpoint("leads_delete", page("leads:leads_delete", "lead_id")),
+    Endpoint("customers_list", page("customers:customers_list")),
+    Endpoint("customers_create", page("customers:customers_create")),
+    Endpoint("customers_detail", page("customers:customers_detail", "customer_id")),
+    Endpoint("customers_edit", page("customers:customers_edit", "customer_id")),
+    Endpoint("customers_delete", page("customers:customers_delete", "customer_id")),
+    Endpoint("contracts_list", page("contracts:contract_list")),
+    Endpoint("contracts_create", page("contracts:contract_create")),
+    Endpoint("contracts_detail", page("contracts:contract_detail", "contract_id")),
+    Endpoint("contracts_edit", page("contracts:contract_edit", "contract_id")),
+    Endpoint("contracts_delete", page("contracts:contract_delete", "contract_id")),
+    Endpoint("contracts_document", page("contracts:contract_document", "contract_id")),
+    # Выгрузки всех строк таблицы потоковым ответом.
+    *(
+        Endpoint(f"{prefix}_export_{file_format}", export(name, file_format))
+        for prefix, name in (
+            ("ads", "ads:ads_export"),
+            ("leads", "leads:leads_export"),
+            ("customers", "customers:customers_export"),
+            ("contracts", "contracts:contract_export"),
+        )
+        for file_format in ("csv", "xlsx")
+    ),
+    # api/api.py
+    Endpoint(
+        "api_company_schema",
+        lambda data: f"/api/company_schema?comp_id={data.campaign_id}",
+    ),
+    Endpoint(
+        "api_company_model",
+        lambda data: f"/api/company_model?comp_id={data.campaign_id}",
+    ),
+    Endpoint(
+        "api_company_create",
+        lambda data: "/api/company",
+        method="post",
+        payload=lambda data: {
+            "data": {
+                "name": f"Benchmark {uuid.uuid4().hex}",
+                "product_id": data.product_id,
+                "channel_id": data.channel_id,
+                "budget": "1000.00",
+                "country": "RU",
+                "email": "benchmark@example.com",
+                "website": "",
+            },
+            "content_type": "application/json",
+        },
+        broken="the view reads schema.product_id, the schema only has product",
+    ),
+    Endpoint("api_ads_statistics", lambda data: "/api/ads/statistics"),
+    Endpoint(
+        "api_leads_import",
+        lambda data: "/api/leads/import",
+        method="post",
+        payload=lead_import_file,
+    ),
+    Endpoint("api_products_list", lambda data: "/api/products/"),
+    Endpoint(
+        "api_products_by_id",
+        lambda data: f"/api/products/id?product_id={data.product_id}",
+    ),
+    Endpoint(
+        "api_products_create",
+        lambda data: "/api/products/",
+        method="post",
+        payload=lambda data: {
+            "data": {
+                "name": f"Benchmark {uuid.uuid4().hex}",
+                "description": "Benchmark",
+                "cost": 1000,
+                "discount": 0,
+                "status": "active",
+                "category_id": get_default_category(),
+                "created_by": data.user_id,
+            },
+            "content_type": "application/json",
+        },
+        broken="the view re-validates the parsed schema, category_id is lost",
+    ),
+    Endpoint(
+        "api_products_search",
+        lambda data: f"/api/products/search?search={data.search_term}",
+    ),
+    Endpoint(
+        "api_products_autocomplete",
+        lambda data: f"/api/products/autocomplete?q={data.search_term[:4]}",
+    ),
+    Endpoint(
+        "api_products_cheap",
+        lambda data: "/api/products/search_cheap_service?search=50000",
+    ),
+    Endpoint(
+        "api_products_last_10_days",
+        lambda data: "/api/products/last_products_by_last_10_days",
+    ),
+    Endpoint(
+        "api_products_by_category",
+        lambda data: "/api/products/get_by_category?search=Other",
+    ),
+    Endpoint(
+        "api_products_full_text",
+        lambda data: f"/api/products/get_full_text?search={data.search_term}",
+    ),
+    Endpoint(
+        "api_products_matching",
+        lambda data: f"/api/products/matching_search?search_term={data.search_term}",
+    ),
+    Endpoint(
+        "api_products_layout",
+        lambda data: "/api/products/search_if_there_is_an_error_in_the_keyboard_layout"
+        "?search_term=yfcnhjqrf",
+    ),
+    # api/routers/contract_router.py
+    Endpoint(
+        "api_contracts_expiring",
+        lambda data: "/api/contracts/expiring?within_days=30",
+    ),
+]
+
+
+def measure(client: Client, method: str, url: str, payload: Callable[[], dict]) -> dict:
+    """
+    Выполняет запрос и возвращает количество запросов к базе,
+    время ответа в секундах и пиковое потребление памяти в КиБ.
+    Запросы к базе, время и память измеряются отдельными повторами запроса,
+    чтобы ни подсчёт запросов, ни tracemalloc не искажали время.
+    """
+    send = getattr(client, method)
+
+    def request() -> None:
+        response = send(url, **payload())
+        assert response.status_code < 400, response.content[:500]
+        if response.streaming:
+            # Потоковый ответ (выгрузки, документы) формируется при чтении,
+            # клиент закрывает его, когда содержимое прочитано.
+            for __ in response.streaming_content:
+                pass
+
+    with capture_queries() as queries:
+        request()
+
+    started = time.perf_counter()
+    request()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        request()
+        __, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "queries": len(queries),
+        "seconds": round(seconds, 4),
+        "peak_kib": round(peak / 1024),
+    }
+
+
+@pytest.mark.parametrize(
+    "endpoint",
+    [
+        pytest.param(
+            endpoint,
+            id=endpoint.name,
+            marks=(
+                [pytest.mark.xfail(reason=endpoint.broken)] if endpoint.broken else []
+            ),
+        )
+        for endpoint in ENDPOINTS
+    ],
+)
+def test_endpoint(endpoint, benchmark_client, benchmark_data, check_baseline) -> None:
+    url = endpoint.url(benchmark_data)
+    payload = partial(endpoint.payload, benchmark_data)
+    # Первый запрос прогревает кэши (индекс автодополнения, счётчики, справочники).
+    getattr(benchmark_client, endpoint.method)(url, **payload())
+
+    measured = measure(benchmark_client, endpoint.method, url, payload)
+
+    check_baseline(endpoint.name, measured)
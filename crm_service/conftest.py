@@ -0,0 +1,146 @@
+import itertools
+
+import pytest
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("benchmark", "query count and timing benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run benchmarks (tests marked with @pytest.mark.benchmark).",
+    )
+    group.addoption(
+        "--benchmark-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier for seeded volumes (1 = 10k products, 100k leads).",
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="Write measured values to the baseline instead of comparing.",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=1.5,
+        help="Allowed ratio of measured time and memory to the baseline.",
+    )
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Кэши в памяти процесса не переживают тест, как и записи в базе данных."""
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def campaign(db, admin_user):
+    """Рекламная компания со своей услугой и каналом продвижения."""
+    from ads.models import AdsCompany
+    from ads.models_as_description import PromotionChannel
+    from service_product.models import Product
+
+    product = Product.objects.create(
+        name="Campaign product", cost=1000, discount=0, created_by=admin_user
+    )
+    return AdsCompany.objects.create(
+        name="Campaign",
+        product=product,
+        channel=PromotionChannel.objects.create(name="Channel"),
+        budget=1000,
+        email="campaign@example.com",
+        created_by=admin_user,
+    )
+
+
+@pytest.fixture
+def make_lead(campaign, admin_user):
+    """Создаёт лидов с уникальными email и телефоном."""
+    from leads.models import Lead
+
+    numbers = itertools.count()
+
+    def make(**fields):
+        number = next(numbers)
+        return Lead.objects.create(
+            **{
+                "first_name": "Ivan",
+                "last_name": "Petrov",
+                "email": f"lead{number}@example.com",
+                "phone_number": f"+7999{number:07d}",
+                "campaign": campaign,
+                "created_by": admin_user,
+                **fields,
+            }
+        )
+
+    return make
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """Загруженные файлы пишутся во временный каталог теста."""
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def make_contract(db, admin_user, media_root):
+    """Создаёт контракты; у каждого своя услуга (связь один к одному)."""
+    import datetime
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from contracts.models import Contract
+    from service_product.models import Product
+
+    numbers = itertools.count()
+
+    def make(content: bytes = b"%PDF-1.7\n", **fields):
+        number = next(numbers)
+        product = Product.objects.create(
+            name=f"Contract product {number}", cost=1000, created_by=admin_user
+        )
+        return Contract.objects.create(
+            **{
+                "name": f"Contract {number}",
+                "product": product,
+                "file_document": SimpleUploadedFile("contract.pdf", content),
+                "start_date": datetime.date(2026, 1, 1),
+                "end_date": datetime.date(2026, 12, 31),
+                "cost": 1000,
+                "created_by": admin_user,
+                **fields,
+            }
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_customer(make_lead, make_contract, admin_user):
+    """Создаёт клиентов; по умолчанию из нового лида и с новым контрактом."""
+    from customers.models import Customer
+
+    def make(lead=None, contract=None):
+        return Customer.objects.create(
+            lead=lead or make_lead(),
+            contract=contract or make_contract(),
+            created_by=admin_user,
+        )
+
+    return make
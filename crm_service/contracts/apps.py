@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContractsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "contracts"
+
+    def ready(self) -> None:
+        """Подключает подсчёт ссылок на файлы документов."""
+        from . import signals  # noqa: F401
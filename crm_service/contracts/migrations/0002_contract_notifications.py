@@ -0,0 +1,69 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0001_initial"),
+        ("service_product", "0007_default_category"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContractNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Contract concluded"),
+                            ("expiring", "Contract expires soon"),
+                        ],
+                        max_length=20,
+                        verbose_name="Kind",
+                    ),
+                ),
+                ("end_date", models.DateField(verbose_name="End date")),
+                ("sent_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Contract notification",
+                "verbose_name_plural": "Contract notifications",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(fields=["end_date"], name="contract_end_date_idx"),
+        ),
+        migrations.AddField(
+            model_name="contractnotification",
+            name="contract",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notifications",
+                to="contracts.contract",
+                verbose_name="Contract",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="contractnotification",
+            constraint=models.UniqueConstraint(
+                fields=("contract", "kind", "end_date"),
+                name="contract_notification_unique",
+            ),
+        ),
+    ]
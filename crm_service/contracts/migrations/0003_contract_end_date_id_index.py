@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0002_contract_notifications"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="contract",
+            name="contract_end_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(
+                fields=["end_date", "id"], name="contract_end_date_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:54
+
+import contracts.models
+import contracts.storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_document_references(apps, schema_editor):
+    """Заводит счётчики ссылок для файлов уже существующих контрактов."""
+    Contract = apps.get_model("contracts", "Contract")
+    StoredDocument = apps.get_model("contracts", "StoredDocument")
+    references = (
+        Contract.objects.exclude(file_document="")
+        .values("file_document")
+        .annotate(references=Count("pk"))
+        .order_by()
+        .values_list("file_document", "references")
+    )
+    StoredDocument.objects.bulk_create(
+        (StoredDocument(name=name, references=count) for name, count in references),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0003_contract_end_date_id_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="contract",
+            name="file_document",
+            field=models.FileField(
+                storage=contracts.storage.get_document_storage,
+                upload_to=contracts.models.create_directory_path_for_documents_customer,
+                verbose_name="File with documents",
+            ),
+        ),
+        migrations.CreateModel(
+            name="StoredDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="File name"
+                    ),
+                ),
+                (
+                    "references",
+                    models.PositiveIntegerField(default=0, verbose_name="References"),
+                ),
+                (
+                    "released_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Released at"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stored document",
+                "verbose_name_plural": "Stored documents",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("references", 0)),
+                        fields=["released_at"],
+                        name="stored_document_unused_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_document_references, migrations.RunPython.noop),
+    ]
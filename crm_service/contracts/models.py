@@ -1,9 +1,17 @@
-from django.db.models import CharField, OneToOneField, FileField
+import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import CharField, OneToOneField, FileField, F, Q
 from django.db.models.fields import DateField, DecimalField
+from django.db.models.functions import JSONObject
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.db import models
 
 from service_product.models import Product
+from .storage import get_document_storage
 from utils.mixins import TimestampMixin, ActorMixin
 
 
@@ -14,6 +22,49 @@ def create_directory_path_for_documents_customer(
     return f"documents/{instance.name}-{instance.start_date}/{filename}"
 
 
+class ContractQuerySet(models.QuerySet):
+    """QuerySet контрактов с выборками по сроку действия."""
+
+    def expiring(
+        self,
+        within: Optional[datetime.timedelta] = None,
+        today: Optional[datetime.date] = None,
+    ) -> "ContractQuerySet":
+        """
+        Контракты, срок которых заканчивается в ближайшие within
+        (по умолчанию CONTRACT_EXPIRY_REMINDER_DAYS дней), от ближайших.
+
+        Выборка и сортировка идут по индексу (end_date, id), поэтому большие
+        выборки стоит читать потоком: .iterator(chunk_size=...).
+        """
+        if within is None:
+            within = datetime.timedelta(days=settings.CONTRACT_EXPIRY_REMINDER_DAYS)
+        today = today or timezone.localdate()
+        return self.filter(end_date__range=(today, today + within)).order_by(
+            "end_date", "id"
+        )
+
+    def with_customers(self) -> "ContractQuerySet":
+        """
+        Аннотирует контракты списком клиентов и их рекламных компаний
+        (customers: [{id, first_name, last_name, campaign_id, campaign}])
+        в том же запросе. У контракта без клиентов customers равно None.
+        """
+        return self.annotate(
+            customers=JSONBAgg(
+                JSONObject(
+                    id=F("customer__id"),
+                    first_name=F("customer__lead__first_name"),
+                    last_name=F("customer__lead__last_name"),
+                    campaign_id=F("customer__lead__campaign_id"),
+                    campaign=F("customer__lead__campaign__name"),
+                ),
+                filter=Q(customer__isnull=False),
+                order_by="customer__id",
+            )
+        )
+
+
 class Contract(TimestampMixin, ActorMixin):
     """
     Модель для представления контракта.
@@ -27,6 +78,8 @@ class Contract(TimestampMixin, ActorMixin):
         cost (DecimalField): Стоимость контракта.
     """
 
+    objects = ContractQuerySet.as_manager()
+
     name: CharField = models.CharField(
         max_length=150,
         blank=False,
@@ -43,6 +96,7 @@ class Contract(TimestampMixin, ActorMixin):
         blank=False,
         null=False,
         upload_to=create_directory_path_for_documents_customer,
+        storage=get_document_storage,
         verbose_name=_("File with documents"),
     )
     start_date: DateField = models.DateField(
@@ -59,6 +113,101 @@ class Contract(TimestampMixin, ActorMixin):
         blank=False, null=False, max_digits=15, decimal_places=2, verbose_name=_("Cost")
     )
 
+    class Meta(TimestampMixin.Meta):
+        """
+        Метаданные модели.
+
+        Атрибуты:
+            indexes (list): Индексы миксина и индекс под выборку контрактов,
+                срок которых заканчивается в заданном диапазоне дат,
+                с сортировкой и курсорной пагинацией по (end_date, id)
+        """
+
+        indexes: list[models.Index] = [
+            *TimestampMixin.Meta.indexes,
+            models.Index(fields=["end_date", "id"], name="contract_end_date_id_idx"),
+        ]
+
     def __str__(self) -> str:
         """Возвращает название контракта."""
         return self.name
+
+
+class ContractNotification(models.Model):
+    """
+    Отправленное уведомление по контракту.
+    Уникальность (контракт, вид, дата окончания) не даёт отправить одно
+    уведомление дважды; после продления контракта напоминание придёт снова.
+
+    Атрибуты:
+        contract (ForeignKey): Контракт.
+        kind (CharField): Вид уведомления.
+        end_date (DateField): Дата окончания контракта на момент отправки.
+        sent_at (DateTimeField): Время отправки.
+    """
+
+    class Kind(models.TextChoices):
+        CREATED = "created", _("Contract concluded")
+        EXPIRING = "expiring", _("Contract expires soon")
+
+    contract: models.ForeignKey = models.ForeignKey(
+        to=Contract,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        verbose_name=_("Contract"),
+    )
+    kind: CharField = models.CharField(
+        max_length=20, choices=Kind, verbose_name=_("Kind")
+    )
+    end_date: DateField = models.DateField(verbose_name=_("End date"))
+    sent_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Contract notification")
+        verbose_name_plural = _("Contract notifications")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["contract", "kind", "end_date"],
+                name="contract_notification_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()}: {self.contract_id}"
+
+
+class StoredDocument(models.Model):
+    """
+    Файл в хранилище документов и количество контрактов, которые на него ссылаются.
+    Одинаковые документы хранятся одним файлом (см. contracts.storage),
+    файл без ссылок удаляется задачей purge_unreferenced_documents.
+
+    Атрибуты:
+        name (CharField): Имя файла в хранилище.
+        references (PositiveIntegerField): Количество ссылающихся контрактов.
+        released_at (DateTimeField): Когда пропала последняя ссылка.
+    """
+
+    name: CharField = models.CharField(
+        max_length=100, unique=True, verbose_name=_("File name")
+    )
+    references: models.PositiveIntegerField = models.PositiveIntegerField(
+        default=0, verbose_name=_("References")
+    )
+    released_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Released at")
+    )
+
+    class Meta:
+        verbose_name = _("Stored document")
+        verbose_name_plural = _("Stored documents")
+        indexes = [
+            models.Index(
+                fields=["released_at"],
+                condition=Q(references=0),
+                name="stored_document_unused_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.references})"
@@ -1,21 +1,35 @@
 import datetime
 import logging
+import os
 from decimal import Decimal
+from typing import Optional
 
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.core.files import File
+from django.core.files.uploadedfile import UploadedFile
 from django.contrib.auth.models import User
+from django.conf import settings
 from django.db import transaction, DatabaseError
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
 
 from core.check_user_service import UserRoleService
 
-from .models import Contract
+from .models import Contract, StoredDocument
+from .storage import get_document_storage
+from .tasks import send_contract_created_email
 from .dto_contracts import ContractCreateDTO, ContractUpdateDTO
 
 
 logger = logging.getLogger(__name__)
 
+# Допустимые расширения документов и сигнатуры (первые байты) их форматов.
+DOCUMENT_SIGNATURES: dict[str, bytes] = {
+    ".pdf": b"%PDF-",
+    ".docx": b"PK\x03\x04",  # DOCX - zip-архив
+}
+
 
 class ContractService(UserRoleService):
     """Сервис для работы с контрактами.
@@ -33,22 +47,25 @@ class ContractService(UserRoleService):
         with transaction.atomic():
             contract: Contract = Contract.objects.create(**dto.to_dict())
             contract.save()
+            # Письмо отправит воркер очереди: SMTP не задерживает ответ.
+            send_contract_created_email.enqueue(
+                contract_id=contract.pk, dedup_key=f"contract_created:{contract.pk}"
+            )
 
         return contract
 
     @classmethod
-    def update_contract(cls, dto: ContractUpdateDTO) -> Contract:
-        """Обновление данных в контракте."""
+    def update_contract(
+        cls, dto: ContractUpdateDTO, instance: Optional[Contract] = None
+    ) -> Contract:
+        """Обновление данных в контракте. instance - уже загруженный контракт, если есть."""
         cls._check_permissions_user(user=dto.updated_by)
         cls.validate_dates(dto.start_date, dto.end_date)
         cls.validate_file(dto.file_document)
 
         try:
             with transaction.atomic():
-                Contract.objects.filter(id=dto.id).update(**dto.to_dict())
-                contract = Contract.objects.get(id=dto.id)
-                contract.save()
-                contract.refresh_from_db()
+                contract = cls._update_from_dto(Contract, dto, instance)
         except DatabaseError as error:
             logger.error("Database error occurred: %s", error)
             raise ValidationError(
@@ -91,10 +108,8 @@ class ContractService(UserRoleService):
     @classmethod
     def validate_file(cls, file_document: File) -> None:
         """Проверяет корректность файла контракта."""
-        allowed_extensions = {".pdf", ".docx"}
-        if not any(
-            file_document.name.lower().endswith(ext) for ext in allowed_extensions
-        ):
+        extension = os.path.splitext(file_document.name)[1].lower()
+        if extension not in DOCUMENT_SIGNATURES:
             raise ValidationError(_("Only PDF and DOCX files are allowed."))
 
         max_size = 10 * 1024 * 1024  # 10 МБ
@@ -105,6 +120,25 @@ class ContractService(UserRoleService):
                 )
             )
 
+        if isinstance(file_document, UploadedFile):
+            # Новая загрузка: содержимое должно соответствовать расширению.
+            if not cls._read_head(file_document).startswith(
+                DOCUMENT_SIGNATURES[extension]
+            ):
+                raise ValidationError(
+                    _("The file content does not match its extension.")
+                )
+
+    @staticmethod
+    def _read_head(file_document: UploadedFile) -> bytes:
+        """Первые байты файла: из обработчика загрузки (core.uploads) или из файла."""
+        head = getattr(file_document, "head", None)
+        if head is None:
+            file_document.seek(0)
+            head = file_document.read(16)
+            file_document.seek(0)
+        return head
+
     @classmethod
     def validate_cost(
         cls, cost_data: float, contract_pk: int = None, user: User = None
@@ -137,3 +171,136 @@ class ContractService(UserRoleService):
                     + _("Current value: %(current)s. Minimum allowed: %(min)s")
                     % {"current": contract.cost, "min": min_allowed_cost},
                 )
+
+
+class DocumentService:
+    """
+    Подсчёт ссылок контрактов на файлы хранилища документов (StoredDocument).
+
+    Ссылки меняются сигналами contracts.signals при сохранении и удалении
+    контрактов; файл без ссылок удаляется не сразу, а спустя
+    CONTRACT_DOCUMENTS_GRACE_PERIOD секунд (purge_unreferenced), чтобы
+    параллельная загрузка того же документа не осталась без файла.
+    Хранилище заводит запись (keep) до записи файла, поэтому файл без записи
+    остаётся только после отката транзакции или сбоя и тоже удаляется.
+    """
+
+    # Сколько имён файлов проверять в базе одним запросом.
+    sweep_batch_size: int = 1000
+
+    @classmethod
+    def acquire(cls, name: str, references: int = 1) -> None:
+        """
+        Добавляет ссылки на файл. references > 1 - для контрактов,
+        вставленных массово в обход сигналов (например, seed_crm).
+        """
+        if not name:
+            return
+        if cls._add_reference(name, references):
+            return
+        # Первая ссылка: ON CONFLICT DO NOTHING на случай параллельной вставки.
+        StoredDocument.objects.bulk_create(
+            [StoredDocument(name=name)], ignore_conflicts=True
+        )
+        cls._add_reference(name, references)
+
+    @classmethod
+    def keep(cls, name: str) -> None:
+        """
+        Не даёт purge_unreferenced удалить файл, пока ссылка на него
+        не сохранена: заводит запись StoredDocument и продлевает льготный
+        срок файла без ссылок. Блокировка строки держится до конца транзакции.
+        """
+        now = timezone.now()
+        if StoredDocument.objects.filter(name=name, references=0).update(
+            released_at=now
+        ):
+            return
+        StoredDocument.objects.bulk_create(
+            [StoredDocument(name=name, released_at=now)], ignore_conflicts=True
+        )
+
+    @classmethod
+    def release(cls, name: str) -> None:
+        """Убирает ссылку на файл."""
+        if not name:
+            return
+        StoredDocument.objects.filter(name=name, references__gt=0).update(
+            references=F("references") - 1,
+            released_at=Case(
+                When(references=1, then=Value(timezone.now())),
+                default=F("released_at"),
+            ),
+        )
+
+    @classmethod
+    def purge_unreferenced(cls) -> int:
+        """Удаляет файлы, на которые дольше льготного срока нет ссылок."""
+        cutoff = timezone.now() - datetime.timedelta(
+            seconds=settings.CONTRACT_DOCUMENTS_GRACE_PERIOD
+        )
+        unused = StoredDocument.objects.filter(references=0, released_at__lt=cutoff)
+        storage = get_document_storage()
+        purged = 0
+        for name in unused.values_list("name", flat=True).iterator():
+            with transaction.atomic():
+                # Ссылка могла появиться после выборки: проверяем под блокировкой.
+                document = (
+                    unused.select_for_update(skip_locked=True).filter(name=name).first()
+                )
+                if document is None:
+                    continue
+                document.delete()
+                storage.delete(name)
+            purged += 1
+        purged += cls._purge_untracked(storage, cutoff)
+        logger.info("Unreferenced contract documents purged: %s", purged)
+        return purged
+
+    @classmethod
+    def _purge_untracked(cls, storage, cutoff: datetime.datetime) -> int:
+        """
+        Удаляет файлы хранилища без записи StoredDocument и .part,
+        недописанные дольше льготного срока.
+        """
+        purged = 0
+        untracked = []
+        for name, modified in storage.list_documents():
+            if name.endswith(storage.partial_suffix):
+                if modified < cutoff.timestamp():
+                    storage.delete(name)
+                    purged += 1
+            elif storage.is_hashed_name(name):
+                untracked.append(name)
+            if len(untracked) >= cls.sweep_batch_size:
+                purged += cls._purge_names(storage, untracked)
+                untracked = []
+        return purged + cls._purge_names(storage, untracked)
+
+    @staticmethod
+    def _purge_names(storage, names: list[str]) -> int:
+        tracked = set(
+            StoredDocument.objects.filter(name__in=names).values_list("name", flat=True)
+        )
+        purged = 0
+        for name in names:
+            if name in tracked:
+                continue
+            with transaction.atomic():
+                # Вставка ждёт транзакцию, которая завела запись, но ещё
+                # не зафиксирована; если запись появилась - файл нужен.
+                document, created = StoredDocument.objects.get_or_create(name=name)
+                if not created:
+                    continue
+                document.delete()
+                storage.delete(name)
+            purged += 1
+        return purged
+
+    @staticmethod
+    def _add_reference(name: str, references: int = 1) -> bool:
+        return bool(
+            StoredDocument.objects.filter(name=name).update(
+                references=F("references") + references, released_at=None
+            )
+        )
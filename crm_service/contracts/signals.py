@@ -0,0 +1,86 @@
+"""
+Подсчёт ссылок контрактов на файлы хранилища документов (см. DocumentService).
+
+При инициализации контракта запоминается имя его файла, чтобы при сохранении
+перенести ссылку со старого файла на новый без дополнительных запросов.
+Значение читается из __dict__, чтобы отложенное поле file_document
+не подгружалось отдельным запросом на каждый объект; у контракта,
+загруженного без этого поля, имя файла читается из базы перед удалением
+или перед сохранением нового файла.
+"""
+
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .models import Contract
+from .services import DocumentService
+
+
+@receiver(post_init, sender=Contract)
+def remember_document(sender, instance: Contract, **kwargs) -> None:
+    """Запоминает файл, с которым контракт был загружен."""
+    if "file_document" not in instance.__dict__:
+        instance._stored_document = None
+        return
+    # Из базы приходит имя файла, у нового контракта - ещё не сохранённый файл.
+    value = instance.__dict__["file_document"]
+    instance._stored_document = value if isinstance(value, str) else ""
+
+
+@receiver(pre_save, sender=Contract)
+def load_deferred_document(
+    sender, instance: Contract, update_fields=None, **kwargs
+) -> None:
+    """Читает из базы файл контракта, загруженного без поля file_document."""
+    if update_fields is not None and "file_document" not in update_fields:
+        return
+    # Поле так и осталось отложенным - в базу оно не пишется.
+    if "file_document" not in instance.__dict__:
+        return
+    _load_stored_document(instance)
+
+
+@receiver(pre_delete, sender=Contract)
+def load_deleted_document(sender, instance: Contract, **kwargs) -> None:
+    """Читает из базы файл удаляемого контракта, загруженного без него."""
+    _load_stored_document(instance)
+
+
+def _load_stored_document(instance: Contract) -> None:
+    if getattr(instance, "_stored_document", None) is not None or instance.pk is None:
+        return
+    instance._stored_document = (
+        Contract.objects.filter(pk=instance.pk)
+        .values_list("file_document", flat=True)
+        .first()
+        or ""
+    )
+
+
+@receiver(post_save, sender=Contract)
+def update_document_references(
+    sender, instance: Contract, update_fields=None, **kwargs
+) -> None:
+    """Переносит ссылку со старого файла контракта на новый."""
+    if update_fields is not None and "file_document" not in update_fields:
+        return
+    previous = getattr(instance, "_stored_document", None)
+    if previous is None:
+        return
+    current = instance.file_document.name or ""
+    if current != previous:
+        DocumentService.acquire(current)
+        DocumentService.release(previous)
+        instance._stored_document = current
+
+
+@receiver(post_delete, sender=Contract)
+def release_document(sender, instance: Contract, **kwargs) -> None:
+    """Убирает ссылку удалённого контракта на файл."""
+    DocumentService.release(getattr(instance, "_stored_document", None) or "")
@@ -0,0 +1,106 @@
+"""
+Хранилище документов контрактов с адресацией по содержимому.
+
+Файл сохраняется под именем из SHA-256 его содержимого:
+documents/ab/cd/abcd...ef.pdf. Один и тот же документ, прикреплённый к
+нескольким контрактам, хранится на диске один раз: если файл с таким
+хэшем уже есть, повторная загрузка не пишет на диск ничего. Сколько
+контрактов ссылается на файл, считает StoredDocument (см. DocumentService),
+неиспользуемые файлы удаляет задача contracts.purge_unreferenced_documents.
+Запись StoredDocument заводится до записи файла, поэтому файл, оставшийся
+после отката транзакции, задача тоже найдёт и удалит.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import secrets
+from typing import Iterator
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+# ab/cd/abcd...ef.ext внутри каталога prefix.
+HASHED_NAME_RE = re.compile(
+    r"^(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?P=a)(?P=b)[0-9a-f]{60}(\.\w+)?$"
+)
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage, сохраняющий файлы под именем из SHA-256 содержимого.
+
+    Хэш берётся из атрибута sha256 загруженного файла (его считают
+    обработчики загрузки core.uploads), иначе файл читается порциями.
+    Новый файл пишется во временный файл рядом с целевым и переименовывается,
+    поэтому параллельные загрузки одного документа не видят его недописанным.
+
+    Атрибуты:
+        prefix (str): Каталог внутри хранилища.
+    """
+
+    prefix: str = "documents"
+    partial_suffix: str = ".part"
+
+    def _save(self, name: str, content: File) -> str:
+        # services импортирует модели, а модели - это хранилище.
+        from .services import DocumentService
+
+        digest = getattr(content, "sha256", None) or self.file_hash(content)
+        name = self.hashed_name(name, digest)
+        # До проверки exists(): purge_unreferenced не удалит файл,
+        # который мы решим не записывать повторно.
+        DocumentService.keep(name)
+        if self.exists(name):
+            return name
+        partial = super()._save(
+            f"{name}.{secrets.token_hex(8)}{self.partial_suffix}", content
+        )
+        os.replace(self.path(partial), self.path(name))
+        return name
+
+    def get_available_name(self, name: str, max_length: int | None = None) -> str:
+        # Имя определяется содержимым в _save, подбирать свободное не нужно.
+        return name
+
+    def hashed_name(self, name: str, digest: str) -> str:
+        """Имя файла по хэшу содержимого с расширением исходного имени."""
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(self.prefix, digest[:2], digest[2:4], digest + extension)
+
+    def is_hashed_name(self, name: str) -> bool:
+        """Сохранён ли файл под именем из хэша содержимого (см. hashed_name)."""
+        return HASHED_NAME_RE.match(posixpath.relpath(name, self.prefix)) is not None
+
+    def list_documents(self) -> Iterator[tuple[str, float]]:
+        """Имена всех файлов каталога prefix и время их изменения (timestamp)."""
+        root = self.path(self.prefix)
+        for directory, __, file_names in os.walk(root):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                try:
+                    modified = os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                name = os.path.relpath(path, self.location).replace(os.sep, "/")
+                yield name, modified
+
+    @staticmethod
+    def file_hash(content: File) -> str:
+        """SHA-256 содержимого файла, прочитанного порциями."""
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        return sha256.hexdigest()
+
+
+document_storage = ContentAddressedStorage()
+
+
+def get_document_storage() -> ContentAddressedStorage:
+    """Хранилище Contract.file_document; в миграции попадает ссылка на эту функцию."""
+    return document_storage
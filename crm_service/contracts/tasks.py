@@ -0,0 +1,126 @@
+"""
+Почтовые уведомления по контрактам: о заключении контракта и о скором
+окончании его срока. Письма получает менеджер, создавший контракт.
+
+Каждое отправленное уведомление записывается в ContractNotification,
+поэтому повтор задачи или повторный запуск по расписанию не отправляет
+письмо второй раз.
+"""
+
+import itertools
+import logging
+from typing import Iterable
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import Exists, OuterRef
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from task_queue.registry import task
+
+from .models import Contract, ContractNotification
+
+logger = logging.getLogger("services")
+
+
+@task(max_attempts=5)
+def send_contract_created_email(contract_id: int) -> None:
+    """Отправляет письмо о заключении контракта."""
+    contract = (
+        _pending_notifications(ContractNotification.Kind.CREATED)
+        .select_related("created_by", "product")
+        .filter(pk=contract_id)
+        .first()
+    )
+    if contract is None:
+        return
+    with get_connection() as connection:
+        _send_batch([contract], ContractNotification.Kind.CREATED, connection)
+
+
+@task()
+def send_expiry_reminders() -> None:
+    """
+    Напоминает о контрактах, срок которых заканчивается в ближайшие
+    CONTRACT_EXPIRY_REMINDER_DAYS дней. Контракты выбираются одним
+    диапазонным запросом по индексу (end_date, id) и читаются порциями
+    по CONTRACT_EMAIL_BATCH_SIZE; письма отправляются через одно соединение
+    с почтовым сервером, отправленные записываются одним запросом на порцию.
+    """
+    contracts = (
+        _pending_notifications(ContractNotification.Kind.EXPIRING)
+        .expiring()
+        .select_related("created_by")
+        .only("name", "end_date", "created_by__email", "created_by__first_name")
+    )
+    batch_size = settings.CONTRACT_EMAIL_BATCH_SIZE
+    sent = 0
+    with get_connection() as connection:
+        for batch in itertools.batched(
+            contracts.iterator(chunk_size=batch_size), batch_size
+        ):
+            sent += _send_batch(batch, ContractNotification.Kind.EXPIRING, connection)
+    logger.info("Contract expiry reminders sent: %s", sent)
+
+
+@task()
+def purge_unreferenced_documents() -> None:
+    """Удаляет файлы документов, на которые не ссылается ни один контракт."""
+    # services импортирует задачи этого модуля.
+    from .services import DocumentService
+
+    DocumentService.purge_unreferenced()
+
+
+def _pending_notifications(kind: ContractNotification.Kind):
+    """Контракты с адресом менеджера, по которым уведомление kind ещё не отправлено."""
+    already_sent = ContractNotification.objects.filter(
+        contract=OuterRef("pk"), kind=kind, end_date=OuterRef("end_date")
+    )
+    return Contract.objects.filter(created_by__email__gt="").exclude(
+        Exists(already_sent)
+    )
+
+
+def _send_batch(
+    contracts: Iterable[Contract],
+    kind: ContractNotification.Kind,
+    connection: BaseEmailBackend,
+) -> int:
+    """
+    Отправляет письма по одному через общее соединение и записывает
+    уведомления только о тех, что действительно отправлены. Если отправка
+    прервалась ошибкой, остальные письма будут отправлены при повторе задачи.
+    Транзакция не держится открытой, пока идёт обмен с почтовым сервером.
+    """
+    today = timezone.localdate()
+    sent = []
+    try:
+        for contract in contracts:
+            context = {
+                "contract": contract,
+                "days_left": (contract.end_date - today).days,
+            }
+            message = EmailMessage(
+                subject=render_to_string(
+                    f"contracts/emails/contract_{kind}_subject.txt", context
+                ).strip(),
+                body=render_to_string(f"contracts/emails/contract_{kind}.txt", context),
+                to=[contract.created_by.email],
+                connection=connection,
+            )
+            if message.send():
+                sent.append(contract)
+    finally:
+        ContractNotification.objects.bulk_create(
+            [
+                ContractNotification(
+                    contract=contract, kind=kind, end_date=contract.end_date
+                )
+                for contract in sent
+            ],
+            ignore_conflicts=True,
+        )
+    return len(sent)
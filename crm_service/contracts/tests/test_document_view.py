@@ -0,0 +1,56 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+
+from contracts.models import Contract
+
+CONTENT = b"%PDF-1.7\ndocument"
+
+pytestmark = pytest.mark.django_db
+
+
+def document_url(contract: Contract) -> str:
+    return reverse("contracts:contract_document", kwargs={"pk": contract.pk})
+
+
+def test_document_is_served_under_contract_name(admin_client, make_contract) -> None:
+    contract = make_contract(CONTENT, name="Annual service")
+
+    response = admin_client.get(document_url(contract))
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == CONTENT
+    assert 'filename="Annual service.pdf"' in response["Content-Disposition"]
+
+
+def test_anonymous_user_is_redirected_to_login(client, make_contract) -> None:
+    url = document_url(make_contract(CONTENT))
+
+    response = client.get(url)
+
+    assert response.status_code == 302
+    assert response.url == f"{reverse('accounts:login')}?next={url}"
+
+
+def test_view_permission_is_required(client, django_user_model, make_contract) -> None:
+    url = document_url(make_contract(CONTENT))
+    user = django_user_model.objects.create_user("manager")
+    client.force_login(user)
+
+    assert client.get(url).status_code == 403
+
+    user.user_permissions.add(Permission.objects.get(codename="view_contract"))
+    assert client.get(url).status_code == 200
+
+
+def test_contract_without_document_is_not_found(admin_client, make_contract) -> None:
+    contract = make_contract(CONTENT)
+    Contract.objects.filter(pk=contract.pk).update(file_document="")
+
+    assert admin_client.get(document_url(contract)).status_code == 404
+
+
+def test_missing_contract_is_not_found(admin_client) -> None:
+    url = reverse("contracts:contract_document", kwargs={"pk": 1})
+
+    assert admin_client.get(url).status_code == 404
@@ -0,0 +1,191 @@
+import datetime
+import importlib
+import os
+
+import pytest
+from django.apps import apps
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.utils import timezone
+
+from contracts.models import Contract, StoredDocument
+from contracts.services import DocumentService
+from contracts.storage import get_document_storage
+
+FIRST = b"%PDF-1.7\nfirst"
+SECOND = b"%PDF-1.7\nsecond"
+
+pytestmark = pytest.mark.django_db
+
+
+def references(contract: Contract) -> int:
+    return StoredDocument.objects.get(name=contract.file_document.name).references
+
+
+def expire(name: str) -> None:
+    """Переносит освобождение файла за пределы льготного срока."""
+    StoredDocument.objects.filter(name=name).update(
+        released_at=timezone.now() - datetime.timedelta(days=2)
+    )
+
+
+def test_same_document_is_counted_once_per_contract(make_contract) -> None:
+    first = make_contract(FIRST)
+    second = make_contract(FIRST)
+
+    assert first.file_document.name == second.file_document.name
+    assert references(first) == 2
+    assert StoredDocument.objects.count() == 1
+
+
+def test_new_file_moves_reference(make_contract) -> None:
+    contract = make_contract(FIRST)
+    previous = contract.file_document.name
+
+    contract.file_document = SimpleUploadedFile("contract.pdf", SECOND)
+    contract.save()
+
+    assert references(contract) == 1
+    released = StoredDocument.objects.get(name=previous)
+    assert released.references == 0
+    assert released.released_at is not None
+
+
+def test_update_without_file_keeps_reference(make_contract) -> None:
+    contract = make_contract(FIRST)
+
+    contract.name = "Renamed"
+    contract.save()
+    Contract.objects.only("name").get(pk=contract.pk).save(update_fields=["name"])
+
+    assert references(contract) == 1
+
+
+def test_deferred_contract_moves_reference(make_contract) -> None:
+    contract = make_contract(FIRST)
+    previous = contract.file_document.name
+
+    deferred = Contract.objects.defer("file_document").get(pk=contract.pk)
+    deferred.file_document = SimpleUploadedFile("contract.pdf", SECOND)
+    deferred.save()
+
+    assert references(deferred) == 1
+    assert StoredDocument.objects.get(name=previous).references == 0
+
+
+@pytest.mark.parametrize(
+    "load",
+    [
+        lambda pk: Contract.objects.get(pk=pk),
+        lambda pk: Contract.objects.only("name").get(pk=pk),
+    ],
+    ids=["loaded", "deferred"],
+)
+def test_delete_releases_reference(make_contract, load) -> None:
+    kept = make_contract(FIRST)
+    deleted = make_contract(FIRST)
+
+    load(deleted.pk).delete()
+
+    assert references(kept) == 1
+
+
+def test_queryset_delete_releases_references(make_contract) -> None:
+    contract = make_contract(FIRST)
+
+    Contract.objects.only("name").filter(pk=contract.pk).delete()
+
+    assert StoredDocument.objects.get().references == 0
+
+
+def test_purge_waits_for_grace_period(make_contract) -> None:
+    contract = make_contract(FIRST)
+    name = contract.file_document.name
+    storage = get_document_storage()
+    contract.delete()
+
+    assert DocumentService.purge_unreferenced() == 0
+    assert storage.exists(name)
+
+    expire(name)
+
+    assert DocumentService.purge_unreferenced() == 1
+    assert not storage.exists(name)
+    assert not StoredDocument.objects.exists()
+
+
+def test_purge_keeps_referenced_documents(make_contract) -> None:
+    contract = make_contract(FIRST)
+    expire(contract.file_document.name)
+
+    assert DocumentService.purge_unreferenced() == 0
+    assert get_document_storage().exists(contract.file_document.name)
+
+
+def test_reupload_extends_grace_period(make_contract) -> None:
+    name = make_contract(FIRST).file_document.name
+    Contract.objects.all().delete()
+    expire(name)
+
+    # Файл уже на диске и не пишется заново, но и не удаляется:
+    # хранилище продлевает льготный срок до того, как ссылка сохранена.
+    assert get_document_storage().save("again.pdf", SimpleUploadedFile("a", FIRST))
+    assert DocumentService.purge_unreferenced() == 0
+
+    contract = make_contract(FIRST)
+
+    assert contract.file_document.name == name
+    assert references(contract) == 1
+    assert get_document_storage().exists(name)
+
+
+def test_file_of_rolled_back_contract_is_purged(make_contract) -> None:
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            name = make_contract(FIRST).file_document.name
+            raise RuntimeError
+    storage = get_document_storage()
+    assert storage.exists(name)
+    assert not StoredDocument.objects.exists()
+
+    assert DocumentService.purge_unreferenced() == 1
+    assert not storage.exists(name)
+
+
+def test_stale_partial_files_are_purged(make_contract) -> None:
+    contract = make_contract(FIRST)
+    storage = get_document_storage()
+    stale = f"{contract.file_document.name}.0.part"
+    fresh = f"{contract.file_document.name}.1.part"
+    for name in (stale, fresh):
+        with open(storage.path(name), "wb") as partial:
+            partial.write(FIRST)
+    two_days_ago = (timezone.now() - datetime.timedelta(days=2)).timestamp()
+    os.utime(storage.path(stale), (two_days_ago, two_days_ago))
+
+    assert DocumentService.purge_unreferenced() == 1
+    assert not storage.exists(stale)
+    assert storage.exists(fresh)
+    assert storage.exists(contract.file_document.name)
+
+
+def test_legacy_files_are_not_swept(make_contract, media_root) -> None:
+    legacy = media_root / "documents" / "Contract-2024-01-01" / "scan.pdf"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_bytes(FIRST)
+
+    assert DocumentService.purge_unreferenced() == 0
+    assert legacy.exists()
+
+
+def test_backfill_counts_existing_contracts(make_contract) -> None:
+    migration = importlib.import_module("contracts.migrations.0004_stored_documents")
+    first = make_contract(FIRST)
+    make_contract(FIRST)
+    second = make_contract(SECOND)
+    StoredDocument.objects.all().delete()
+
+    migration.count_document_references(apps, None)
+
+    assert references(first) == 2
+    assert references(second) == 1
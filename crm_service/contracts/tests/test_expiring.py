@@ -0,0 +1,141 @@
+import datetime
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.utils import timezone
+
+from ads.models import AdsCompany
+from api.schemas.contract_schemas import ExpiringContractSchema
+from contracts.models import Contract
+from core.testing import assert_max_queries
+
+URL = "/api/contracts/expiring"
+
+
+def ending_in(days: int) -> dict:
+    return {"end_date": timezone.localdate() + datetime.timedelta(days=days)}
+
+
+@pytest.fixture
+def expiring(make_contract) -> list[Contract]:
+    """Контракты в окне 7 дней в порядке (end_date, id) и два вне окна."""
+    make_contract(name="Ended yesterday", **ending_in(-1))
+    make_contract(name="Ends in 8 days", **ending_in(8))
+    return [
+        make_contract(name="Ends today", **ending_in(0)),
+        make_contract(name="Ends in 3 days", **ending_in(3)),
+        make_contract(name="Also in 3 days", **ending_in(3)),
+        make_contract(name="Ends in 7 days", **ending_in(7)),
+    ]
+
+
+@pytest.mark.django_db
+def test_expiring_window_and_order(settings, expiring) -> None:
+    settings.CONTRACT_EXPIRY_REMINDER_DAYS = 7
+    expiring.sort(key=lambda contract: (contract.end_date, contract.pk))
+
+    assert list(Contract.objects.expiring()) == expiring
+    assert list(Contract.objects.expiring(within=datetime.timedelta(0))) == [
+        expiring[0]
+    ]
+
+
+@pytest.mark.django_db
+def test_with_customers_payload(
+    campaign, admin_user, make_lead, make_contract, make_customer
+) -> None:
+    other = AdsCompany.objects.create(
+        name="Other",
+        product=campaign.product,
+        channel=campaign.channel,
+        budget=100,
+        email="other@example.com",
+        created_by=admin_user,
+    )
+    contract = make_contract()
+    first = make_customer(contract=contract, lead=make_lead(first_name="Anna"))
+    second = make_customer(contract=contract, lead=make_lead(campaign=other))
+    without_customers = make_contract()
+
+    contracts = {c.pk: c for c in Contract.objects.with_customers()}
+
+    assert contracts[contract.pk].customers == [
+        {
+            "id": first.pk,
+            "first_name": "Anna",
+            "last_name": "Petrov",
+            "campaign_id": campaign.pk,
+            "campaign": "Campaign",
+        },
+        {
+            "id": second.pk,
+            "first_name": "Ivan",
+            "last_name": "Petrov",
+            "campaign_id": other.pk,
+            "campaign": "Other",
+        },
+    ]
+    assert contracts[without_customers.pk].customers is None
+
+
+def test_schema_without_customers() -> None:
+    contract = Contract(
+        id=1,
+        name="Contract",
+        end_date=datetime.date.today() + datetime.timedelta(days=3),
+        cost=100,
+    )
+    contract.customers = None
+
+    schema = ExpiringContractSchema.from_orm(contract)
+
+    assert schema.days_left == 3
+    assert schema.customers == []
+
+
+@pytest.mark.django_db
+def test_api_requires_permission(client, django_user_model, expiring) -> None:
+    assert client.get(URL).status_code == 401
+
+    user = django_user_model.objects.create_user("viewer")
+    client.force_login(user)
+    assert client.get(URL).status_code == 403
+
+    user.user_permissions.add(Permission.objects.get(codename="view_contract"))
+    assert client.get(URL).status_code == 200
+
+
+@pytest.mark.django_db
+def test_api_cursor_pages(admin_client, expiring) -> None:
+    expiring.sort(key=lambda contract: (contract.end_date, contract.pk))
+    names, cursor, pages = [], None, 0
+    while True:
+        params = {"within_days": 7, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = admin_client.get(URL, params).json()
+        names += [contract["name"] for contract in page["results"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 2
+    assert names == [contract.name for contract in expiring]
+
+
+@pytest.mark.django_db
+def test_api_page_is_one_query(admin_client, make_contract, make_customer) -> None:
+    contract = make_contract(**ending_in(1))
+    make_customer(contract=contract)
+    admin_client.get(URL)
+
+    for _ in range(5):
+        make_customer(contract=make_contract(**ending_in(2)))
+    # Пользователь сессии и страница контрактов вместе с клиентами.
+    with assert_max_queries(2):
+        response = admin_client.get(URL)
+
+    results = response.json()["results"]
+    assert len(results) == 6
+    assert all(len(contract["customers"]) == 1 for contract in results)
@@ -0,0 +1,56 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from contracts.services import ContractService
+from contracts.storage import ContentAddressedStorage
+
+PDF = b"%PDF-1.7\n" + b"x" * 1000
+
+
+@pytest.fixture
+def storage(db, tmp_path) -> ContentAddressedStorage:
+    # Хранилище заводит запись StoredDocument до записи файла.
+    return ContentAddressedStorage(location=tmp_path)
+
+
+def test_file_is_stored_under_content_hash(storage) -> None:
+    digest = hashlib.sha256(PDF).hexdigest()
+
+    name = storage.save("documents/Contract-2026-01-01/Scan.PDF", ContentFile(PDF))
+
+    assert name == f"documents/{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+    assert storage.open(name).read() == PDF
+
+
+def test_duplicate_upload_is_not_written_again(storage) -> None:
+    name = storage.save("first.pdf", ContentFile(PDF))
+    modified = storage.get_modified_time(name)
+
+    upload = SimpleUploadedFile("second.pdf", PDF)
+    upload.sha256 = hashlib.sha256(PDF).hexdigest()
+    upload.chunks = pytest.fail  # хэш уже посчитан, содержимое не читается
+
+    assert storage.save("second.pdf", upload) == name
+    assert storage.get_modified_time(name) == modified
+    assert list(Path(storage.path(name)).parent.iterdir()) == [Path(storage.path(name))]
+
+
+def test_magic_bytes_must_match_extension() -> None:
+    ContractService.validate_file(SimpleUploadedFile("contract.pdf", PDF))
+
+    with pytest.raises(ValidationError):
+        ContractService.validate_file(SimpleUploadedFile("contract.pdf", b"MZ\x90\x00"))
+    with pytest.raises(ValidationError):
+        ContractService.validate_file(SimpleUploadedFile("contract.docx", PDF))
+
+
+def test_magic_bytes_are_taken_from_upload_handler() -> None:
+    upload = SimpleUploadedFile("contract.docx", b"not a zip")
+    upload.head = b"PK\x03\x04"
+
+    ContractService.validate_file(upload)
@@ -0,0 +1,135 @@
+import datetime
+
+import pytest
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from contracts.dto_contracts import ContractCreateDTO
+from contracts.models import ContractNotification
+from contracts.services import ContractService
+from contracts.tasks import send_contract_created_email, send_expiry_reminders
+from service_product.models import Product
+from task_queue.brokers import get_broker
+from task_queue.models import Task
+from task_queue.worker import Worker
+
+pytestmark = pytest.mark.django_db
+
+
+def ending_in(days: int) -> dict:
+    return {"end_date": timezone.localdate() + datetime.timedelta(days=days)}
+
+
+class FailingBackend(EmailBackend):
+    """Почтовый сервер, который обрывает соединение после limit писем."""
+
+    limit = 2
+
+    def send_messages(self, messages) -> int:
+        if len(mail.outbox) >= self.limit:
+            raise ConnectionError("SMTP is down")
+        return super().send_messages(messages)
+
+
+def test_expiry_reminders_are_sent_in_batches_once(
+    settings, make_contract, mailoutbox
+) -> None:
+    settings.CONTRACT_EMAIL_BATCH_SIZE = 2
+    expiring = [make_contract(name=f"Expiring {n}", **ending_in(n)) for n in range(5)]
+    make_contract(name="Later", **ending_in(30))
+    make_contract(name="Expired", **ending_in(-1))
+
+    send_expiry_reminders()
+    send_expiry_reminders()
+
+    assert len(mailoutbox) == 5
+    assert [message.subject for message in mailoutbox] == [
+        f"Контракт «{contract.name}» заканчивается {contract.end_date:%d.%m.%Y}"
+        for contract in expiring
+    ]
+    assert mailoutbox[0].to == ["admin@example.com"]
+    assert ContractNotification.objects.filter(kind="expiring").count() == 5
+
+
+def test_renewed_contract_is_reminded_again(make_contract, mailoutbox) -> None:
+    contract = make_contract(**ending_in(3))
+    send_expiry_reminders()
+
+    contract.end_date += datetime.timedelta(days=1)
+    contract.save()
+    send_expiry_reminders()
+
+    assert len(mailoutbox) == 2
+
+
+def test_managers_without_email_are_skipped(
+    make_contract, admin_user, mailoutbox
+) -> None:
+    admin_user.email = ""
+    admin_user.save()
+    make_contract(**ending_in(3))
+
+    send_expiry_reminders()
+
+    assert mailoutbox == []
+
+
+def test_only_sent_reminders_are_recorded(settings, make_contract) -> None:
+    settings.EMAIL_BACKEND = f"{__name__}.FailingBackend"
+    contracts = [make_contract(**ending_in(n)) for n in range(4)]
+
+    with pytest.raises(ConnectionError):
+        send_expiry_reminders()
+
+    assert set(ContractNotification.objects.values_list("contract_id", flat=True)) == {
+        contracts[0].pk,
+        contracts[1].pk,
+    }
+
+    FailingBackend.limit = 4
+    try:
+        send_expiry_reminders()
+    finally:
+        FailingBackend.limit = 2
+
+    assert len(mail.outbox) == 4
+    assert ContractNotification.objects.count() == 4
+
+
+def test_contract_created_email_is_sent_once(make_contract, mailoutbox) -> None:
+    contract = make_contract()
+
+    send_contract_created_email(contract_id=contract.pk)
+    send_contract_created_email(contract_id=contract.pk)
+
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ["admin@example.com"]
+    assert ContractNotification.objects.get().kind == "created"
+
+
+def test_create_contract_enqueues_email(admin_user, media_root, mailoutbox) -> None:
+    today = timezone.localdate()
+    dto = ContractCreateDTO(
+        name="Contract",
+        product=Product.objects.create(name="Product", cost=100, created_by=admin_user),
+        file_document=SimpleUploadedFile("contract.pdf", b"%PDF-1.7\n"),
+        start_date=today + datetime.timedelta(days=1),
+        end_date=today + datetime.timedelta(days=365),
+        cost=100,
+        created_by=admin_user,
+    )
+
+    contract = ContractService.create_contract(dto)
+
+    task = Task.objects.get()
+    assert task.name == "contracts.send_contract_created_email"
+    assert task.kwargs == {"contract_id": contract.pk}
+    assert task.dedup_key == f"contract_created:{contract.pk}"
+    # Письмо отправляет воркер, а не запрос, создавший контракт.
+    assert mailoutbox == []
+
+    Worker(get_broker()).run_once()
+
+    assert [message.to for message in mailoutbox] == [["admin@example.com"]]
@@ -2,17 +2,29 @@ from django.urls import path
 
 from .views import (
     ContractListView,
+    ContractExportView,
     ContractCreateView,
     ContractDetailView,
     ContractUpdateView,
     ContractDeleteView,
+    ContractDocumentView,
 )
 
 app_name = "contracts"
 urlpatterns = [
     path("", ContractListView.as_view(), name="contract_list"),
+    path(
+        "export/<str:file_format>/",
+        ContractExportView.as_view(),
+        name="contract_export",
+    ),
     path("new/", ContractCreateView.as_view(), name="contract_create"),
     path("<int:pk>/", ContractDetailView.as_view(), name="contract_detail"),
     path("<int:pk>/edit/", ContractUpdateView.as_view(), name="contract_edit"),
     path("<int:pk>/delete/", ContractDeleteView.as_view(), name="contract_delete"),
+    path(
+        "<int:pk>/document/",
+        ContractDocumentView.as_view(),
+        name="contract_document",
+    ),
 ]
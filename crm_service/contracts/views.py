@@ -1,20 +1,31 @@
+import os
+
 from django.contrib.auth.mixins import PermissionRequiredMixin, LoginRequiredMixin
-from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.http import HttpResponse, HttpRequest
-from django.shortcuts import redirect
+from django.http import Http404, HttpResponse, HttpRequest
+from django.http.response import HttpResponseBase
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
+from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DetailView
 
-from core.base import MyDeleteView
+from core.base import MyDeleteView, QuerySetShapingMixin
+from core.downloads import serve_file
+from core.exports import ExportColumn, ExportView
 from .dto_contracts import ContractCreateDTO, ContractUpdateDTO
 from .services import ContractService
 from .forms import ContractForm
 from .models import Contract
 
 
-class ContractListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class ContractListView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    ListView,
+):
     """Представление для отображения списка контрактов."""
 
     permission_required: str = "contracts.view_contract"
@@ -24,6 +35,32 @@ class ContractListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     ordering: tuple[str,] = ("-created_at",)
 
 
+class ContractExportView(ExportView):
+    """
+    Потоковая выгрузка контрактов в CSV или XLSX.
+    Контракт с несколькими клиентами выгружается строкой на каждого клиента.
+    """
+
+    permission_required: str = "contracts.view_contract"
+    model: Contract = Contract
+    filename: str = "contracts"
+    ordering: tuple[str, ...] = ("pk", "customer__pk")
+    columns: tuple[ExportColumn, ...] = (
+        "id",
+        "name",
+        "product__name",
+        "start_date",
+        "end_date",
+        "cost",
+        ("customer__id", _("Customer")),
+        "customer__lead__last_name",
+        "customer__lead__first_name",
+        "customer__lead__email",
+        ("customer__lead__campaign__name", _("Campaign")),
+        "created_at",
+    )
+
+
 class ContractCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     """Представление для создания нового контракта."""
 
@@ -34,7 +71,7 @@ class ContractCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView
 
     def form_valid(self, form: ContractForm) -> HttpResponse:
         """Обрабатывает валидную форму."""
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         try:
             dto = ContractCreateDTO(**form.cleaned_data, created_by=user)
             contract = ContractService.create_contract(dto)
@@ -44,15 +81,49 @@ class ContractCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView
             return self.form_invalid(form)
 
 
-class ContractDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class ContractDetailView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    DetailView,
+):
     """Представление для детального просмотра контракта."""
 
     permission_required: str = "contracts.view_contract"
     model: Contract = Contract
     context_object_name: str = "contract"
+    select_related_fields: tuple[str, ...] = ("product",)
+    deferred_fields: tuple[str, ...] = (
+        "product__description",
+        "product__search_vector",
+    )
     form_class: ContractForm = ContractForm
 
 
+class ContractDocumentView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """
+    Отдаёт файл документа контракта пользователям с правом просмотра контрактов.
+    Поддерживает Range и условные запросы (см. core.downloads.serve_file).
+    """
+
+    permission_required: str = "contracts.view_contract"
+
+    def get(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        """Отдаёт файл под именем контракта."""
+        contract: Contract = get_object_or_404(
+            Contract.objects.only("name", "file_document"), pk=pk
+        )
+        if not contract.file_document:
+            raise Http404("The contract has no document.")
+        extension = os.path.splitext(contract.file_document.name)[1]
+        return serve_file(
+            request,
+            contract.file_document.storage,
+            contract.file_document.name,
+            filename=f"{contract.name}{extension}",
+        )
+
+
 class ContractUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
     """Представление для редактирования контракта."""
 
@@ -72,7 +143,7 @@ class ContractUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView
         form.cleaned_data["updated_by"] = self.request.user
         try:
             dto = ContractUpdateDTO(**form.cleaned_data, id=self.object.pk)
-            contract = ContractService.update_contract(dto)
+            contract = ContractService.update_contract(dto, instance=self.object)
             return redirect("contracts:contract_detail", pk=contract.pk)
         except ValidationError as e:
             form.add_error(None, str(e))
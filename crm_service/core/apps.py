@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self) -> None:
+        """Подключает обработчики сигналов общих сервисов."""
+        from .reference_data import register_reference_data
+        from .signals import connect_counter_signals, connect_role_signals
+
+        connect_counter_signals()
+        connect_role_signals()
+        register_reference_data()
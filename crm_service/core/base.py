@@ -7,9 +7,12 @@ from django.contrib.auth.models import User
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.forms.models import ModelChoiceIterator
 from django.http import Http404
 from django.views.generic import DeleteView
 
+from .reference_data import reference_data
+
 
 logger = logging.getLogger("services")
 
@@ -68,6 +71,40 @@ class BaseService(ServiceProtocol):
         if model.objects.filter(name=name).exists():
             raise ValidationError(message)
 
+    @staticmethod
+    def _update_from_dto(
+        model: type[models.Model],
+        dto: "BaseDTO",
+        instance: Optional[models.Model] = None,
+        **extra_fields,
+    ) -> models.Model:
+        """
+        Обновляет запись модели данными из DTO одним запросом UPDATE.
+        Args:
+            model: модель обновляемой записи
+            dto: DTO с id записи и новыми значениями полей (None не обновляются)
+            instance: уже загруженная запись (например, self.object в UpdateView),
+                чтобы не загружать её повторно
+            extra_fields: дополнительные поля, вычисленные сервисом
+        Returns:
+            Обновлённый объект модели.
+        """
+        fields = {**dto.to_dict(), **extra_fields}
+        pk = fields.pop("id")
+        if instance is None:
+            instance = model.objects.get(pk=pk)
+
+        for name, value in fields.items():
+            setattr(instance, name, value)
+        # auto_now поля не попадают в update_fields автоматически.
+        auto_now_fields = [
+            field.name
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        instance.save(update_fields=[*fields, *auto_now_fields])
+        return instance
+
 
 @dataclass
 class BaseDTO:
@@ -89,6 +126,77 @@ class BaseForm(forms.ModelForm):
         self.user = user
 
 
+class ReferenceChoiceIterator(ModelChoiceIterator):
+    """Варианты выбора из кэша справочных данных вместо запроса к базе."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.get_objects():
+            yield self.choice(obj)
+
+    def __len__(self) -> int:
+        return len(self.field.get_objects()) + (self.field.empty_label is not None)
+
+
+class ReferenceChoiceField(forms.ModelChoiceField):
+    """
+    Поле выбора записи справочника (core.reference_data).
+    Варианты и выбранная запись берутся из кэша без запросов к базе.
+
+    Атрибуты:
+        dataset (str): Имя набора справочных данных.
+    """
+
+    dataset: str
+    iterator = ReferenceChoiceIterator
+
+    def get_objects(self) -> list[models.Model]:
+        return reference_data.get(self.dataset)
+
+    def to_python(self, value) -> Optional[models.Model]:
+        if value in self.empty_values:
+            return None
+        if isinstance(value, models.Model):
+            value = value.pk
+        for obj in self.get_objects():
+            if str(obj.pk) == str(value):
+                return obj
+        raise ValidationError(
+            self.error_messages["invalid_choice"],
+            code="invalid_choice",
+            params={"value": value},
+        )
+
+
+class QuerySetShapingMixin:
+    """
+    Миксин ListView и DetailView, подгружающий связанные записи,
+    которые использует шаблон, одним запросом вместо запроса на каждую строку.
+
+    Атрибуты:
+        select_related_fields (tuple): Связи ForeignKey и OneToOne для select_related.
+        prefetch_related_fields (tuple): Обратные и many-to-many связи для prefetch_related.
+        deferred_fields (tuple): Столбцы, которые шаблону не нужны, например
+            большие текстовые поля и поисковые векторы.
+    """
+
+    select_related_fields: tuple[str, ...] = ()
+    prefetch_related_fields: tuple[str, ...] = ()
+    deferred_fields: tuple[str, ...] = ()
+
+    def get_queryset(self) -> models.QuerySet:
+        """Добавляет к queryset представления связи и отложенные столбцы."""
+        queryset = super().get_queryset()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        if self.deferred_fields:
+            queryset = queryset.defer(*self.deferred_fields)
+        return queryset
+
+
 class MyDeleteView(DeleteView):
     """Кастомный Delete View для переопределения метода get_success_url всех его наследников."""
 
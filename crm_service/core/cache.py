@@ -0,0 +1,150 @@
+"""
+Двухуровневый кэш: L1 в памяти процесса перед общим для всех процессов L2.
+
+L1 хранит копии прочитанных значений не дольше L1_TIMEOUT секунд, поэтому
+часто читаемые ключи (роли пользователя, версии индексов, результаты
+проверок) не требуют обращения к Redis на каждый запрос. Запись и удаление
+выполняются в обоих уровнях; L1 других процессов устаревает не дольше,
+чем на L1_TIMEOUT, поэтому в L1 не стоит держать то, что должно меняться
+мгновенно во всех процессах.
+
+Пример настройки:
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache.LayeredCache",
+            "OPTIONS": {"L2": "shared", "L1_TIMEOUT": 5, "L1_MAX_ENTRIES": 1000},
+        },
+        "shared": {"BACKEND": "django_redis.cache.RedisCache", ...},
+    }
+"""
+
+from typing import Any, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class LayeredCache(BaseCache):
+    """
+    Бэкенд кэша, объединяющий локальный LocMemCache (L1) и кэш из CACHES (L2).
+
+    Ключи передаются в L2 без изменений, поэтому префикс и версия ключей
+    задаются в настройках самого L2.
+    """
+
+    def __init__(self, location: str, params: dict) -> None:
+        options = params.get("OPTIONS", {})
+        self._l2_alias: str = options["L2"]
+        self.l1_timeout: int = options.get("L1_TIMEOUT", 5)
+        super().__init__({**params, "OPTIONS": {}})
+        self.l1 = LocMemCache(
+            f"layered:{location or self._l2_alias}",
+            {
+                "TIMEOUT": self.l1_timeout,
+                "OPTIONS": {"MAX_ENTRIES": options.get("L1_MAX_ENTRIES", 1000)},
+            },
+        )
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    def _l1_timeout(self, timeout: Any) -> float:
+        """Срок жизни копии в L1: не дольше L1_TIMEOUT и срока в L2."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        missing = object()
+        value = self.l1.get(key, missing, version=version)
+        if value is not missing:
+            return value
+        value = self.l2.get(key, missing, version=version)
+        if value is missing:
+            return default
+        self.l1.set(key, value, timeout=self.l1_timeout, version=version)
+        return value
+
+    def get_many(self, keys, version: Optional[int] = None) -> dict[str, Any]:
+        found = self.l1.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_l2 = self.l2.get_many(missing, version=version)
+            self.l1.set_many(from_l2, timeout=self.l1_timeout, version=version)
+            found.update(from_l2)
+        return found
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        self.l2.set(key, value, timeout=timeout, version=version)
+        self.l1.set(key, value, timeout=self._l1_timeout(timeout), version=version)
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        added = self.l2.add(key, value, timeout=timeout, version=version)
+        if added:
+            self.l1.set(key, value, timeout=self._l1_timeout(timeout), version=version)
+        return added
+
+    def set_many(
+        self, data: dict, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> list:
+        failed = self.l2.set_many(data, timeout=timeout, version=version)
+        self.l1.set_many(
+            {key: value for key, value in data.items() if key not in failed},
+            timeout=self._l1_timeout(timeout),
+            version=version,
+        )
+        return failed
+
+    def touch(
+        self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> bool:
+        self.l1.delete(key, version=version)
+        return self.l2.touch(key, timeout=timeout, version=version)
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        # Счётчик изменяется атомарно только в L2, копию в L1 сбрасываем.
+        self.l1.delete(key, version=version)
+        return self.l2.incr(key, delta, version=version)
+
+    def decr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        return self.incr(key, -delta, version=version)
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        self.l1.delete(key, version=version)
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version: Optional[int] = None) -> None:
+        self.l1.delete_many(keys, version=version)
+        self.l2.delete_many(keys, version=version)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        return self.l1.has_key(key, version=version) or self.l2.has_key(
+            key, version=version
+        )
+
+    def clear(self) -> None:
+        self.l1.clear()
+        self.l2.clear()
+
+    def clear_local(self) -> None:
+        """Очищает только L1 этого процесса."""
+        self.l1.clear()
+
+    def close(self, **kwargs) -> None:
+        self.l2.close(**kwargs)
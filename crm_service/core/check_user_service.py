@@ -1,3 +1,7 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import User
 
@@ -8,6 +12,11 @@ class UserRoleService(BaseService):
     """
     Сервис для проверки ролей пользователей.
 
+    Названия групп пользователя загружаются один раз: они запоминаются на объекте
+    пользователя (то есть на время запроса) и в кэше на USER_ROLES_CACHE_TIMEOUT.
+    Кэш сбрасывается сигналами при изменении групп (см. core.signals),
+    поэтому проверка роли в сервисах - это поиск во множестве в памяти.
+
     Атрибуты:
         roles (dict): Словарь, связывающий сервисы с требуемыми ролями.
     """
@@ -20,6 +29,29 @@ class UserRoleService(BaseService):
         "CustomerService": "manager",
     }
 
+    @staticmethod
+    def roles_cache_key(user_id: int) -> str:
+        """Возвращает ключ кэша названий групп пользователя."""
+        return f"user_roles:{user_id}"
+
+    @classmethod
+    def get_user_roles(cls, user: User) -> frozenset[str]:
+        """Возвращает названия групп пользователя из памяти, кэша или базы."""
+        roles: frozenset[str] | None = getattr(user, "_role_names", None)
+        if roles is None:
+            key = cls.roles_cache_key(user.pk)
+            roles = cache.get(key)
+            if roles is None:
+                roles = frozenset(user.groups.values_list("name", flat=True))
+                cache.set(key, roles, timeout=settings.USER_ROLES_CACHE_TIMEOUT)
+            user._role_names = roles
+        return roles
+
+    @classmethod
+    def invalidate_user_roles(cls, user_ids: Iterable[int]) -> None:
+        """Сбрасывает кэш названий групп пользователей."""
+        cache.delete_many([cls.roles_cache_key(user_id) for user_id in user_ids])
+
     @classmethod
     def _check_user_role(cls, user: User, service_name: str) -> None:
         """
@@ -30,10 +62,7 @@ class UserRoleService(BaseService):
         if required_role is None:
             raise ValueError(_("No role defined for this service."))
 
-        if (
-            not user.groups.filter(name=required_role).exists()
-            and not user.is_superuser
-        ):
+        if not user.is_superuser and required_role not in cls.get_user_roles(user):
             raise ValueError(
                 _(
                     f"The user must be a member of the '{required_role}' group or an admin."
@@ -0,0 +1,119 @@
+import logging
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import connections, models, router, transaction
+
+logger = logging.getLogger("services")
+
+
+class ModelCounterService:
+    """
+    Сервис счётчиков количества записей моделей, хранящихся в кэше.
+
+    Счётчики корректируются сигналами post_save/post_delete (см. core.signals),
+    а по истечении COUNTERS_CACHE_TIMEOUT пересчитываются заново, что
+    исправляет расхождения после массовых операций в обход сигналов.
+    Для очень больших таблиц PostgreSQL вместо COUNT(*) используется оценка
+    pg_class.reltuples (см. COUNTERS_ESTIMATE_THRESHOLD).
+
+    Атрибуты:
+        tracked_models (tuple): Модели, для которых ведутся счётчики,
+            в виде "app_label.Model".
+        cache_alias (str): Кэш счётчиков из CACHES, без L1, чтобы incr
+            был атомарным для всех процессов.
+    """
+
+    tracked_models: tuple[str, ...] = (
+        "service_product.Product",
+        "ads.AdsCompany",
+        "leads.Lead",
+        "customers.Customer",
+    )
+    cache_alias: str = "counters"
+
+    @classmethod
+    def get_cache(cls) -> BaseCache:
+        """Возвращает кэш, в котором хранятся счётчики."""
+        return caches[cls.cache_alias]
+
+    @staticmethod
+    def cache_key(model: type[models.Model]) -> str:
+        """Возвращает ключ кэша счётчика модели."""
+        return f"counter:{model._meta.label_lower}"
+
+    @classmethod
+    def get_counts(cls) -> dict[str, int]:
+        """
+        Возвращает количество записей всех моделей из кэша,
+        подсчитывая и кэшируя только отсутствующие значения.
+
+        Returns:
+            dict[str, int]: {"app_label.model": количество}
+        """
+        counted_models = [apps.get_model(label) for label in cls.tracked_models]
+        keys = {cls.cache_key(model): model for model in counted_models}
+        counts: dict[str, int] = cls.get_cache().get_many(keys)
+
+        missing = {
+            key: cls._count_rows(model)
+            for key, model in keys.items()
+            if key not in counts
+        }
+        if missing:
+            cls.get_cache().set_many(missing, timeout=settings.COUNTERS_CACHE_TIMEOUT)
+            counts.update(missing)
+
+        return {model._meta.label_lower: counts[key] for key, model in keys.items()}
+
+    @classmethod
+    def adjust_on_commit(cls, model: type[models.Model], delta: int) -> None:
+        """Изменяет счётчик модели на delta после фиксации транзакции."""
+        transaction.on_commit(lambda: cls.adjust(model, delta))
+
+    @classmethod
+    def adjust(cls, model: type[models.Model], delta: int) -> None:
+        """Изменяет счётчик модели на delta, если он уже есть в кэше."""
+        try:
+            cls.get_cache().incr(cls.cache_key(model), delta)
+        except ValueError:
+            # Счётчика ещё нет в кэше: он будет подсчитан при следующем чтении.
+            pass
+
+    @classmethod
+    def invalidate(cls, model: type[models.Model]) -> None:
+        """Сбрасывает счётчик модели, например после массовой загрузки данных."""
+        cls.get_cache().delete(cls.cache_key(model))
+
+    @classmethod
+    def _count_rows(cls, model: type[models.Model]) -> int:
+        """Считает записи модели, используя оценку для очень больших таблиц."""
+        threshold: Optional[int] = settings.COUNTERS_ESTIMATE_THRESHOLD
+        if threshold is not None:
+            estimate = cls._estimate_rows(model)
+            if estimate is not None and estimate >= threshold:
+                return estimate
+        return model.objects.count()
+
+    @staticmethod
+    def _estimate_rows(model: type[models.Model]) -> Optional[int]:
+        """
+        Возвращает оценку количества строк таблицы из статистики PostgreSQL.
+        Для других СУБД и ещё не проанализированных таблиц вернёт None.
+        """
+        connection = connections[router.db_for_read(model)]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < 0:
+            return None
+        logger.info("Using reltuples estimate for %s: %s", model._meta.label, row[0])
+        return row[0]
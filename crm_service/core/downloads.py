@@ -0,0 +1,184 @@
+"""
+Отдача файлов из FileSystemStorage с проверкой прав на стороне представления.
+
+serve_file поддерживает условные запросы (ETag, Last-Modified -> 304) и
+HTTP Range (206), поэтому просмотрщик PDF может загружать документ частями.
+Содержимое не читается в память Python:
+    - если задан PROTECTED_MEDIA_ACCEL_PREFIX, файл отдаёт nginx по
+      заголовку X-Accel-Redirect (Range он обрабатывает сам), например:
+          location /protected-media/ { internal; alias /app/uploads/; }
+    - иначе файл отдаётся FileResponse; сервер приложений, поддерживающий
+      wsgi.file_wrapper (gunicorn), передаёт его через sendfile.
+"""
+
+import mimetypes
+import os
+import re
+from typing import BinaryIO, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+)
+
+# Поддерживается один диапазон: bytes=start-end, bytes=start- или bytes=-suffix.
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Имя файла в хранилище с адресацией по содержимому (contracts.storage).
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class RangeNotSatisfiable(ValueError):
+    """Запрошенный диапазон лежит за концом файла."""
+
+
+class RangeFile:
+    """Файл, из которого читается только length байт начиная со start."""
+
+    def __init__(self, file: BinaryIO, start: int, length: int) -> None:
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def serve_file(
+    request: HttpRequest,
+    storage: FileSystemStorage,
+    name: str,
+    filename: Optional[str] = None,
+    as_attachment: bool = False,
+) -> HttpResponseBase:
+    """
+    Отдаёт файл хранилища.
+    Args:
+        request: запрос (права уже проверены представлением)
+        storage: хранилище файла
+        name: имя файла в хранилище
+        filename: имя файла для пользователя (Content-Disposition)
+        as_attachment: скачивать файл, а не открывать в браузере
+    Raises:
+        Http404: если файла нет
+    """
+    try:
+        stat = os.stat(storage.path(name))
+    except FileNotFoundError:
+        raise Http404("File not found.")
+    filename = filename or os.path.basename(name)
+    etag = file_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+
+    validators = HttpResponse(
+        headers={
+            "ETag": etag,
+            "Last-Modified": http_date(last_modified),
+            "Cache-Control": "private, no-cache",
+        }
+    )
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=validators
+    )
+    if conditional is not validators:
+        return conditional
+
+    accel_prefix = settings.PROTECTED_MEDIA_ACCEL_PREFIX
+    if accel_prefix:
+        content_type, __ = mimetypes.guess_type(filename)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        response["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{quote(name)}"
+        response["Content-Disposition"] = content_disposition_header(
+            as_attachment, filename
+        )
+    else:
+        try:
+            byte_range = parse_range(request, stat.st_size, etag, last_modified)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+        file = open(storage.path(name), "rb")
+        if byte_range is None:
+            response = FileResponse(
+                file, as_attachment=as_attachment, filename=filename
+            )
+        else:
+            start, end = byte_range
+            response = FileResponse(
+                RangeFile(file, start, end - start + 1),
+                status=206,
+                as_attachment=as_attachment,
+                filename=filename,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+
+    for header in ("ETag", "Last-Modified", "Cache-Control"):
+        response[header] = validators[header]
+    return response
+
+
+def file_etag(name: str, stat: os.stat_result) -> str:
+    """
+    Сильный ETag файла: SHA-256 из имени файла в хранилище с адресацией
+    по содержимому, для остальных файлов - время изменения и размер.
+    """
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if SHA256_RE.match(stem):
+        return f'"{stem}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(
+    request: HttpRequest, size: int, etag: str, last_modified: int
+) -> Optional[tuple[int, int]]:
+    """
+    Возвращает запрошенный диапазон (первый байт, последний байт) или None,
+    если нужно отдать файл целиком: заголовка Range нет, он не поддерживается
+    (несколько диапазонов) или If-Range не совпал с текущей версией файла.
+    Raises:
+        RangeNotSatisfiable: если диапазон начинается за концом файла
+    """
+    header = request.headers.get("Range")
+    if not header or request.method not in ("GET", "HEAD"):
+        return None
+    if_range = request.headers.get("If-Range")
+    if (
+        if_range
+        and if_range != etag
+        and parse_http_date_safe(if_range) != last_modified
+    ):
+        return None
+    match = RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable(header)
+        start, end = max(size - suffix, 0), size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, end
@@ -0,0 +1,339 @@
+"""
+Потоковая выгрузка записей в CSV и XLSX.
+
+Строки читаются из базы данных порциями через
+.values_list(...).iterator(chunk_size=...) (в PostgreSQL - серверным курсором),
+связанные колонки (лид, рекламная компания) берутся JOIN в том же запросе.
+Файл формируется генератором и отдаётся StreamingHttpResponse частями
+по EXPORT_BUFFER_SIZE байт, поэтому первые байты уходят клиенту сразу,
+а потребление памяти не зависит от количества строк.
+
+XLSX собирается без openpyxl: openpyxl отдаёт файл только после
+сохранения всей книги, а здесь лист пишется в ZIP-архив по мере чтения строк.
+Лист Excel вмещает не больше 1 048 576 строк вместе с заголовком: выгрузку
+большего объёма ExportView в XLSX не отдаёт и предлагает CSV.
+"""
+
+import csv
+import datetime
+import decimal
+import io
+import itertools
+import re
+import zipfile
+from typing import Any, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape
+
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+from django.views import View
+
+EXPORT_FORMATS: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# Размер части ответа, которую генератор отдаёт серверу приложений.
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+# Колонка выгрузки: путь к полю ("lead__campaign__name")
+# или (путь к полю, заголовок колонки).
+ExportColumn = str | tuple[str, str]
+
+
+class _ChunkBuffer:
+    """Файлоподобный объект, накапливающий записанные байты до выдачи клиенту."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def _local_datetime(value: datetime.datetime) -> datetime.datetime:
+    """Время в текущем часовом поясе без tzinfo (в файлах пояс не хранится)."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.replace(tzinfo=None, microsecond=0)
+
+
+# Символы, с которых Excel начинает формулу. Такие строки из пользовательских
+# данных экранируются апострофом (CSV injection).
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return _local_datetime(value).isoformat(sep=" ")
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def stream_csv(header: Iterable[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """
+    Возвращает CSV-файл в UTF-8 с BOM (его без настройки открывает Excel)
+    частями по EXPORT_BUFFER_SIZE байт. Заголовок отдаётся сразу.
+    """
+    text = io.StringIO()
+    writer = csv.writer(text)
+    text.write("\ufeff")
+    writer.writerow([str(column) for column in header])
+    yield text.getvalue().encode()
+    text.seek(0)
+    text.truncate()
+
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if text.tell() >= EXPORT_BUFFER_SIZE:
+            yield text.getvalue().encode()
+            text.seek(0)
+            text.truncate()
+    if text.tell():
+        yield text.getvalue().encode()
+
+
+XLSX_EPOCH = datetime.datetime(1899, 12, 30)
+# Строк на листе Excel, включая заголовок.
+XLSX_MAX_ROWS = 1_048_576
+# Индексы стилей (cellXfs) в xl/styles.xml.
+XLSX_HEADER_STYLE = 1
+XLSX_DATE_STYLE = 2
+XLSX_DATETIME_STYLE = 3
+# Символы, недопустимые в XML 1.0.
+XML_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XLSX_PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XLSX_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+XLSX_PARTS: dict[str, str] = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        f'<Relationships xmlns="{XLSX_PACKAGE_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{XLSX_REL_NS}/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        f'<workbook xmlns="{XLSX_MAIN_NS}" xmlns:r="{XLSX_REL_NS}">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        f'<Relationships xmlns="{XLSX_PACKAGE_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{XLSX_REL_NS}/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{XLSX_REL_NS}/styles" Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/styles.xml": (
+        f'<styleSheet xmlns="{XLSX_MAIN_NS}">'
+        '<numFmts count="2">'
+        '<numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+        '<numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm:ss"/>'
+        "</numFmts>"
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/>'
+        "</border></borders>"
+        '<cellStyleXfs count="1">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+        "</cellStyleXfs>"
+        '<cellXfs count="4">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" '
+        'applyFont="1"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" '
+        'applyNumberFormat="1"/>'
+        '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" '
+        'applyNumberFormat="1"/>'
+        "</cellXfs>"
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+        "</cellStyles>"
+        "</styleSheet>"
+    ),
+}
+XLSX_SHEET_START = (
+    f'{XLSX_XML_DECLARATION}<worksheet xmlns="{XLSX_MAIN_NS}">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    "</sheetView></sheetViews><sheetData>"
+)
+XLSX_SHEET_END = "</sheetData></worksheet>"
+
+
+def _xlsx_cell(value: Any, style: int = 0) -> str:
+    """Ячейка листа: числа, даты и логические значения сохраняют тип."""
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, datetime.datetime):
+        delta = _local_datetime(value) - XLSX_EPOCH
+        serial = delta.days + delta.seconds / 86400
+        return f'<c s="{XLSX_DATETIME_STYLE}"><v>{serial}</v></c>'
+    if isinstance(value, datetime.date):
+        serial = (value - XLSX_EPOCH.date()).days
+        return f'<c s="{XLSX_DATE_STYLE}"><v>{serial}</v></c>'
+    text = escape(XML_ILLEGAL_RE.sub("", str(value)))
+    style_attr = f' s="{style}"' if style else ""
+    return (
+        f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+    )
+
+
+def _xlsx_row(values: Iterable[Any], style: int = 0) -> bytes:
+    return (
+        f"<row>{''.join(_xlsx_cell(value, style) for value in values)}</row>".encode()
+    )
+
+
+def stream_xlsx(header: Iterable[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """
+    Возвращает XLSX-файл с одним листом частями по EXPORT_BUFFER_SIZE байт.
+    Строки пишутся в сжатый ZIP-архив по мере чтения, размер архива
+    заранее не известен, поэтому файлы архива записываются с data descriptor.
+    Строки сверх XLSX_MAX_ROWS (вместе с заголовком) не записываются.
+    """
+    rows = itertools.islice(rows, XLSX_MAX_ROWS - 1)
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, XLSX_XML_DECLARATION + content)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(XLSX_SHEET_START.encode())
+            sheet.write(
+                _xlsx_row([str(column) for column in header], XLSX_HEADER_STYLE)
+            )
+            yield buffer.pop()
+            for row in rows:
+                sheet.write(_xlsx_row(row))
+                if buffer.size >= EXPORT_BUFFER_SIZE:
+                    yield buffer.pop()
+            sheet.write(XLSX_SHEET_END.encode())
+    yield buffer.pop()
+
+
+WRITERS = {"csv": stream_csv, "xlsx": stream_xlsx}
+
+
+def column_label(model: type[models.Model], lookup: str) -> str:
+    """Заголовок колонки: verbose_name последнего поля в пути lookup."""
+    field: Optional[models.Field] = None
+    for name in lookup.split("__"):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return lookup
+        if field.is_relation:
+            model = field.related_model
+    return capfirst(getattr(field, "verbose_name", lookup))
+
+
+class ExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """
+    Базовое представление потоковой выгрузки записей модели в CSV или XLSX.
+    Формат передаётся в URL: <prefix>/export/<file_format>/.
+
+    Атрибуты:
+        model (Model): Выгружаемая модель.
+        columns (tuple): Колонки выгрузки (см. ExportColumn). Пути через связи
+            ForeignKey и OneToOne добавляют JOIN в тот же запрос.
+        ordering (tuple): Порядок строк.
+        filename (str): Имя файла без даты и расширения.
+        chunk_size (int): Сколько строк читать из базы данных за раз.
+    """
+
+    model: type[models.Model]
+    columns: tuple[ExportColumn, ...]
+    ordering: tuple[str, ...] = ("pk",)
+    filename: str = "export"
+    chunk_size: int = 2000
+
+    def get_queryset(self) -> models.QuerySet:
+        return self.model._default_manager.order_by(*self.ordering)
+
+    @staticmethod
+    def exceeds_sheet(queryset: models.QuerySet) -> bool:
+        """Не помещаются ли строки на лист XLSX (проверяется без COUNT(*))."""
+        return queryset.values("pk")[XLSX_MAX_ROWS - 1 :].exists()
+
+    def get_columns(self) -> list[tuple[str, str]]:
+        """Возвращает колонки в виде (путь к полю, заголовок)."""
+        return [
+            (
+                (column, column_label(self.model, column))
+                if isinstance(column, str)
+                else column
+            )
+            for column in self.columns
+        ]
+
+    def get(self, request: HttpRequest, file_format: str) -> HttpResponse:
+        if file_format not in EXPORT_FORMATS:
+            raise Http404(f"Unsupported export format: {file_format}")
+        queryset = self.get_queryset()
+        if file_format == "xlsx" and self.exceeds_sheet(queryset):
+            csv_url = reverse(request.resolver_match.view_name, args=["csv"])
+            return HttpResponseBadRequest(
+                _(
+                    "The export has more rows than an Excel sheet holds ({}). "
+                    "Download it as CSV: {}"
+                ).format(XLSX_MAX_ROWS - 1, csv_url)
+            )
+        lookups, header = zip(*self.get_columns())
+        rows = queryset.values_list(*lookups).iterator(chunk_size=self.chunk_size)
+        response = StreamingHttpResponse(
+            WRITERS[file_format](header, rows),
+            content_type=EXPORT_FORMATS[file_format],
+        )
+        response["Content-Disposition"] = content_disposition_header(
+            True, f"{self.filename}-{timezone.localdate():%Y-%m-%d}.{file_format}"
+        )
+        # Не даём nginx накапливать ответ в буфере перед отправкой клиенту.
+        response["X-Accel-Buffering"] = "no"
+        return response
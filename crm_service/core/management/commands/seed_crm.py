@@ -0,0 +1,465 @@
+import io
+import itertools
+import math
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+
+from contracts.services import DocumentService
+from contracts.storage import get_document_storage
+from core.counters import ModelCounterService
+from service_product.autocomplete import product_name_index
+from utils.enums import Country
+
+# Объёмы при --scale 1. Контракт связан с услугой один к одному,
+# поэтому контрактов не может быть больше, чем услуг без контракта.
+DEFAULT_VOLUMES: dict[str, int] = {
+    "categories": 20,
+    "products": 10_000,
+    "campaigns": 1_000,
+    "leads": 100_000,
+    "contracts": 10_000,
+    "customers": 10_000,
+}
+
+CATEGORY_TITLES = (
+    "Контекстная реклама",
+    "SEO",
+    "SMM",
+    "Email-маркетинг",
+    "Веб-разработка",
+    "Аналитика",
+    "Дизайн",
+    "Видеопродакшн",
+)
+SERVICES = ("Настройка", "Аудит", "Ведение", "Продвижение", "Разработка", "Поддержка")
+SUBJECTS = (
+    "контекстной рекламы",
+    "сайта",
+    "интернет-магазина",
+    "сообществ в соцсетях",
+    "email рассылок",
+    "мобильного приложения",
+)
+# (имя, транслитерация для email, женское ли имя)
+FIRST_NAMES = (
+    ("Александр", "alexander", False),
+    ("Мария", "maria", True),
+    ("Дмитрий", "dmitry", False),
+    ("Анна", "anna", True),
+    ("Сергей", "sergey", False),
+    ("Елена", "elena", True),
+    ("Андрей", "andrey", False),
+    ("Ольга", "olga", True),
+)
+LAST_NAMES = (
+    ("Иванов", "ivanov"),
+    ("Смирнов", "smirnov"),
+    ("Кузнецов", "kuznetsov"),
+    ("Попов", "popov"),
+    ("Соколов", "sokolov"),
+    ("Лебедев", "lebedev"),
+    ("Козлов", "kozlov"),
+    ("Новиков", "novikov"),
+)
+# Отчества в мужском роде; для женских имён окончание -ич меняется на -на.
+MIDDLE_NAMES = ("Александрович", "Сергеевич", "Дмитриевич", "Андреевич")
+# Домены, зарезервированные для примеров (RFC 2606).
+EMAIL_DOMAINS = ("example.com", "example.org", "example.net")
+# Коды мобильных операторов РФ: номера +7 9xx xxx xx xx проходят PhoneNumberField.
+MOBILE_CODES = ("903", "905", "906", "909", "915", "916", "925", "926", "977", "985")
+# Множитель, взаимно простой с 10**7: перемешивает номера без повторов.
+PHONE_STEP = 7_919
+COUNTRY_WEIGHTS = {"RU": 70, "KZ": 10, "US": 5, "DE": 5, "FR": 5, "CN": 5}
+
+
+def placeholder_pdf() -> bytes:
+    """Минимальный корректный PDF с одной пустой страницей A4."""
+    objects = (
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>",
+    )
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    return content + b"startxref\n%d\n%%%%EOF\n" % xref
+
+
+class Command(BaseCommand):
+    """
+    Команды:
+        ./manage.py seed_crm
+
+        python manage.py seed_crm --scale 100 --copy --batch-size 20000
+
+    Заполняет базу синтетическими данными для нагрузочного тестирования:
+    категориями, услугами, рекламными компаниями, лидами, контрактами и клиентами.
+    Перед этим создаёт роли (create_roles) и каналы продвижения
+    (init_promotion_channels), так что окружение поднимается одной командой.
+
+    Записи вставляются порциями через bulk_create, а с --copy - командой
+    COPY PostgreSQL, что позволяет создать миллионы строк за минуты.
+    Повторный запуск добавляет новые записи к существующим.
+    Все контракты ссылаются на один файл-заглушку в хранилище документов.
+    После загрузки пересобирается статистика рекламных компаний,
+    а счётчики и индекс автодополнения сбрасываются.
+    """
+
+    help = "Generate synthetic CRM data for load testing."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiplier for the default volumes (10k products, 100k leads).",
+        )
+        for name, count in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{name}",
+                type=int,
+                help=f"Number of {name} to create (default {count} x scale).",
+            )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="How many rows to insert per query.",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Insert rows with PostgreSQL COPY instead of bulk_create.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for reproducible data."
+        )
+        parser.add_argument(
+            "--user",
+            default="seed_admin",
+            help="Username recorded as created_by. Created if it does not exist.",
+        )
+        parser.add_argument(
+            "--skip-setup",
+            action="store_true",
+            help="Do not run create_roles and init_promotion_channels.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy requires PostgreSQL.")
+        self.rng = random.Random(options["seed"])
+        self.batch_size: int = options["batch_size"]
+        self.use_copy: bool = options["copy"]
+        volumes = {
+            name: (
+                options[name]
+                if options[name] is not None
+                else round(count * options["scale"])
+            )
+            for name, count in DEFAULT_VOLUMES.items()
+        }
+
+        if not options["skip_setup"]:
+            quiet = io.StringIO() if options["verbosity"] < 2 else self.stdout
+            call_command("create_roles", stdout=quiet)
+            call_command("init_promotion_channels", stdout=quiet)
+        self.user = self.get_user(options["user"])
+
+        started = time.monotonic()
+        self.create_categories(volumes["categories"])
+        self.create_products(volumes["products"])
+        self.create_campaigns(volumes["campaigns"])
+        self.create_leads(volumes["leads"])
+        self.create_contracts(volumes["contracts"])
+        self.create_customers(volumes["customers"])
+
+        call_command("rebuild_ads_statistics", stdout=io.StringIO())
+        for label in ModelCounterService.tracked_models:
+            ModelCounterService.invalidate(apps.get_model(label))
+        product_name_index.mark_changed()
+        self.stdout.write(
+            self.style.SUCCESS(f"Done in {time.monotonic() - started:.1f} s.")
+        )
+
+    @staticmethod
+    def get_user(username: str) -> models.Model:
+        user_model = get_user_model()
+        user, created = user_model.objects.get_or_create(
+            username=username, defaults={"is_staff": True, "is_superuser": True}
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+        return user
+
+    def create_categories(self, count: int) -> None:
+        category = apps.get_model("service_product", "Category")
+        offset = category.objects.count()
+        self.insert(
+            category,
+            (
+                {
+                    "title": f"{CATEGORY_TITLES[i % len(CATEGORY_TITLES)]} {i}",
+                    "description": "Generated by seed_crm",
+                }
+                for i in range(offset, offset + count)
+            ),
+        )
+
+    def create_products(self, count: int) -> None:
+        product = apps.get_model("service_product", "Product")
+        category_ids = list(
+            apps.get_model("service_product", "Category")
+            .objects.order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        # Несколько популярных категорий и длинный хвост (закон Ципфа).
+        category_weights = list(
+            itertools.accumulate(1 / rank for rank in range(1, len(category_ids) + 1))
+        )
+        offset = product.objects.count()
+
+        def rows() -> Iterator[dict]:
+            for i in range(offset, offset + count):
+                service, subject = self.rng.choice(SERVICES), self.rng.choice(SUBJECTS)
+                yield {
+                    "name": f"{service} {subject} №{i}",
+                    "description": f"{service} {subject} под ключ.",
+                    "cost": self.lognormal(30_000, 1.0, 500, 5_000_000),
+                    "discount": (
+                        0
+                        if self.rng.random() < 0.7
+                        else self.rng.choice((5, 10, 15, 20, 30, 50))
+                    ),
+                    "status": self.rng.choices(
+                        ("active", "inactive", "in_development"), (60, 25, 15)
+                    )[0],
+                    "archived": self.rng.random() < 0.05,
+                    "category_id": self.rng.choices(
+                        category_ids, cum_weights=category_weights
+                    )[0],
+                    "created_by_id": self.user.pk,
+                }
+
+        self.insert(product, rows())
+
+    def create_campaigns(self, count: int) -> None:
+        campaign = apps.get_model("ads", "AdsCompany")
+        product_ids = self.ids("service_product", "Product")
+        channel_ids = self.ids("ads", "PromotionChannel")
+        if not product_ids or not channel_ids:
+            raise CommandError("Campaigns need products and promotion channels.")
+        countries = [Country[code].name for code in COUNTRY_WEIGHTS]
+        offset = campaign.objects.count()
+
+        def rows() -> Iterator[dict]:
+            for i in range(offset, offset + count):
+                yield {
+                    "name": f"Campaign {i}",
+                    "product_id": self.rng.choice(product_ids),
+                    "channel_id": self.rng.choice(channel_ids),
+                    "budget": Decimal(self.lognormal(100_000, 1.2, 1_000, 50_000_000)),
+                    "country": self.rng.choices(countries, COUNTRY_WEIGHTS.values())[0],
+                    "email": f"campaign{i}@{self.rng.choice(EMAIL_DOMAINS)}",
+                    "website": f"https://campaign{i}.example.com",
+                    "created_by_id": self.user.pk,
+                }
+
+        self.insert(campaign, rows())
+
+    def create_leads(self, count: int) -> None:
+        lead = apps.get_model("leads", "Lead")
+        campaign_ids = self.ids("ads", "AdsCompany")
+        if not campaign_ids:
+            raise CommandError("Leads need campaigns.")
+        # Лиды распределены между компаниями неравномерно (распределение Парето).
+        campaign_weights = list(
+            itertools.accumulate(
+                self.rng.paretovariate(1.2) for __ in range(len(campaign_ids))
+            )
+        )
+        offset = lead.objects.count()
+
+        def rows() -> Iterator[dict]:
+            for i in range(offset, offset + count):
+                first_name, first_latin, female = self.rng.choice(FIRST_NAMES)
+                last_name, last_latin = self.rng.choice(LAST_NAMES)
+                middle_name = (
+                    self.rng.choice(MIDDLE_NAMES) if self.rng.random() < 0.5 else ""
+                )
+                if female:
+                    last_name += "а"
+                    middle_name = middle_name.replace("ич", "на")
+                yield {
+                    "first_name": first_name,
+                    "middle_name": middle_name,
+                    "last_name": last_name,
+                    "phone_number": self.phone_number(i),
+                    "email": (
+                        f"{first_latin}.{last_latin}.{i}"
+                        f"@{self.rng.choice(EMAIL_DOMAINS)}"
+                    ),
+                    "campaign_id": self.rng.choices(
+                        campaign_ids, cum_weights=campaign_weights
+                    )[0],
+                    "is_active": self.rng.random() < 0.3,
+                    "created_by_id": self.user.pk,
+                }
+
+        self.insert(lead, rows())
+
+    def create_contracts(self, count: int) -> None:
+        contract = apps.get_model("contracts", "Contract")
+        products = list(
+            apps.get_model("service_product", "Product")
+            .objects.filter(contract__isnull=True)
+            .values_list("pk", "cost", "discount")
+        )
+        if count > len(products):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Only {len(products)} products have no contract, "
+                    f"creating {len(products)} contracts instead of {count}."
+                )
+            )
+            count = len(products)
+        offset = contract.objects.count()
+        today = date.today()
+        # Все контракты ссылаются на один настоящий файл хранилища документов.
+        document = get_document_storage().save(
+            "seed_crm.pdf", ContentFile(placeholder_pdf())
+        )
+
+        def rows() -> Iterator[dict]:
+            for i, (product_id, cost, discount) in enumerate(
+                self.rng.sample(products, count), start=offset
+            ):
+                start_date = today - timedelta(days=self.rng.randint(0, 730))
+                yield {
+                    "name": f"Contract {i}",
+                    "product_id": product_id,
+                    "file_document": document,
+                    "start_date": start_date,
+                    "end_date": start_date
+                    + timedelta(days=self.rng.choice((30, 90, 180, 365, 730))),
+                    "cost": Decimal(round(cost * (1 - discount / 100), 2)),
+                    "created_by_id": self.user.pk,
+                }
+
+        self.insert(contract, rows())
+        # bulk_create и COPY не отправляют сигналы, которые считают ссылки.
+        DocumentService.acquire(document, references=count)
+
+    def create_customers(self, count: int) -> None:
+        customer = apps.get_model("customers", "Customer")
+        contract_ids = self.ids("contracts", "Contract")
+        if not contract_ids:
+            raise CommandError("Customers need contracts.")
+        lead_ids = (
+            apps.get_model("leads", "Lead")
+            .objects.filter(customer__isnull=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:count]
+        )
+        self.insert(
+            customer,
+            (
+                {
+                    "lead_id": lead_id,
+                    "contract_id": self.rng.choice(contract_ids),
+                    "archived": self.rng.random() < 0.1,
+                    "created_by_id": self.user.pk,
+                }
+                for lead_id in lead_ids.iterator()
+            ),
+        )
+
+    def insert(self, model: type[models.Model], rows: Iterable[dict]) -> None:
+        """Вставляет строки порциями через bulk_create или COPY."""
+        started = time.monotonic()
+        created = 0
+        for batch in itertools.batched(rows, self.batch_size):
+            with transaction.atomic():
+                if self.use_copy:
+                    self.copy(model, batch)
+                else:
+                    model.objects.bulk_create(model(**row) for row in batch)
+            created += len(batch)
+        self.stdout.write(
+            f"Created {created} rows in {model._meta.label} "
+            f"in {time.monotonic() - started:.1f} s."
+        )
+
+    @staticmethod
+    def copy(model: type[models.Model], rows: Iterable[dict]) -> None:
+        """
+        Вставляет строки командой COPY без создания экземпляров моделей.
+
+        Значения из строк передаются как есть (ключи - attname полей),
+        поэтому они должны быть уже в формате базы данных. Остальные поля
+        получают значения по умолчанию и auto_now_add, как в bulk_create.
+        """
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key and not field.generated
+        ]
+        template = model()
+        defaults = {
+            field.attname: field.get_db_prep_save(
+                field.pre_save(template, add=True), connection=connection
+            )
+            for field in fields
+        }
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(field.column) for field in fields)
+        sql = f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN"
+        with connection.cursor() as cursor, cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(
+                    [
+                        (
+                            row[field.attname]
+                            if field.attname in row
+                            else defaults[field.attname]
+                        )
+                        for field in fields
+                    ]
+                )
+
+    @staticmethod
+    def ids(app_label: str, model_name: str) -> list[int]:
+        return list(
+            apps.get_model(app_label, model_name)
+            .objects.order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def lognormal(self, median: float, sigma: float, low: int, high: int) -> int:
+        """Случайная сумма с логнормальным распределением, округлённая до сотен."""
+        value = self.rng.lognormvariate(math.log(median), sigma)
+        return int(min(max(value, low), high) // 100 * 100)
+
+    @staticmethod
+    def phone_number(index: int) -> str:
+        """Уникальный для каждого index мобильный номер РФ."""
+        code = MOBILE_CODES[index % len(MOBILE_CODES)]
+        number = (index // len(MOBILE_CODES)) * PHONE_STEP % 10**7
+        return f"+7{code}{number:07d}"
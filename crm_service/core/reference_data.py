@@ -0,0 +1,170 @@
+"""
+Кэш справочных данных: каналы продвижения и категория услуг по умолчанию.
+
+Справочники читаются почти при каждом показе формы и создании услуги,
+а меняются редко, поэтому они хранятся в двух уровнях:
+LRU в памяти процесса (L1) и общий для всех процессов кэш (L2).
+Для каждого набора в общем кэше хранится версия. Изменение любой записи
+справочника увеличивает версию (см. register_reference_data), и все процессы
+перечитывают набор при следующем обращении. Версия начинается со случайного
+числа, а не с нуля: если её вытеснят из кэша, новая версия не совпадёт
+с той, что процессы уже держат в памяти.
+"""
+
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger("services")
+
+Loader = Callable[[], Any]
+
+
+class ReferenceDataCache:
+    """
+    Read-through кэш наборов справочных данных.
+
+    Значения наборов должны сериализоваться pickle (списки моделей,
+    кортежи, числа) и не изменяться вызывающим кодом: L1 отдаёт
+    один и тот же объект всем потокам процесса.
+
+    Атрибуты:
+        cache_alias (str): Общий кэш из CACHES, в котором хранятся версии и наборы.
+        max_entries (int): Сколько наборов держать в памяти процесса.
+    """
+
+    cache_alias: str = "default"
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._loaders: dict[str, Loader] = {}
+        self._local: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.cache_alias]
+
+    @staticmethod
+    def version_key(name: str) -> str:
+        return f"reference_data:{name}:version"
+
+    @staticmethod
+    def data_key(name: str, version: int) -> str:
+        return f"reference_data:{name}:{version}"
+
+    @staticmethod
+    def initial_version() -> int:
+        """Начальная версия набора, которой нет в памяти процессов."""
+        return secrets.randbits(48)
+
+    def register(
+        self,
+        name: str,
+        loader: Loader,
+        depends_on: Iterable[str | type[models.Model]] = (),
+    ) -> None:
+        """
+        Регистрирует набор данных.
+        Args:
+            name: имя набора
+            loader: функция, читающая набор из базы данных
+            depends_on: модели, при изменении которых набор устаревает
+        """
+        self._loaders[name] = loader
+
+        def invalidate(sender, **kwargs) -> None:
+            transaction.on_commit(lambda: self.invalidate(name))
+
+        for model in depends_on:
+            label = model if isinstance(model, str) else model._meta.label
+            for signal, action in ((post_save, "save"), (post_delete, "delete")):
+                signal.connect(
+                    invalidate,
+                    sender=model,
+                    weak=False,
+                    dispatch_uid=f"reference_data_{name}_{label}_{action}",
+                )
+
+    def get(self, name: str) -> Any:
+        """Возвращает набор из памяти процесса, общего кэша или базы данных."""
+        version = self.cache.get_or_set(
+            self.version_key(name), self.initial_version, timeout=None
+        )
+        with self._lock:
+            local = self._local.get(name)
+            if local is not None and local[0] == version:
+                self._local.move_to_end(name)
+                return local[1]
+
+        missing = object()
+        value = self.cache.get(self.data_key(name, version), missing)
+        if value is missing:
+            value = self._loaders[name]()
+            self.cache.set(
+                self.data_key(name, version),
+                value,
+                timeout=settings.REFERENCE_DATA_CACHE_TIMEOUT,
+            )
+
+        with self._lock:
+            self._local[name] = (version, value)
+            self._local.move_to_end(name)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+        return value
+
+    def invalidate(self, name: str) -> None:
+        """Делает набор устаревшим во всех процессах."""
+        key = self.version_key(name)
+        self.cache.add(key, self.initial_version(), timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Версия вытеснена из кэша между add и incr: начинаем с новой.
+            self.cache.set(key, self.initial_version(), timeout=None)
+        with self._lock:
+            self._local.pop(name, None)
+        logger.info("Reference data %r invalidated", name)
+
+
+reference_data = ReferenceDataCache()
+
+
+def load_promotion_channels() -> list[models.Model]:
+    PromotionChannel = apps.get_model("ads", "PromotionChannel")
+    return list(PromotionChannel.objects.order_by("name"))
+
+
+def load_default_category() -> int:
+    from service_product.models import DEFAULT_CATEGORY_TITLE
+
+    Category = apps.get_model("service_product", "Category")
+    categories = Category.objects.filter(title=DEFAULT_CATEGORY_TITLE).order_by("pk")
+    category_id = categories.values_list("pk", flat=True).first()
+    if category_id is None:
+        # Строку создаёт миграция, но её могли удалить вручную.
+        category_id = Category.objects.create(
+            title=DEFAULT_CATEGORY_TITLE,
+            description="A common category for all products",
+        ).pk
+    return category_id
+
+
+def register_reference_data() -> None:
+    """Регистрирует справочники проекта и их сброс при изменении моделей."""
+    reference_data.register(
+        "promotion_channels", load_promotion_channels, ["ads.PromotionChannel"]
+    )
+    reference_data.register(
+        "default_category", load_default_category, ["service_product.Category"]
+    )
@@ -0,0 +1,98 @@
+from typing import Iterable, Optional
+
+from django.contrib.auth.models import Group, User
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from .check_user_service import UserRoleService
+from .counters import ModelCounterService
+
+
+def increment_counter(
+    sender: type[models.Model], created: bool = False, **kwargs
+) -> None:
+    """Увеличивает счётчик модели при создании записи."""
+    if created:
+        ModelCounterService.adjust_on_commit(sender, 1)
+
+
+def decrement_counter(sender: type[models.Model], **kwargs) -> None:
+    """Уменьшает счётчик модели при удалении записи."""
+    ModelCounterService.adjust_on_commit(sender, -1)
+
+
+def connect_counter_signals() -> None:
+    """Подключает обработчики счётчиков ко всем моделям ModelCounterService."""
+    for label in ModelCounterService.tracked_models:
+        post_save.connect(
+            increment_counter, sender=label, dispatch_uid=f"counter_save_{label}"
+        )
+        post_delete.connect(
+            decrement_counter, sender=label, dispatch_uid=f"counter_delete_{label}"
+        )
+
+
+def invalidate_user_roles(
+    sender,
+    instance: models.Model,
+    action: str,
+    reverse: bool,
+    pk_set: Optional[set[int]],
+    **kwargs,
+) -> None:
+    """
+    Сбрасывает кэш ролей пользователей при изменении связи пользователь-группа.
+    Связь может меняться с обеих сторон: user.groups и group.user_set.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return
+    if reverse:
+        # instance - группа; при очистке pk_set не передаётся,
+        # поэтому участников запоминаем до удаления связей.
+        if action == "pre_clear":
+            instance._cleared_user_ids = list(
+                instance.user_set.values_list("pk", flat=True)
+            )
+            return
+        user_ids = pk_set or getattr(instance, "_cleared_user_ids", [])
+    else:
+        if action == "pre_clear":
+            return
+        instance.__dict__.pop("_role_names", None)
+        user_ids = [instance.pk]
+    _invalidate_roles_on_commit(user_ids)
+
+
+def invalidate_group_members_roles(sender, instance: Group, **kwargs) -> None:
+    """Сбрасывает кэш ролей участников группы при её переименовании или удалении."""
+    _invalidate_roles_on_commit(instance.user_set.values_list("pk", flat=True))
+
+
+def _invalidate_roles_on_commit(user_ids: Iterable[int]) -> None:
+    """Сбрасывает кэш ролей сразу и ещё раз после фиксации транзакции."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    UserRoleService.invalidate_user_roles(user_ids)
+    # Повторный сброс не даёт параллельному запросу закэшировать старые роли
+    # до фиксации транзакции.
+    transaction.on_commit(lambda: UserRoleService.invalidate_user_roles(user_ids))
+
+
+def connect_role_signals() -> None:
+    """Подключает сброс кэша ролей пользователей к изменениям групп."""
+    m2m_changed.connect(
+        invalidate_user_roles,
+        sender=User.groups.through,
+        dispatch_uid="user_roles_m2m_changed",
+    )
+    post_save.connect(
+        invalidate_group_members_roles,
+        sender=Group,
+        dispatch_uid="user_roles_group_saved",
+    )
+    pre_delete.connect(
+        invalidate_group_members_roles,
+        sender=Group,
+        dispatch_uid="user_roles_group_deleted",
+    )
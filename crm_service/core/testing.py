@@ -0,0 +1,49 @@
+"""Вспомогательные функции для тестов."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@contextmanager
+def capture_queries(using: str = DEFAULT_DB_ALIAS) -> Iterator[list[str]]:
+    """
+    Собирает SQL запросов, выполненных внутри блока.
+    В отличие от CaptureQueriesContext не требует DEBUG и открытого соединения.
+
+    Yields:
+        list[str]: SQL выполненных запросов, заполняется по ходу блока
+    """
+    queries: list[str] = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(count_query):
+        yield queries
+
+
+@contextmanager
+def assert_max_queries(
+    limit: int, using: str = DEFAULT_DB_ALIAS
+) -> Iterator[list[str]]:
+    """
+    Проверяет, что код внутри блока выполнил не больше limit запросов.
+
+    Пример:
+        with assert_max_queries(4):
+            client.get(reverse("leads:leads_list"))
+
+    Yields:
+        list[str]: SQL выполненных запросов, заполняется по ходу блока
+    """
+    with capture_queries(using) as queries:
+        yield queries
+
+    assert (
+        len(queries) <= limit
+    ), f"{len(queries)} queries executed, expected at most {limit}:\n" + "\n".join(
+        queries
+    )
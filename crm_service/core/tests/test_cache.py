@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from core.cache import LayeredCache
+
+# LocMemCache вместо Redis в роли общего кэша L2.
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-default",
+    },
+    "l2": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-l2",
+        "KEY_PREFIX": "crm:shared",
+        "VERSION": 2,
+    },
+}
+
+
+@pytest.fixture
+def layered():
+    with override_settings(CACHES=TEST_CACHES):
+        layered = LayeredCache("test-layered", {"OPTIONS": {"L2": "l2"}})
+        yield layered
+        layered.clear()
+
+
+def test_reads_are_served_from_l1(layered) -> None:
+    layered.set("key", "value")
+    caches["l2"].delete("key")
+
+    assert layered.get("key") == "value"
+
+
+def test_l2_value_is_copied_to_l1(layered) -> None:
+    caches["l2"].set("key", [1, 2, 3])
+
+    assert layered.get("key") == [1, 2, 3]
+    assert layered.l1.get("key") == [1, 2, 3]
+    assert layered.get_many(["key", "missing"]) == {"key": [1, 2, 3]}
+
+
+def test_incr_and_delete_reach_l2(layered) -> None:
+    layered.set("counter", 1)
+    caches["l2"].set("counter", 5)
+
+    assert layered.incr("counter") == 6
+    assert layered.get("counter") == 6
+
+    layered.delete("counter")
+    assert layered.get("counter") is None
+    assert caches["l2"].get("counter") is None
+
+
+def test_l1_never_outlives_its_timeout(layered) -> None:
+    layered.set("key", "value", timeout=None)
+
+    assert layered._l1_timeout(None) == layered.l1_timeout
+    assert layered._l1_timeout(1) == 1
+    assert caches["l2"].get("key") == "value"
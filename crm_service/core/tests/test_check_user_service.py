@@ -0,0 +1,89 @@
+import pytest
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+
+from core.check_user_service import UserRoleService
+
+
+@pytest.fixture
+def cached_marketer():
+    user = User(pk=42, username="marketer")
+    key = UserRoleService.roles_cache_key(user.pk)
+    cache.set(key, frozenset({"marketer"}))
+    yield user
+    cache.delete(key)
+
+
+def test_roles_are_read_from_cache_and_memoized(cached_marketer) -> None:
+    roles = UserRoleService.get_user_roles(cached_marketer)
+
+    assert roles == {"marketer"}
+    cache.delete(UserRoleService.roles_cache_key(cached_marketer.pk))
+    # Повторная проверка в рамках запроса не обращается ни к кэшу, ни к базе.
+    assert UserRoleService.get_user_roles(cached_marketer) is roles
+
+
+def test_check_user_role_uses_cached_roles(cached_marketer) -> None:
+    UserRoleService._check_user_role(cached_marketer, "AdsCompanyService")
+
+    with pytest.raises(ValueError):
+        UserRoleService._check_user_role(cached_marketer, "LeadService")
+
+
+def test_superuser_skips_role_lookup() -> None:
+    admin = User(pk=1, username="admin", is_superuser=True)
+
+    UserRoleService._check_user_role(admin, "ContractService")
+    assert not hasattr(admin, "_role_names")
+
+
+def test_invalidate_user_roles(cached_marketer) -> None:
+    UserRoleService.invalidate_user_roles([cached_marketer.pk])
+
+    assert cache.get(UserRoleService.roles_cache_key(cached_marketer.pk)) is None
+
+
+def fresh_roles(user: User) -> frozenset[str]:
+    """Роли, как их увидит следующий запрос: новый экземпляр, общий кэш."""
+    return UserRoleService.get_user_roles(User.objects.get(pk=user.pk))
+
+
+@pytest.mark.django_db
+def test_group_membership_changes_invalidate_cached_roles(
+    django_user_model, django_capture_on_commit_callbacks
+) -> None:
+    user = django_user_model.objects.create_user("manager")
+    marketer = Group.objects.create(name="marketer")
+    assert fresh_roles(user) == set()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(marketer)
+    assert fresh_roles(user) == {"marketer"}
+    assert UserRoleService.get_user_roles(user) == {"marketer"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.remove(marketer)
+    assert fresh_roles(user) == set()
+    assert UserRoleService.get_user_roles(user) == set()
+
+
+@pytest.mark.django_db
+def test_group_side_changes_invalidate_cached_roles(
+    django_user_model, django_capture_on_commit_callbacks
+) -> None:
+    user = django_user_model.objects.create_user("manager")
+    group = Group.objects.create(name="operator")
+    assert fresh_roles(user) == set()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.user_set.add(user)
+    assert fresh_roles(user) == {"operator"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.name = "marketer"
+        group.save()
+    assert fresh_roles(user) == {"marketer"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        group.user_set.clear()
+    assert fresh_roles(user) == set()
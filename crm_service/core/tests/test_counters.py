@@ -0,0 +1,98 @@
+import runpy
+
+import pytest
+from django.db import connection, transaction
+
+from core.counters import ModelCounterService
+from core.testing import capture_queries
+from crm_service import settings as project_settings
+from leads.models import Lead
+
+
+@pytest.fixture
+def unreachable_redis(settings, monkeypatch) -> None:
+    """Кэши из настроек проекта, но с Redis, к которому нельзя подключиться."""
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+    counters = runpy.run_path(project_settings.__file__)["CACHES"]["counters"]
+    counters["OPTIONS"]["SOCKET_CONNECT_TIMEOUT"] = 0.1
+    settings.CACHES = {**settings.CACHES, "counters": counters}
+
+
+@pytest.mark.django_db
+def test_counters_fail_open(unreachable_redis, make_lead) -> None:
+    make_lead()
+
+    ModelCounterService.adjust(Lead, 1)
+
+    assert ModelCounterService.get_counts()["leads.lead"] == 1
+
+
+def cached_leads() -> int | None:
+    return ModelCounterService.get_cache().get(ModelCounterService.cache_key(Lead))
+
+
+@pytest.mark.django_db
+def test_signals_adjust_cached_count_after_commit(
+    make_lead, django_capture_on_commit_callbacks
+) -> None:
+    assert ModelCounterService.get_counts()["leads.lead"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        lead = make_lead()
+        make_lead()
+        # До фиксации транзакции счётчик не меняется.
+        assert cached_leads() == 0
+    assert cached_leads() == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        lead.delete()
+    assert cached_leads() == 1
+
+
+@pytest.mark.django_db
+def test_rollback_keeps_counts(make_lead, django_capture_on_commit_callbacks) -> None:
+    ModelCounterService.get_counts()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError), transaction.atomic():
+            make_lead()
+            raise RuntimeError
+
+    assert cached_leads() == 0
+
+
+@pytest.mark.django_db
+def test_home_page_served_from_cached_counts(client, make_lead) -> None:
+    make_lead()
+    ModelCounterService.get_counts()
+
+    with capture_queries() as queries:
+        response = client.get("/")
+
+    assert response.status_code == 200
+    assert response.context["leads_count"] == 1
+    assert not [sql for sql in queries if "COUNT(" in sql.upper()]
+
+
+@pytest.mark.django_db
+def test_large_tables_use_reltuples_estimate(settings, make_lead) -> None:
+    for _ in range(3):
+        make_lead()
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Lead._meta.db_table}")
+
+    settings.COUNTERS_ESTIMATE_THRESHOLD = 2
+    with capture_queries() as queries:
+        counts = ModelCounterService.get_counts()
+
+    assert counts["leads.lead"] == 3
+    lead_queries = [sql for sql in queries if Lead._meta.db_table in sql]
+    assert lead_queries == []
+    assert any("reltuples" in sql for sql in queries)
+
+    ModelCounterService.invalidate(Lead)
+    settings.COUNTERS_ESTIMATE_THRESHOLD = 4
+    with capture_queries() as queries:
+        assert ModelCounterService.get_counts()["leads.lead"] == 3
+
+    assert [sql for sql in queries if Lead._meta.db_table in sql]
@@ -0,0 +1,94 @@
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import RequestFactory, override_settings
+from django.utils.http import http_date
+
+from contracts.storage import ContentAddressedStorage
+from core.downloads import serve_file
+
+CONTENT = b"%PDF-1.7\n" + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def stored(db, tmp_path) -> tuple[ContentAddressedStorage, str]:
+    # Хранилище заводит запись StoredDocument до записи файла.
+    storage = ContentAddressedStorage(location=tmp_path)
+    return storage, storage.save("contract.pdf", ContentFile(CONTENT))
+
+
+def get(stored, **headers):
+    storage, name = stored
+    request = RequestFactory().get("/", headers=headers)
+    return serve_file(request, storage, name, filename="Contract.pdf")
+
+
+def test_full_file_is_streamed(stored) -> None:
+    response = get(stored)
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == CONTENT
+    assert response["Content-Length"] == str(len(CONTENT))
+    assert response["Content-Type"] == "application/pdf"
+    assert response["ETag"] == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+    assert response["Accept-Ranges"] == "bytes"
+    assert 'filename="Contract.pdf"' in response["Content-Disposition"]
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [
+        ("bytes=0-9", 0, 9),
+        ("bytes=1000-", 1000, len(CONTENT) - 1),
+        ("bytes=-5", len(CONTENT) - 5, len(CONTENT) - 1),
+    ],
+)
+def test_range_request(stored, header: str, start: int, end: int) -> None:
+    response = get(stored, Range=header)
+
+    assert response.status_code == 206
+    assert b"".join(response.streaming_content) == CONTENT[start : end + 1]
+    assert response["Content-Length"] == str(end - start + 1)
+    assert response["Content-Range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+
+
+def test_range_past_end(stored) -> None:
+    response = get(stored, Range="bytes=100000-")
+
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_stale_if_range_returns_full_file(stored) -> None:
+    response = get(stored, Range="bytes=0-9", If_Range='"old"')
+
+    assert response.status_code == 200
+
+
+def test_conditional_requests(stored) -> None:
+    etag = get(stored)["ETag"]
+    last_modified = get(stored)["Last-Modified"]
+
+    not_modified = get(stored, If_None_Match=etag)
+    assert not_modified.status_code == 304
+    assert not_modified["ETag"] == etag
+    assert get(stored, If_Modified_Since=last_modified).status_code == 304
+    assert get(stored, If_Match='"other"').status_code == 412
+    assert get(stored, If_Modified_Since=http_date(0)).status_code == 200
+
+
+@override_settings(PROTECTED_MEDIA_ACCEL_PREFIX="/protected-media/")
+def test_accel_redirect(stored) -> None:
+    response = get(stored, Range="bytes=0-9")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response["X-Accel-Redirect"] == f"/protected-media/{stored[1]}"
+    assert response["Content-Type"] == "application/pdf"
+
+
+def test_missing_file(tmp_path) -> None:
+    with pytest.raises(Http404):
+        get((ContentAddressedStorage(location=tmp_path), "documents/missing.pdf"))
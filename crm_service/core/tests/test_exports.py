@@ -0,0 +1,145 @@
+import csv
+import datetime
+import io
+import zipfile
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+
+from core.exports import EXPORT_BUFFER_SIZE, column_label, stream_csv, stream_xlsx
+from leads.models import Lead
+
+HEADER = ("ID", "Name", "Cost", "Date", "Created at", "Active")
+ROWS = [
+    (1, "=HYPERLINK()", Decimal("10.50"), datetime.date(2025, 3, 1), None, True),
+    (2, "Иван <&>", Decimal("0.00"), None, datetime.datetime(2025, 3, 1, 12), False),
+]
+
+
+def rows_consumed_lazily(consumed: list, count: int = 100_000):
+    for number in range(count):
+        consumed.append(number)
+        yield number, f"name {number}", Decimal(number), None, None, True
+
+
+def test_csv() -> None:
+    content = b"".join(stream_csv(HEADER, ROWS)).decode()
+
+    assert content.startswith("\ufeff")
+    rows = list(csv.reader(io.StringIO(content[1:])))
+    assert rows == [
+        list(HEADER),
+        ["1", "'=HYPERLINK()", "10.50", "2025-03-01", "", "True"],
+        ["2", "Иван <&>", "0.00", "", "2025-03-01 12:00:00", "False"],
+    ]
+
+
+@pytest.mark.parametrize("writer", [stream_csv, stream_xlsx])
+def test_header_is_sent_before_rows_are_read(writer) -> None:
+    consumed = []
+    chunks = writer(HEADER, rows_consumed_lazily(consumed))
+
+    assert next(chunks)
+    assert consumed == []
+    assert len(next(chunks)) >= EXPORT_BUFFER_SIZE
+    assert 0 < len(consumed) < 100_000
+
+
+def test_xlsx_is_valid_archive() -> None:
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_xlsx(HEADER, ROWS))))
+
+    assert archive.testzip() is None
+    sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+    assert "Иван &lt;&amp;&gt;" in sheet
+    assert '<c t="inlineStr"><is><t xml:space="preserve">=HYPERLINK()' in sheet
+
+
+def test_xlsx_values_keep_types() -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    content = b"".join(stream_xlsx(HEADER, ROWS))
+
+    workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True)
+    rows = list(workbook.active.iter_rows(values_only=True))
+
+    assert rows == [
+        HEADER,
+        (1, "=HYPERLINK()", 10.5, datetime.datetime(2025, 3, 1), None, True),
+        (2, "Иван <&>", 0, None, datetime.datetime(2025, 3, 1, 12), False),
+    ]
+
+
+def test_column_labels_follow_relations() -> None:
+    assert column_label(Lead, "first_name") == "First Name"
+    assert column_label(Lead, "campaign__name") == "Company name"
+    assert column_label(Lead, "customer__contract__cost") == "Cost"
+
+
+def test_export_urls() -> None:
+    assert reverse("contracts:contract_export", args=["csv"]) == (
+        "/contracts/export/csv/"
+    )
+    assert reverse("leads:leads_export", args=["xlsx"]) == "/leads/export/xlsx/"
+
+
+def test_xlsx_stops_at_sheet_limit(monkeypatch) -> None:
+    monkeypatch.setattr("core.exports.XLSX_MAX_ROWS", 3)
+    consumed = []
+
+    content = b"".join(stream_xlsx(HEADER, rows_consumed_lazily(consumed, 10)))
+
+    sheet = zipfile.ZipFile(io.BytesIO(content)).read("xl/worksheets/sheet1.xml")
+    assert sheet.count(b"<row>") == 3
+    assert len(consumed) == 2
+
+
+@pytest.fixture
+def leads(make_lead) -> list[Lead]:
+    return [make_lead(first_name=f"Lead {number}") for number in range(3)]
+
+
+def download(client, file_format: str):
+    return client.get(reverse("leads:leads_export", args=[file_format]))
+
+
+@pytest.mark.django_db
+def test_export_requires_permission(client, django_user_model, leads) -> None:
+    assert download(client, "csv").status_code == 302
+
+    user = django_user_model.objects.create_user("viewer")
+    client.force_login(user)
+    assert download(client, "csv").status_code == 403
+
+    user.user_permissions.add(Permission.objects.get(codename="view_lead"))
+    assert download(client, "csv").status_code == 200
+
+
+@pytest.mark.django_db
+def test_export_is_streamed(admin_client, leads) -> None:
+    response = download(admin_client, "csv")
+
+    assert response.streaming
+    assert response["X-Accel-Buffering"] == "no"
+    assert "leads-" in response["Content-Disposition"]
+    rows = list(csv.reader(io.StringIO(b"".join(response).decode()[1:])))
+    assert rows[0][:3] == ["ID", "Last Name", "First Name"]
+    assert sorted(row[2] for row in rows[1:]) == ["Lead 0", "Lead 1", "Lead 2"]
+
+    response = download(admin_client, "xlsx")
+
+    assert response.streaming
+    assert zipfile.ZipFile(io.BytesIO(b"".join(response))).testzip() is None
+
+
+@pytest.mark.django_db
+def test_xlsx_export_over_sheet_limit_points_to_csv(
+    admin_client, leads, monkeypatch
+) -> None:
+    monkeypatch.setattr("core.exports.XLSX_MAX_ROWS", 3)
+
+    response = download(admin_client, "xlsx")
+
+    assert response.status_code == 400
+    assert "/leads/export/csv/" in response.content.decode()
+    assert download(admin_client, "csv").status_code == 200
@@ -0,0 +1,92 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from core.testing import assert_max_queries
+from customers.views import CustomerListView
+from service_product.views import ProductDetailView
+
+
+def test_list_view_selects_related_rows() -> None:
+    queryset = CustomerListView().get_queryset()
+
+    assert queryset.query.select_related == {"lead": {}}
+
+
+def test_detail_view_defers_columns() -> None:
+    queryset = ProductDetailView().get_queryset()
+
+    assert queryset.query.deferred_loading == ({"search_vector"}, True)
+
+
+def run_fake_query(sql: str) -> None:
+    # Обёртка вызывается до обращения к базе, поэтому соединение не нужно.
+    count_query = connection.execute_wrappers[-1]
+    count_query(lambda *args: None, sql, None, False, {})
+
+
+def test_assert_max_queries_collects_sql() -> None:
+    with assert_max_queries(1) as queries:
+        run_fake_query("SELECT 1")
+
+    assert queries == ["SELECT 1"]
+
+
+def test_assert_max_queries_fails_over_limit() -> None:
+    with pytest.raises(AssertionError, match="2 queries executed, expected at most 1"):
+        with assert_max_queries(1):
+            run_fake_query("SELECT 1")
+            run_fake_query("SELECT 2")
+
+
+@pytest.fixture
+def customers(make_customer) -> list:
+    """Клиенты со своими лидами, контрактами и услугами."""
+    return [make_customer() for _ in range(5)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name, queries",
+    [
+        ("service_product:service_list", 3),
+        ("ads:ads_list", 3),
+        ("leads:leads_list", 3),
+        ("customers:customers_list", 3),
+        ("contracts:contract_list", 3),
+    ],
+)
+def test_list_page_queries(admin_client, customers, url_name, queries) -> None:
+    url = reverse(url_name)
+    admin_client.get(url)  # справочники и роли попадают в кэш
+
+    # Пользователь сессии, количество строк и страница вместе со связями.
+    with assert_max_queries(queries):
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_name, get_pk",
+    [
+        (
+            "service_product:service_detail",
+            lambda customer: customer.contract.product_id,
+        ),
+        ("ads:ads_detail", lambda customer: customer.lead.campaign_id),
+        ("leads:leads_detail", lambda customer: customer.lead_id),
+        ("customers:customers_detail", lambda customer: customer.pk),
+        ("contracts:contract_detail", lambda customer: customer.contract_id),
+    ],
+)
+def test_detail_page_queries(admin_client, customers, url_name, get_pk) -> None:
+    url = reverse(url_name, args=[get_pk(customers[0])])
+    admin_client.get(url)
+
+    # Пользователь сессии и запись вместе со связями.
+    with assert_max_queries(2):
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
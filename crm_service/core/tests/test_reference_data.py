@@ -0,0 +1,96 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save
+
+from ads.forms import AdsCompanyForm
+from ads.models_as_description import PromotionChannel
+from core.reference_data import ReferenceDataCache, reference_data
+
+
+@pytest.fixture
+def loads():
+    calls = []
+    cache = ReferenceDataCache(max_entries=1)
+    cache.register("numbers", lambda: calls.append(1) or [1, 2, 3])
+    cache.register("letters", lambda: calls.append(1) or ["a"])
+    cache.invalidate("numbers")
+    cache.invalidate("letters")
+    return cache, calls
+
+
+def test_dataset_is_loaded_once(loads) -> None:
+    cache, calls = loads
+
+    assert cache.get("numbers") == [1, 2, 3]
+    assert cache.get("numbers") == [1, 2, 3]
+    assert len(calls) == 1
+
+
+def test_evicted_dataset_is_read_from_shared_cache(loads) -> None:
+    cache, calls = loads
+    cache.get("numbers")
+    cache.get("letters")
+
+    assert cache.get("numbers") == [1, 2, 3]
+    assert len(calls) == 2
+
+
+def test_invalidate_reloads_dataset(loads) -> None:
+    cache, calls = loads
+    cache.get("numbers")
+
+    cache.invalidate("numbers")
+
+    assert cache.get("numbers") == [1, 2, 3]
+    assert len(calls) == 2
+
+
+def test_lost_version_does_not_match_cached_dataset(loads) -> None:
+    cache, calls = loads
+    other_process = ReferenceDataCache()
+    other_process.register("numbers", lambda: [1, 2, 3])
+    cache.get("numbers")
+
+    # Версия вытеснена из общего кэша, затем набор изменён в другом процессе.
+    cache.cache.delete(cache.version_key("numbers"))
+    other_process.invalidate("numbers")
+
+    assert cache.get("numbers") == [1, 2, 3]
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def channels():
+    reference_data.invalidate("promotion_channels")
+    channels = [
+        PromotionChannel(pk=1, name="Email"),
+        PromotionChannel(pk=2, name="SEO"),
+    ]
+    version = reference_data.cache.get(reference_data.version_key("promotion_channels"))
+    reference_data.cache.set(
+        reference_data.data_key("promotion_channels", version), channels
+    )
+    yield channels
+    reference_data.invalidate("promotion_channels")
+
+
+def test_channel_choices_are_read_from_cache(channels) -> None:
+    field = AdsCompanyForm().fields["channel"]
+
+    assert [label for __, label in field.choices] == [field.empty_label, "Email", "SEO"]
+    assert field.clean("2") == channels[1]
+    with pytest.raises(ValidationError):
+        field.clean("3")
+
+
+def test_channel_change_invalidates_choices(channels, monkeypatch) -> None:
+    monkeypatch.setattr(
+        "django.db.transaction.on_commit", lambda func, using=None: func()
+    )
+    post_save.send(PromotionChannel, instance=channels[0], created=False)
+
+    version = reference_data.cache.get(reference_data.version_key("promotion_channels"))
+    assert (
+        reference_data.cache.get(reference_data.data_key("promotion_channels", version))
+        is None
+    )
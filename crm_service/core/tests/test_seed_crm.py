@@ -0,0 +1,77 @@
+import io
+
+import pytest
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from ads.models import AdsCompanyDailyStatistic
+from contracts.models import Contract, StoredDocument
+from contracts.storage import get_document_storage
+from core.management.commands.seed_crm import Command
+
+
+def test_phone_numbers_are_unique_and_valid() -> None:
+    from phonenumber_field.phonenumber import PhoneNumber
+
+    numbers = [Command.phone_number(index) for index in range(0, 200_000, 997)]
+
+    assert len(set(numbers)) == len(numbers)
+    assert all(PhoneNumber.from_string(number).is_valid() for number in numbers)
+
+
+def test_copy_requires_postgresql() -> None:
+    if connection.vendor == "postgresql":
+        pytest.skip("COPY is available on PostgreSQL")
+    with pytest.raises(CommandError):
+        call_command("seed_crm", copy=True)
+
+
+VOLUMES = {
+    "categories": 3,
+    "products": 20,
+    "campaigns": 4,
+    "leads": 30,
+    "contracts": 10,
+    "customers": 8,
+}
+SEEDED_MODELS = {
+    "categories": "service_product.Category",
+    "products": "service_product.Product",
+    "campaigns": "ads.AdsCompany",
+    "leads": "leads.Lead",
+    "contracts": "contracts.Contract",
+    "customers": "customers.Customer",
+}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("copy", [False, True], ids=["bulk_create", "copy"])
+def test_seeded_rows_are_counted_and_valid(media_root, copy: bool) -> None:
+    if copy and connection.vendor != "postgresql":
+        pytest.skip("COPY requires PostgreSQL")
+    before = {
+        name: apps.get_model(label).objects.count()
+        for name, label in SEEDED_MODELS.items()
+    }
+
+    call_command("seed_crm", copy=copy, batch_size=7, stdout=io.StringIO(), **VOLUMES)
+
+    for name, label in SEEDED_MODELS.items():
+        model = apps.get_model(label)
+        assert model.objects.count() - before[name] == VOLUMES[name], name
+        for instance in model.objects.all():
+            instance.full_clean()
+    assert AdsCompanyDailyStatistic.objects.exists()
+
+
+@pytest.mark.django_db
+def test_seeded_contracts_reference_a_stored_document(media_root) -> None:
+    call_command("seed_crm", stdout=io.StringIO(), **VOLUMES)
+    call_command("seed_crm", stdout=io.StringIO(), **VOLUMES)
+
+    names = set(Contract.objects.values_list("file_document", flat=True))
+    assert len(names) == 1
+    name = names.pop()
+    assert get_document_storage().open(name).read().startswith(b"%PDF-")
+    assert StoredDocument.objects.get(name=name).references == 2 * VOLUMES["contracts"]
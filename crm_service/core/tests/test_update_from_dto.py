@@ -0,0 +1,178 @@
+import datetime
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ads.dto_ads_company import AdsCompanyUpdateDTO
+from ads.models import AdsCompany
+from ads.services import AdsCompanyService
+from contracts.dto_contracts import ContractUpdateDTO
+from contracts.models import StoredDocument
+from contracts.services import ContractService
+from core.base import BaseService
+from leads.dto_lead import LeadUpdateDTO
+from leads.models import Lead
+from leads.services import LeadService
+from service_product.dto_product import ProductUpdateDTO
+from service_product.models import Product
+from service_product.services import ProductService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def saved():
+    """Записывает (модель, update_fields) каждого сигнала post_save."""
+    calls = []
+
+    def receiver(sender, instance, update_fields, **kwargs):
+        calls.append((sender, update_fields))
+
+    post_save.connect(receiver, weak=False)
+    yield calls
+    post_save.disconnect(receiver)
+
+
+def table_queries(context: CaptureQueriesContext, table: str) -> list[str]:
+    return [
+        query["sql"].split(" ", 1)[0]
+        for query in context.captured_queries
+        if f'"{table}"' in query["sql"]
+    ]
+
+
+def product_dto(product: Product, user, **fields) -> ProductUpdateDTO:
+    return ProductUpdateDTO(
+        **{
+            "id": product.pk,
+            "name": product.name,
+            "description": "Updated description",
+            "cost": product.cost,
+            "discount": product.discount,
+            "status": product.status,
+            "archived": product.archived,
+            "updated_by": user,
+            **fields,
+        }
+    )
+
+
+def test_update_with_instance_is_a_single_update(campaign, admin_user) -> None:
+    product = campaign.product
+
+    with CaptureQueriesContext(connection) as context:
+        ProductService.update_product(product_dto(product, admin_user), product)
+
+    assert table_queries(context, "service_products") == ["UPDATE"]
+    product.refresh_from_db()
+    assert product.description == "Updated description"
+
+
+def test_update_without_instance_loads_the_record(campaign, admin_user) -> None:
+    dto = product_dto(campaign.product, admin_user, cost=2000)
+
+    with CaptureQueriesContext(connection) as context:
+        product = ProductService.update_product(dto)
+
+    assert table_queries(context, "service_products") == ["SELECT", "UPDATE"]
+    assert Product.objects.get(pk=product.pk).cost == 2000
+
+
+def test_auto_now_field_is_updated(campaign, admin_user, saved) -> None:
+    product = campaign.product
+    Product.objects.filter(pk=product.pk).update(
+        updated_at=timezone.now() - datetime.timedelta(days=1)
+    )
+    product.refresh_from_db()
+    before = product.updated_at
+
+    BaseService._update_from_dto(Product, product_dto(product, admin_user), product)
+
+    assert Product.objects.get(pk=product.pk).updated_at > before
+    assert "updated_at" in saved[-1][1]
+    assert "description" in saved[-1][1]
+
+
+def test_lead_update_sends_post_save_for_rollup(
+    campaign, admin_user, make_lead, saved, django_capture_on_commit_callbacks
+) -> None:
+    other = AdsCompany.objects.create(
+        name="Other",
+        product=campaign.product,
+        channel=campaign.channel,
+        budget=100,
+        email="other@example.com",
+        created_by=admin_user,
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        lead = make_lead()
+    dto = LeadUpdateDTO(
+        id=lead.pk,
+        first_name="Anna",
+        last_name=lead.last_name,
+        email=lead.email,
+        phone_number=str(lead.phone_number),
+        campaign=other,
+        updated_by=admin_user,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        LeadService.update_lead(dto, instance=lead)
+
+    lead_saves = [update_fields for sender, update_fields in saved if sender is Lead]
+    assert {"first_name", "campaign", "updated_at"} <= lead_saves[-1]
+    rollup = AdsCompany.objects.with_rollup_statistics()
+    assert rollup.get(pk=campaign.pk).stat_leads_count == 0
+    assert rollup.get(pk=other.pk).stat_leads_count == 1
+
+
+def test_company_update_keeps_unchanged_fields(
+    settings, tmp_path, campaign, admin_user
+) -> None:
+    settings.WEBSITE_CHECK_MODE = "deferred"
+    settings.BAD_WORDS_FILE = tmp_path / "bad_words.txt"
+    settings.BAD_WORDS_FILE.write_text("casino\n")
+    dto = AdsCompanyUpdateDTO(
+        id=campaign.pk,
+        name="Renamed campaign",
+        product=campaign.product,
+        channel=campaign.channel,
+        budget=campaign.budget,
+        country="Russia",
+        email=campaign.email,
+        website="https://example.com",
+        updated_by=admin_user,
+    )
+
+    AdsCompanyService.update_company(dto, instance=campaign)
+
+    company = AdsCompany.objects.get(pk=campaign.pk)
+    assert company.name == "Renamed campaign"
+    assert company.website_available is None
+    assert company.created_by == admin_user
+
+
+def test_contract_file_replacement_moves_reference(make_contract, admin_user) -> None:
+    contract = make_contract(b"%PDF-1.7\nfirst")
+    previous = contract.file_document.name
+    today = timezone.localdate()
+    dto = ContractUpdateDTO(
+        id=contract.pk,
+        name=contract.name,
+        product=contract.product,
+        file_document=SimpleUploadedFile("contract.pdf", b"%PDF-1.7\nsecond"),
+        start_date=today + datetime.timedelta(days=1),
+        end_date=today + datetime.timedelta(days=30),
+        cost=contract.cost,
+        updated_by=admin_user,
+    )
+
+    contract = ContractService.update_contract(dto, instance=contract)
+
+    assert contract.file_document.name != previous
+    assert StoredDocument.objects.get(name=previous).references == 0
+    assert StoredDocument.objects.get(name=contract.file_document.name).references == 1
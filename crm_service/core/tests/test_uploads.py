@@ -0,0 +1,54 @@
+import hashlib
+
+import pytest
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import StopFutureHandlers
+from django.test import override_settings
+
+from core.uploads import (
+    HEAD_SIZE,
+    HashingMemoryFileUploadHandler,
+    HashingTemporaryFileUploadHandler,
+)
+
+CONTENT = b"%PDF-1.7\n" + bytes(range(256)) * 40
+
+
+def stream(handler, chunk_size: int = 1000):
+    handler.new_file("file", "doc.pdf", "application/pdf", len(CONTENT))
+    for start in range(0, len(CONTENT), chunk_size):
+        handler.receive_data_chunk(CONTENT[start : start + chunk_size], start)
+    return handler.file_complete(len(CONTENT))
+
+
+def test_temporary_upload_is_hashed_while_written() -> None:
+    upload = stream(HashingTemporaryFileUploadHandler())
+
+    assert isinstance(upload, TemporaryUploadedFile)
+    assert upload.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert upload.head == CONTENT[:HEAD_SIZE]
+    assert upload.read() == CONTENT
+    upload.close()
+
+
+@override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=len(CONTENT))
+def test_memory_upload_is_hashed() -> None:
+    handler = HashingMemoryFileUploadHandler()
+    handler.handle_raw_input(None, {}, len(CONTENT), b"")
+
+    with pytest.raises(StopFutureHandlers):
+        handler.new_file("file", "doc.pdf", "application/pdf", len(CONTENT))
+    for start in range(0, len(CONTENT), 1000):
+        handler.receive_data_chunk(CONTENT[start : start + 1000], start)
+    upload = handler.file_complete(len(CONTENT))
+
+    assert upload.sha256 == hashlib.sha256(CONTENT).hexdigest()
+    assert upload.head == CONTENT[:HEAD_SIZE]
+
+
+@override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=10)
+def test_inactive_memory_handler_passes_data_through() -> None:
+    handler = HashingMemoryFileUploadHandler()
+    handler.handle_raw_input(None, {}, len(CONTENT), b"")
+
+    assert stream(handler) is None
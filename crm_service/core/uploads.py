@@ -0,0 +1,57 @@
+"""
+Обработчики загрузки файлов, которые считают SHA-256 содержимого и запоминают
+его первые байты, пока Django порциями пишет загрузку в память или во
+временный файл. Результат доступен у загруженного файла:
+
+    upload.sha256  - шестнадцатеричный SHA-256 всего файла;
+    upload.head    - первые HEAD_SIZE байт (для проверки сигнатуры формата).
+
+Так хранилище документов (contracts.storage) и проверка формата
+не перечитывают файл. Подключаются настройкой FILE_UPLOAD_HANDLERS
+вместо стандартных обработчиков.
+"""
+
+import hashlib
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+# Сколько первых байт файла запоминать.
+HEAD_SIZE = 512
+
+
+class HashingUploadMixin:
+    """Считает SHA-256 и сохраняет первые байты файла, который принимает обработчик."""
+
+    def new_file(self, *args, **kwargs) -> None:
+        # MemoryFileUploadHandler.new_file прерывает цепочку исключением,
+        # поэтому состояние готовится до вызова родителя.
+        self._sha256 = hashlib.sha256()
+        self._head = b""
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data: bytes, start: int):
+        # Неактивный обработчик в памяти передаёт данные дальше, не сохраняя их.
+        if getattr(self, "activated", True):
+            self._sha256.update(raw_data)
+            if len(self._head) < HEAD_SIZE:
+                self._head += raw_data[: HEAD_SIZE - len(self._head)]
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size: int) -> UploadedFile | None:
+        upload = super().file_complete(file_size)
+        if upload is not None:
+            upload.sha256 = self._sha256.hexdigest()
+            upload.head = self._head
+        return upload
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    """Небольшие загрузки в памяти (до FILE_UPLOAD_MAX_MEMORY_SIZE)."""
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    """Большие загрузки во временном файле на диске."""
@@ -43,13 +43,16 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Мои приложения
+    "core.apps.CoreConfig",
     "accounts.apps.AccountsConfig",
     "service_product.apps.ServiceProductConfig",
     "ads.apps.AdsConfig",
     "customers.apps.CustomersConfig",
     "leads.apps.LeadsConfig",
     "contracts.apps.ContractsConfig",
+    "task_queue.apps.TaskQueueConfig",
     # сторонние библиотеки
     "phonenumber_field",
     "debug_toolbar",
@@ -146,6 +149,16 @@ STATICFILES_DIRS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "uploads"
 
+# Обработчики загрузки дополнительно считают SHA-256 и сохраняют первые байты
+# файла (core.uploads) для хранилища документов с адресацией по содержимому.
+FILE_UPLOAD_HANDLERS = [
+    "core.uploads.HashingMemoryFileUploadHandler",
+    "core.uploads.HashingTemporaryFileUploadHandler",
+]
+# Внутренний location nginx, из которого он отдаёт MEDIA_ROOT по X-Accel-Redirect
+# (core.downloads). Без него файлы отдаёт само приложение.
+PROTECTED_MEDIA_ACCEL_PREFIX = os.environ.get("PROTECTED_MEDIA_ACCEL_PREFIX")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -155,15 +168,117 @@ LOGIN_REDIRECT_URL = reverse_lazy("home")
 LOGIN_URL = reverse_lazy("accounts:login")
 
 
+# Кэши:
+#   default  - кэш часто читаемых данных: L1 в памяти процесса (core.cache.LayeredCache)
+#              перед общим кэшем shared;
+#   shared   - общий для всех процессов кэш (L2), большие значения сжимаются;
+#   counters - счётчики и лимиты: только общий кэш, без L1, чтобы incr был атомарным;
+#   sessions - сессии пользователей.
+# Без REDIS_URL (разработка, тесты) вместо Redis используется LocMemCache.
+# CACHE_VERSION меняется, когда формат закэшированных значений несовместим с прежним.
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "crm")
+CACHE_VERSION = int(os.environ.get("CACHE_VERSION", 1))
+
+
+def shared_cache(namespace: str, **options) -> dict:
+    """Настройки общего кэша с отдельным пространством ключей."""
+    if REDIS_URL is None:
+        return {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": namespace,
+            "KEY_PREFIX": f"{CACHE_KEY_PREFIX}:{namespace}",
+            "VERSION": CACHE_VERSION,
+        }
+    return {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": f"{CACHE_KEY_PREFIX}:{namespace}",
+        "VERSION": CACHE_VERSION,
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient", **options},
+    }
+
+
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
-    }
+        "BACKEND": "core.cache.LayeredCache",
+        "OPTIONS": {"L2": "shared", "L1_TIMEOUT": 5, "L1_MAX_ENTRIES": 1000},
+    },
+    "shared": shared_cache(
+        "shared",
+        COMPRESSOR="django_redis.compressors.zlib.ZlibCompressor",
+        # Недоступность Redis не должна ломать страницы: промах вместо ошибки.
+        IGNORE_EXCEPTIONS=True,
+    ),
+    # Счётчики на главной странице тоже не должны падать вместе с Redis:
+    # при ошибке get_counts считает записи в базе, а adjust ничего не делает.
+    "counters": shared_cache("counters", IGNORE_EXCEPTIONS=True),
+    "sessions": shared_cache("sessions"),
 }
 
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+
 BAD_WORDS_FILE = BASE_DIR / "bad_words.txt"
 
+# Проверка доступности сайтов рекламных компаний (ads.website_checker)
+# "sync" - при сохранении формы, "deferred" - в фоне после сохранения компании
+WEBSITE_CHECK_MODE = os.environ.get("WEBSITE_CHECK_MODE", "sync")
+WEBSITE_CHECK_TIMEOUT = (2, 3)  # (соединение, чтение) в секундах
+WEBSITE_CHECK_SUCCESS_TTL = 60 * 60
+WEBSITE_CHECK_FAILURE_TTL = 60 * 5
+WEBSITE_CHECK_WORKERS = 4
+
+# Счётчики записей на главной странице (core.counters.ModelCounterService)
+COUNTERS_CACHE_TIMEOUT = 60 * 10
+# Начиная с этого количества строк вместо COUNT(*) используется оценка reltuples.
+# None - всегда считать точно.
+COUNTERS_ESTIMATE_THRESHOLD = 1_000_000
+
+# Кэш названий групп (ролей) пользователя (core.check_user_service.UserRoleService).
+# Сбрасывается сигналами при изменении групп пользователя.
+USER_ROLES_CACHE_TIMEOUT = 60 * 60
+
+# Справочники (core.reference_data): сбрасываются сигналами при изменении записей,
+# срок хранения ограничивает расхождение после изменений в обход ORM.
+REFERENCE_DATA_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Фоновые задачи (task_queue). Брокер по умолчанию хранит очередь в базе данных;
+# воркер запускается командой run_task_worker.
+TASK_QUEUE_BROKER = os.environ.get(
+    "TASK_QUEUE_BROKER", "task_queue.brokers.DatabaseBroker"
+)
+# Через сколько секунд задача упавшего воркера снова станет доступной.
+TASK_QUEUE_LEASE = 60 * 5
+# Задержка перед первым повтором, дальше удваивается.
+TASK_QUEUE_RETRY_DELAY = 30
+# Сколько хранить выполненные задачи (и их ключи дедупликации).
+TASK_QUEUE_RETENTION = 60 * 60 * 24 * 7
+# Периодические задачи: {имя задачи: период в секундах}.
+TASK_QUEUE_SCHEDULE = {
+    "contracts.send_expiry_reminders": 60 * 60,
+    "task_queue.purge_finished": 60 * 60 * 24,
+    "contracts.purge_unreferenced_documents": 60 * 60 * 24,
+}
+
+# Почта
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS") == "1"
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "crm@localhost")
+
+# Уведомления по контрактам (contracts.tasks): за сколько дней до окончания
+# напоминать и сколько писем отправлять за одну порцию.
+CONTRACT_EXPIRY_REMINDER_DAYS = 7
+CONTRACT_EMAIL_BATCH_SIZE = 100
+# Сколько секунд хранить файл документа, на который не осталось ссылок.
+CONTRACT_DOCUMENTS_GRACE_PERIOD = 60 * 60 * 24
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
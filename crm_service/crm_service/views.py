@@ -1,23 +1,30 @@
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
-from ads.models import AdsCompany
-from customers.models import Customer
-from leads.models import Lead
-from service_product.models import Product
+from contracts.models import Contract
+from core.counters import ModelCounterService
+
+# Сколько контрактов показывать в блоке "Заканчиваются контракты".
+EXPIRING_CONTRACTS_LIMIT = 10
 
 
 def general_statistics(request: HttpRequest) -> HttpResponse:
-    """Представление для главной страницы, с информацией об общей статистикой."""
+    """
+    Представление для главной страницы, с информацией об общей статистикой.
+    Количество записей берётся из кэшированных счётчиков, без обращения к таблицам.
+    Пользователям с доступом к контрактам показываются контракты, срок которых
+    скоро заканчивается (один запрос по индексу (end_date, id)).
+    """
     home_page = "crm_service/index.html"
-    products_count = Product.objects.all().count()
-    advertisements_count = AdsCompany.objects.all().count()
-    leads_count = Lead.objects.all().count()
-    customers_count = Customer.objects.all().count()
+    counts = ModelCounterService.get_counts()
     context = {
-        "products_count": products_count,
-        "advertisements_count": advertisements_count,
-        "leads_count": leads_count,
-        "customers_count": customers_count,
+        "products_count": counts["service_product.product"],
+        "advertisements_count": counts["ads.adscompany"],
+        "leads_count": counts["leads.lead"],
+        "customers_count": counts["customers.customer"],
     }
+    if request.user.has_perm("contracts.view_contract"):
+        context["expiring_contracts"] = Contract.objects.expiring().with_customers()[
+            :EXPIRING_CONTRACTS_LIMIT
+        ]
     return render(request=request, template_name=home_page, context=context)
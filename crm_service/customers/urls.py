@@ -2,6 +2,7 @@ from django.urls import path
 
 from .views import (
     CustomerListView,
+    CustomerExportView,
     CustomerCreateView,
     CustomerDetailView,
     CustomerDeleteView,
@@ -12,6 +13,11 @@ app_name = "customers"
 
 urlpatterns = [
     path("", CustomerListView.as_view(), name="customers_list"),
+    path(
+        "export/<str:file_format>/",
+        CustomerExportView.as_view(),
+        name="customers_export",
+    ),
     path("new/", CustomerCreateView.as_view(), name="customers_create"),
     path("<int:pk>/", CustomerDetailView.as_view(), name="customers_detail"),
     path("<int:pk>/edit/", CustomerUpdateView.as_view(), name="customers_edit"),
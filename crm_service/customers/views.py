@@ -1,8 +1,8 @@
 from django.contrib.auth.mixins import PermissionRequiredMixin, LoginRequiredMixin
-from django.contrib.auth.models import User
 from django.http import HttpResponse, HttpResponseRedirect, HttpRequest
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
 from django.views.generic import (
     ListView,
     DetailView,
@@ -11,22 +11,52 @@ from django.views.generic import (
 )
 from django.db import transaction
 
-from core.base import MyDeleteView
+from core.base import MyDeleteView, QuerySetShapingMixin
+from core.exports import ExportColumn, ExportView
 from leads.models import Lead
 from .models import Customer
 from .forms import CustomerForm
 
 
-class CustomerListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class CustomerListView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    ListView,
+):
     """Представление списка всех активных клиентов."""
 
     permission_required: str = "customers.view_customer"
     model: Customer = Customer
     context_object_name: str = "customers"
+    select_related_fields: tuple[str, ...] = ("lead",)
     paginate_by: int = 10
     ordering: tuple[str,] = ("contract__cost",)
 
 
+class CustomerExportView(ExportView):
+    """Потоковая выгрузка клиентов с данными лида и контракта в CSV или XLSX."""
+
+    permission_required: str = "customers.view_customer"
+    model: Customer = Customer
+    filename: str = "customers"
+    columns: tuple[ExportColumn, ...] = (
+        "id",
+        "lead__last_name",
+        "lead__first_name",
+        "lead__middle_name",
+        "lead__email",
+        "lead__phone_number",
+        ("lead__campaign__name", _("Campaign")),
+        "contract__name",
+        "contract__cost",
+        "contract__start_date",
+        "contract__end_date",
+        "archived",
+        "created_at",
+    )
+
+
 class CustomerCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     """Представления для перевода лида в активного клиента."""
 
@@ -46,7 +76,7 @@ class CustomerCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView
     @transaction.atomic
     def form_valid(self, form: CustomerForm) -> HttpResponse:
         """Добавляет информацию о пользователе, который перевёл лида в активного клиента."""
-        form.instance.created_by = User.objects.get(pk=self.request.user.pk)
+        form.instance.created_by = self.request.user
         return super().form_valid(form)
 
     def get_success_url(self) -> HttpResponseRedirect:
@@ -54,12 +84,18 @@ class CustomerCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView
         return reverse_lazy("customers:customers_detail", kwargs={"pk": self.object.pk})
 
 
-class CustomerDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class CustomerDetailView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    DetailView,
+):
     """Представление для детального просмотра клиента."""
 
     permission_required: str = "customers.view_customer"
     model: Customer = Customer
     context_object_name: str = "customer"
+    select_related_fields: tuple[str, ...] = ("lead",)
 
 
 class CustomerUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
@@ -76,7 +112,7 @@ class CustomerUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView
         """Добавляет информацию о пользователе, обновившего данные активного клиента."""
         response = super().form_valid(form)
 
-        form.instance.updated_by = User.objects.get(pk=self.request.user.pk)
+        form.instance.updated_by = self.request.user
         return response
 
     def get_success_url(self) -> HttpResponseRedirect:
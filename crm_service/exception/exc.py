@@ -1,6 +1,22 @@
+from typing import TYPE_CHECKING
+
 from django.core.exceptions import ValidationError
 
+if TYPE_CHECKING:
+    from leads.dto_lead import LeadImportReport
+
 
 class ForbiddenWordException(ValidationError):
     def __init__(self, field_name: str):
         super().__init__(f"{field_name.capitalize()} contains forbidden words.")
+
+
+class LeadImportInterrupted(ValidationError):
+    """
+    Файл перестал читаться посреди импорта лидов.
+    report содержит лидов, уже созданных до ошибки.
+    """
+
+    def __init__(self, error: ValidationError, report: "LeadImportReport"):
+        super().__init__(error.messages)
+        self.report = report
@@ -1,7 +1,8 @@
 from typing import Optional, TYPE_CHECKING
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 
 from core.base import BaseDTO
 
@@ -72,3 +73,37 @@ class LeadUpdateDTO(BaseLeadDTO):
         if self.middle_name is None:
             data["middle_name"] = None
         return data
+
+
+@dataclass
+class LeadImportError:
+    """
+    Ошибка импорта одной строки файла с лидами.
+
+    Attributes:
+        row (int): Номер строки в файле (заголовок - строка 1).
+        message (str): Описание ошибки.
+    """
+
+    row: int
+    message: str
+
+
+@dataclass
+class LeadImportReport:
+    """
+    Итог массового импорта лидов.
+
+    Attributes:
+        created (int): Количество созданных лидов.
+        errors (list[LeadImportError]): Строки, которые не были импортированы.
+    """
+
+    created: int = 0
+    errors: list[LeadImportError] = field(default_factory=list)
+
+    def add_error(self, row: int, error: ValidationError | str) -> None:
+        """Добавляет ошибку строки в отчёт."""
+        if isinstance(error, ValidationError):
+            error = "; ".join(str(message) for message in error.messages)
+        self.errors.append(LeadImportError(row=row, message=str(error)))
@@ -0,0 +1,93 @@
+import csv
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from exception.exc import LeadImportInterrupted
+from leads.readers import SUPPORTED_FORMATS, detect_format, read_lead_rows
+from leads.services import LeadService
+
+
+class Command(BaseCommand):
+    """
+    Команды:
+        ./manage.py import_leads leads.csv --user operator
+
+        python manage.py import_leads leads.xlsx --user operator --chunk-size 5000 --errors errors.csv
+
+    Массово импортирует лидов из CSV или XLSX файла от имени пользователя --user.
+    Файл читается потоково, порциями по --chunk-size строк, поэтому может
+    содержать миллионы строк. Строки с ошибками пропускаются, а отчёт
+    по ним (номер строки и причина) сохраняется в файл --errors.
+    Для XLSX требуется пакет openpyxl: он входит в requirements.txt,
+    а при установке через poetry - в extra xlsx (poetry install --extras xlsx).
+    """
+
+    help = "Import leads from a CSV or XLSX file."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", type=Path, help="Path to the CSV or XLSX file.")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username of the operator the leads are created by.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=SUPPORTED_FORMATS,
+            help="File format. Detected by the file extension by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="How many rows to validate and insert at once.",
+        )
+        parser.add_argument(
+            "--errors",
+            type=Path,
+            help="Path to a CSV file for the per-row error report.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(username=options["user"])
+        except user_model.DoesNotExist as error:
+            raise CommandError(f"User {options['user']!r} does not exist.") from error
+
+        path: Path = options["path"]
+        try:
+            file_format = options["format"] or detect_format(path.name)
+            with open(path, mode="rb") as file:
+                report = LeadService.import_leads(
+                    read_lead_rows(file, file_format),
+                    created_by=user,
+                    chunk_size=options["chunk_size"],
+                )
+        except LeadImportInterrupted as error:
+            raise CommandError(
+                f"{'; '.join(error.messages)} "
+                f"Imported {error.report.created} leads before the error."
+            ) from error
+        except (OSError, ValidationError, ValueError) as error:
+            raise CommandError(str(error)) from error
+
+        if options["errors"]:
+            with open(
+                options["errors"], mode="w", encoding="utf-8", newline=""
+            ) as file:
+                writer = csv.writer(file)
+                writer.writerow(("row", "message"))
+                writer.writerows((error.row, error.message) for error in report.errors)
+        else:
+            for error in report.errors:
+                self.stderr.write(f"Row {error.row}: {error.message}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.created} leads, skipped {len(report.errors)} rows."
+            )
+        )
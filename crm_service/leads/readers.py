@@ -0,0 +1,115 @@
+"""
+Потоковое чтение файлов с лидами для массового импорта.
+
+Файл читается построчно и никогда не загружается в память целиком.
+Первая строка файла - заголовок с названиями колонок:
+first_name, middle_name, last_name, email, phone_number, campaign (id компании).
+"""
+
+import csv
+import io
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.utils.translation import gettext_lazy as _
+
+# (номер строки в файле, значения колонок)
+LeadRow = tuple[int, dict[str, str]]
+
+SUPPORTED_FORMATS = ("csv", "xlsx")
+
+# Ошибки openpyxl на повреждённом файле: он не проверяет структуру архива
+# и сообщает о ней ошибками zipfile, KeyError (нет части книги), ValueError
+# и ошибками разбора XML (подклассы SyntaxError в ElementTree и lxml).
+XLSX_ERRORS = (zipfile.BadZipFile, KeyError, ValueError, OSError, SyntaxError)
+
+
+def detect_format(file_name: str) -> str:
+    """Определяет формат файла по расширению."""
+    file_format = Path(file_name).suffix.lower().lstrip(".")
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValidationError(
+            _("Unsupported file format: {}. Use CSV or XLSX.").format(file_format)
+        )
+    return file_format
+
+
+def read_lead_rows(file: BinaryIO, file_format: str) -> Iterator[LeadRow]:
+    """Возвращает строки файла по одной в виде (номер строки, {колонка: значение})."""
+    if file_format == "csv":
+        return _read_csv(file)
+    if file_format == "xlsx":
+        return _read_xlsx(file)
+    raise ValidationError(
+        _("Unsupported file format: {}. Use CSV or XLSX.").format(file_format)
+    )
+
+
+def _normalize(key: object, value: object) -> tuple[str, str]:
+    """Приводит название колонки и значение ячейки к строкам без пробелов по краям."""
+    key = str(key).strip().lower()
+    if value is None:
+        return key, ""
+    if isinstance(value, float) and value.is_integer():
+        # Excel хранит числа (например, id компании) как float.
+        value = int(value)
+    return key, str(value).strip()
+
+
+def _unreadable(file_format: str, error: Exception) -> ValidationError:
+    """Ошибка чтения файла, которую можно показать пользователю."""
+    return ValidationError(
+        _("The {} file could not be read: {}").format(file_format.upper(), error)
+    )
+
+
+def _read_csv(file: BinaryIO) -> Iterator[LeadRow]:
+    """Читает CSV-файл в UTF-8 (в том числе с BOM, как его сохраняет Excel)."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, dict(
+                _normalize(key, value) for key, value in row.items() if key
+            )
+    except (UnicodeDecodeError, csv.Error) as error:
+        raise _unreadable("csv", error) from error
+    finally:
+        # Не закрываем исходный файл вместе с обёрткой.
+        text.detach()
+
+
+def _read_xlsx(file: BinaryIO) -> Iterator[LeadRow]:
+    """Читает первый лист XLSX-файла в режиме read_only (без загрузки в память)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as error:
+        raise ImproperlyConfigured(
+            "XLSX import requires the 'openpyxl' package: "
+            "pip install openpyxl or poetry install --extras xlsx"
+        ) from error
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except XLSX_ERRORS as error:
+        raise _unreadable("xlsx", error) from error
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = list(header)
+        for row_number, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield row_number, dict(
+                _normalize(column, value)
+                for column, value in zip(columns, values)
+                if column is not None
+            )
+    except XLSX_ERRORS as error:
+        raise _unreadable("xlsx", error) from error
+    finally:
+        workbook.close()
@@ -1,15 +1,24 @@
-from typing import TYPE_CHECKING
+from itertools import batched
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.utils.text import capfirst
 from django.utils.translation import gettext_lazy as _
-from django.db import transaction
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Q
+from phonenumber_field.phonenumber import to_python
 
+from ads.models import AdsCompany
+from ads.services import AdsCompanyStatisticService
 from core.check_user_service import UserRoleService
-from .dto_lead import LeadCreateDTO, LeadUpdateDTO
+from core.counters import ModelCounterService
+from exception.exc import LeadImportInterrupted
+from .dto_lead import LeadCreateDTO, LeadImportReport, LeadUpdateDTO
 from .models import Lead
+from .readers import LeadRow
 
 if TYPE_CHECKING:
-    from ads.models import AdsCompany
     from django.contrib.auth.models import User
 
 
@@ -33,18 +42,167 @@ class LeadService(UserRoleService):
         return lead
 
     @classmethod
-    def update_lead(cls, dto: LeadUpdateDTO) -> Lead:
-        """Обновление лида."""
+    def update_lead(cls, dto: LeadUpdateDTO, instance: Optional[Lead] = None) -> Lead:
+        """Обновление лида. instance - уже загруженный лид, если есть."""
         cls._validate_lead_data(dto)
         cls._check_permissions_user(user=dto.updated_by)
 
         with transaction.atomic():
-            Lead.objects.filter(id=dto.id).update(**dto.to_dict())
-            lead = Lead.objects.get(id=dto.id)
-            lead.save()
+            lead = cls._update_from_dto(Lead, dto, instance)
 
         return lead
 
+    @classmethod
+    def import_leads(
+        cls, rows: Iterable[LeadRow], created_by: "User", chunk_size: int = 1000
+    ) -> LeadImportReport:
+        """
+        Массовый импорт лидов из потока строк файла (см. leads.readers).
+
+        Строки обрабатываются порциями по chunk_size: каждая строка проверяется
+        теми же валидаторами, что и при создании лида, уникальность email и
+        телефона проверяется одним IN-запросом на порцию, а корректные лиды
+        вставляются одним bulk_create в отдельной транзакции.
+        Так как bulk_create не отправляет сигналы, статистика рекламных
+        компаний и счётчик лидов обновляются после каждой вставленной порции.
+
+        Returns:
+            LeadImportReport: количество созданных лидов и ошибки по строкам.
+        Raises:
+            LeadImportInterrupted: если файл перестал читаться посреди импорта;
+                уже вставленные порции остаются в базе и указаны в его отчёте.
+        """
+        cls._check_permissions_user(user=created_by)
+        report = LeadImportReport()
+
+        try:
+            for chunk in batched(rows, chunk_size):
+                leads = cls._import_chunk(chunk, created_by, report)
+                AdsCompanyStatisticService.refresh_buckets_on_commit(
+                    (
+                        lead.campaign_id,
+                        AdsCompanyStatisticService.bucket_day(lead.created_at),
+                    )
+                    for lead in leads
+                )
+                ModelCounterService.adjust_on_commit(Lead, len(leads))
+                report.created += len(leads)
+        except ValidationError as error:
+            raise LeadImportInterrupted(error, report) from error
+        return report
+
+    @classmethod
+    def _import_chunk(
+        cls, chunk: tuple[LeadRow, ...], created_by: "User", report: LeadImportReport
+    ) -> list[Lead]:
+        """Проверяет и вставляет порцию строк, возвращает созданных лидов."""
+        candidates: dict[int, Lead] = {}
+        for row_number, row in chunk:
+            try:
+                candidates[row_number] = cls._lead_from_row(row, created_by)
+            except ValidationError as error:
+                report.add_error(row_number, error)
+
+        campaign_ids = set(
+            AdsCompany.objects.filter(
+                pk__in={lead.campaign_id for lead in candidates.values()}
+            ).values_list("pk", flat=True)
+        )
+        taken = Lead.objects.filter(
+            Q(email__in=[lead.email for lead in candidates.values()])
+            | Q(phone_number__in=[lead.phone_number for lead in candidates.values()])
+        ).values_list("email", "phone_number")
+        taken_emails = {email for email, _phone in taken}
+        taken_phones = {phone.as_e164 for _email, phone in taken if phone}
+
+        accepted: dict[int, Lead] = {}
+        for row_number, lead in candidates.items():
+            phone = lead.phone_number.as_e164
+            if lead.campaign_id not in campaign_ids:
+                report.add_error(row_number, _("Advertising campaign not found."))
+            elif lead.email in taken_emails:
+                report.add_error(
+                    row_number, _("A lead with this email already exists.")
+                )
+            elif phone in taken_phones:
+                report.add_error(
+                    row_number, _("A lead with this phone number already exists.")
+                )
+            else:
+                taken_emails.add(lead.email)
+                taken_phones.add(phone)
+                accepted[row_number] = lead
+
+        try:
+            with transaction.atomic():
+                return Lead.objects.bulk_create(accepted.values())
+        except IntegrityError:
+            # Лид с таким же email или телефоном был создан параллельно.
+            for row_number in accepted:
+                report.add_error(
+                    row_number,
+                    _("The chunk conflicts with concurrently created leads."),
+                )
+            return []
+        except DataError:
+            # Строки проверены валидаторами полей, сюда попадают только значения,
+            # которые не пропустила база данных. Остальные порции импортируются.
+            for row_number in accepted:
+                report.add_error(
+                    row_number, _("The chunk contains values rejected by the database.")
+                )
+            return []
+
+    @classmethod
+    def _lead_from_row(cls, row: dict[str, str], created_by: "User") -> Lead:
+        """Проверяет строку файла и создаёт по ней несохранённого лида."""
+        first_name = cls.validate_name(row.get("first_name", ""), "First Name")
+        last_name = cls.validate_name(row.get("last_name", ""), "Last Name")
+        middle_name = row.get("middle_name", "")
+        if middle_name:
+            cls.validate_name(middle_name, "Middle Name")
+
+        email = cls.validate_email(row.get("email", ""))
+        validate_email(email)
+
+        phone_number = to_python(cls.validate_phone_number(row.get("phone_number", "")))
+        if not phone_number or not phone_number.is_valid():
+            raise ValidationError(_("Enter a valid phone number."))
+
+        campaign_id = cls.validate_campaign(row.get("campaign", ""))
+        if not campaign_id.isdigit():
+            raise ValidationError(_("Campaign must be an advertising campaign id."))
+
+        lead = Lead(
+            first_name=first_name,
+            middle_name=middle_name,
+            last_name=last_name,
+            email=email,
+            phone_number=phone_number,
+            campaign_id=int(campaign_id),
+            created_by=created_by,
+        )
+        cls._validate_fields(lead)
+        return lead
+
+    @classmethod
+    def _validate_fields(cls, lead: Lead) -> None:
+        """
+        Проверяет лида валидаторами полей модели (длина, формат email и т.д.),
+        чтобы bulk_create не упал на значении, которое не примет база данных.
+        Связи и уникальность проверяются для всей порции в _import_chunk.
+        """
+        try:
+            lead.clean_fields(exclude=["campaign", "created_by", "updated_by"])
+        except ValidationError as error:
+            raise ValidationError(
+                [
+                    f"{capfirst(Lead._meta.get_field(name).verbose_name)}: {message}"
+                    for name, messages in error.message_dict.items()
+                    for message in messages
+                ]
+            ) from error
+
     @classmethod
     def _check_permissions_user(cls, user: "User") -> None:
         """Проверка перед созданием лида."""
@@ -0,0 +1,76 @@
+import pytest
+from django.core.exceptions import ValidationError
+
+from ads.models import AdsCompany
+from core.counters import ModelCounterService
+from exception.exc import LeadImportInterrupted
+from leads.models import Lead
+from leads.services import LeadService
+
+
+def row(number: int, campaign_id: int, **fields) -> tuple[int, dict[str, str]]:
+    return number, {
+        "first_name": "Ivan",
+        "last_name": "Petrov",
+        "email": f"import{number}@example.com",
+        "phone_number": f"+7917{number:07d}",
+        "campaign": str(campaign_id),
+        **fields,
+    }
+
+
+@pytest.mark.django_db
+def test_overlong_values_are_reported_per_row(campaign, admin_user) -> None:
+    rows = [
+        row(2, campaign.pk),
+        row(3, campaign.pk, last_name="P" * 101),
+        row(4, campaign.pk, email=f"{'e' * 250}@example.com"),
+        row(5, campaign.pk),
+    ]
+
+    report = LeadService.import_leads(rows, created_by=admin_user, chunk_size=2)
+
+    assert report.created == 2
+    assert [error.row for error in report.errors] == [3, 4]
+    assert report.errors[0].message.startswith("Last Name: ")
+    assert set(Lead.objects.values_list("email", flat=True)) == {
+        "import2@example.com",
+        "import5@example.com",
+    }
+
+
+@pytest.mark.django_db
+def test_duplicates_and_unknown_campaigns_are_skipped(make_lead, admin_user) -> None:
+    existing = make_lead()
+    rows = [
+        row(2, existing.campaign_id, email=existing.email),
+        row(3, existing.campaign_id + 1000),
+        row(4, existing.campaign_id),
+        row(5, existing.campaign_id, email="import4@example.com"),
+    ]
+
+    report = LeadService.import_leads(rows, created_by=admin_user)
+
+    assert report.created == 1
+    assert [error.row for error in report.errors] == [2, 3, 5]
+
+
+@pytest.mark.django_db
+def test_unreadable_rest_of_file_keeps_imported_chunks_counted(
+    campaign, admin_user, django_capture_on_commit_callbacks
+) -> None:
+    def rows():
+        for number in range(2, 7):
+            yield row(number, campaign.pk)
+        raise ValidationError("The CSV file could not be read")
+
+    assert ModelCounterService.get_counts()["leads.lead"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(LeadImportInterrupted) as interrupted:
+            LeadService.import_leads(rows(), created_by=admin_user, chunk_size=2)
+
+    assert interrupted.value.report.created == Lead.objects.count() == 4
+    assert ModelCounterService.get_counts()["leads.lead"] == 4
+    statistic = AdsCompany.objects.with_rollup_statistics().get(pk=campaign.pk)
+    assert statistic.stat_leads_count == 4
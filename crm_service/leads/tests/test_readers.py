@@ -0,0 +1,87 @@
+import io
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from leads.readers import detect_format, read_lead_rows
+
+
+def test_csv_rows_are_streamed_with_line_numbers() -> None:
+    content = (
+        "\ufefffirst_name, Last_Name ,email,phone_number,campaign\n"
+        "Ivan,Petrov,ivan@example.com,+79990000000,1\n"
+        "Anna, Ivanova ,anna@example.com,+79990000001,2\n"
+    ).encode("utf-8")
+
+    rows = list(read_lead_rows(io.BytesIO(content), "csv"))
+
+    assert rows == [
+        (
+            2,
+            {
+                "first_name": "Ivan",
+                "last_name": "Petrov",
+                "email": "ivan@example.com",
+                "phone_number": "+79990000000",
+                "campaign": "1",
+            },
+        ),
+        (
+            3,
+            {
+                "first_name": "Anna",
+                "last_name": "Ivanova",
+                "email": "anna@example.com",
+                "phone_number": "+79990000001",
+                "campaign": "2",
+            },
+        ),
+    ]
+
+
+def test_csv_reader_does_not_close_source_file() -> None:
+    file = io.BytesIO(b"first_name\nIvan\n")
+
+    list(read_lead_rows(file, "csv"))
+
+    assert not file.closed
+
+
+def test_xlsx_rows_skip_empty_lines() -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["first_name", "campaign"])
+    sheet.append(["Ivan", 1.0])
+    sheet.append([None, None])
+    sheet.append(["Anna", 2])
+    file = io.BytesIO()
+    workbook.save(file)
+    file.seek(0)
+
+    rows = list(read_lead_rows(file, "xlsx"))
+
+    assert rows == [
+        (2, {"first_name": "Ivan", "campaign": "1"}),
+        (4, {"first_name": "Anna", "campaign": "2"}),
+    ]
+
+
+def test_unsupported_format() -> None:
+    assert detect_format("Leads.XLSX") == "xlsx"
+    with pytest.raises(ValidationError):
+        detect_format("leads.json")
+
+
+def test_undecodable_csv_is_a_validation_error() -> None:
+    file = io.BytesIO("first_name\nИван\n".encode("cp1251"))
+
+    with pytest.raises(ValidationError, match="The CSV file could not be read"):
+        list(read_lead_rows(file, "csv"))
+
+
+def test_broken_xlsx_is_a_validation_error() -> None:
+    pytest.importorskip("openpyxl")
+
+    with pytest.raises(ValidationError, match="The XLSX file could not be read"):
+        list(read_lead_rows(io.BytesIO(b"not a zip archive"), "xlsx"))
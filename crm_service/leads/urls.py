@@ -2,6 +2,7 @@ from django.urls import path
 
 from .views import (
     LeadListView,
+    LeadExportView,
     LeadCreateView,
     LeadDetailView,
     LeadUpdateView,
@@ -12,6 +13,7 @@ app_name = "leads"
 
 urlpatterns = [
     path("", LeadListView.as_view(), name="leads_list"),
+    path("export/<str:file_format>/", LeadExportView.as_view(), name="leads_export"),
     path("new/", LeadCreateView.as_view(), name="leads_create"),
     path("<int:pk>/", LeadDetailView.as_view(), name="leads_detail"),
     path("<int:pk>/edit/", LeadUpdateView.as_view(), name="leads_edit"),
@@ -1,11 +1,11 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.http import HttpResponse, HttpRequest
 from django.shortcuts import redirect
 
 from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
 from django.views.generic import (
     ListView,
     DetailView,
@@ -13,23 +13,50 @@ from django.views.generic import (
     UpdateView,
 )
 
-from core.base import MyDeleteView
+from core.base import MyDeleteView, QuerySetShapingMixin
+from core.exports import ExportColumn, ExportView
 from .dto_lead import LeadCreateDTO, LeadUpdateDTO
 from .models import Lead
 from .forms import LeadForm
 from .services import LeadService
 
 
-class LeadListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class LeadListView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    ListView,
+):
     """Представление для списка лидов."""
 
     permission_required: str = "leads.view_lead"
     model: Lead = Lead
     context_object_name: str = "leads"
+    select_related_fields: tuple[str, ...] = ("customer",)
     paginate_by: int = 10
     ordering: tuple[str,] = ("-created_at",)
 
 
+class LeadExportView(ExportView):
+    """Потоковая выгрузка лидов с рекламной компанией в CSV или XLSX."""
+
+    permission_required: str = "leads.view_lead"
+    model: Lead = Lead
+    filename: str = "leads"
+    columns: tuple[ExportColumn, ...] = (
+        "id",
+        "last_name",
+        "first_name",
+        "middle_name",
+        "email",
+        "phone_number",
+        ("campaign__name", _("Campaign")),
+        "is_active",
+        ("customer__id", _("Customer")),
+        "created_at",
+    )
+
+
 class LeadCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     """Представление для создания нового лида."""
 
@@ -39,7 +66,7 @@ class LeadCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
 
     def form_valid(self, form: LeadForm) -> HttpResponse:
         """Если форма валидна, то устанавливаем того, кто создал лида, и возвращаем ответ дальше."""
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         dto = LeadCreateDTO(**form.cleaned_data, created_by=user)
         try:
             lead = LeadService.create_lead(dto)
@@ -50,12 +77,18 @@ class LeadCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
         return redirect("leads:leads_detail", pk=lead.pk)
 
 
-class LeadDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class LeadDetailView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    DetailView,
+):
     """Представление для отображения деталей лида."""
 
     permission_required = "leads.view_lead"
     model: Lead = Lead
     context_object_name: str = "lead"
+    select_related_fields: tuple[str, ...] = ("campaign",)
 
 
 class LeadUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
@@ -69,10 +102,10 @@ class LeadUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
 
     def form_valid(self, form: LeadForm) -> HttpResponse:
         """Если форма валидна, устанавливает того, кто проводит изменение данных."""
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         dto = LeadUpdateDTO(**form.cleaned_data, updated_by=user, id=self.object.pk)
         try:
-            lead = LeadService.update_lead(dto)
+            lead = LeadService.update_lead(dto, instance=self.object)
         except ValidationError as error:
             form.add_error(None, str(error))
             return self.form_invalid(form)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ServiceProductConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "service_product"
+
+    def ready(self) -> None:
+        """Подключает обработчики сигналов индекса автодополнения."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,285 @@
+"""
+Индекс названий услуг в памяти процесса для автодополнения.
+
+Индекс состоит из префиксного дерева по началам слов названия и триграммных
+списков (как в pg_trgm) для поиска с опечатками. Запрос проверяется как есть
+и в переключённой раскладке клавиатуры (utils.keyboard.switch_layout).
+
+Индекс строится при первом обращении и поддерживается сигналами
+post_save/post_delete (см. service_product.signals). Чтобы изменения,
+сделанные в других процессах, тоже были видны, каждое изменение увеличивает
+версию в кэше и записывает под новой версией id изменённой услуги.
+Процесс с устаревшей версией перечитывает из базы только услуги из этого
+журнала и перестраивает индекс целиком, лишь если журнал неполон.
+"""
+
+import re
+import threading
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+
+from utils.keyboard import switch_layout
+
+# (id услуги, название)
+Suggestion = tuple[int, str]
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _words(text: str) -> list[str]:
+    return WORD_PATTERN.findall(text.lower())
+
+
+def _trigrams(text: str) -> set[str]:
+    """Триграммы слов текста с дополнением пробелами, как в pg_trgm."""
+    trigrams = set()
+    for word in _words(text):
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_TrieNode"] = {}
+        self.ids: set[int] = set()
+
+
+class ProductNameIndex:
+    """
+    Индекс названий услуг: префиксное дерево и триграммные списки.
+
+    Сначала возвращаются услуги, у которых одно из слов начинается с запроса
+    (по алфавиту), затем - похожие по триграммам (по убыванию похожести).
+    """
+
+    version_key = "product_autocomplete:version"
+    change_key_prefix = "product_autocomplete:change"
+    # Процесс, отставший больше чем на change_log_size изменений
+    # или дольше change_log_timeout секунд, перестраивает индекс целиком.
+    change_log_size = 1000
+    change_log_timeout = 24 * 60 * 60
+    # Глубина префиксного дерева: более длинные запросы дофильтровываются
+    # по названию, чтобы дерево не росло вместе с длиной названий.
+    max_prefix_length = 16
+
+    def __init__(self, similarity_threshold: float = 0.3) -> None:
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.RLock()
+        self._version: Optional[int] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._names: dict[int, str] = {}
+        self._root = _TrieNode()
+        self._postings: dict[str, set[int]] = {}
+        self._trigram_counts: dict[int, int] = {}
+
+    def rebuild(self, products: Iterable[Suggestion]) -> None:
+        """Полностью перестраивает индекс по парам (id, название)."""
+        with self._lock:
+            self._reset()
+            for product_id, name in products:
+                self._add(product_id, name)
+
+    def add(self, product_id: int, name: str) -> None:
+        """Добавляет услугу в индекс или обновляет её название."""
+        with self._lock:
+            self._remove(product_id)
+            self._add(product_id, name)
+
+    def remove(self, product_id: int) -> None:
+        """Удаляет услугу из индекса."""
+        with self._lock:
+            self._remove(product_id)
+
+    def is_indexed(self, product_id: int, name: Optional[str]) -> bool:
+        """
+        Проверяет, что услуга уже в индексе с этим названием
+        (name=None - что её нет в индексе), а сам индекс построен.
+        """
+        with self._lock:
+            return self._version is not None and self._names.get(product_id) == name
+
+    def search(self, term: str, limit: int = 10) -> list[Suggestion]:
+        """Возвращает до limit подсказок для запроса во всех раскладках."""
+        variants = list(dict.fromkeys(v.lower() for v in switch_layout(term) if v))
+        with self._lock:
+            found: dict[int, None] = {}
+            for variant in variants:
+                for product_id in self._by_prefix(variant, limit):
+                    found.setdefault(product_id)
+            if len(found) < limit:
+                for product_id in self._by_trigrams(variants):
+                    found.setdefault(product_id)
+                    if len(found) >= limit:
+                        break
+            return [(pk, self._names[pk]) for pk in list(found)[:limit]]
+
+    def _add(self, product_id: int, name: str) -> None:
+        self._names[product_id] = name
+        for suffix in self._word_suffixes(name):
+            node = self._root
+            for char in suffix:
+                node = node.children.setdefault(char, _TrieNode())
+            node.ids.add(product_id)
+        trigrams = _trigrams(name)
+        self._trigram_counts[product_id] = len(trigrams)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(product_id)
+
+    def _remove(self, product_id: int) -> None:
+        name = self._names.pop(product_id, None)
+        if name is None:
+            return
+        for suffix in self._word_suffixes(name):
+            self._remove_from_trie(self._root, suffix, product_id)
+        del self._trigram_counts[product_id]
+        for trigram in _trigrams(name):
+            ids = self._postings.get(trigram)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del self._postings[trigram]
+
+    def _remove_from_trie(self, node: _TrieNode, suffix: str, product_id: int) -> bool:
+        """Удаляет id из ветки дерева, возвращает True, если узел опустел."""
+        if not suffix:
+            node.ids.discard(product_id)
+        else:
+            child = node.children.get(suffix[0])
+            if child is not None and self._remove_from_trie(
+                child, suffix[1:], product_id
+            ):
+                del node.children[suffix[0]]
+        return not node.ids and not node.children
+
+    def _word_suffixes(self, name: str) -> set[str]:
+        """Части названия от начала каждого слова, обрезанные до глубины дерева."""
+        text = name.lower()
+        return {
+            text[match.start() : match.start() + self.max_prefix_length]
+            for match in WORD_PATTERN.finditer(text)
+        }
+
+    def _matches_prefix(self, product_id: int, prefix: str) -> bool:
+        text = self._names[product_id].lower()
+        return any(
+            text.startswith(prefix, match.start())
+            for match in WORD_PATTERN.finditer(text)
+        )
+
+    def _by_prefix(self, prefix: str, limit: int) -> list[int]:
+        node = self._root
+        for char in prefix[: self.max_prefix_length]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        check_name = len(prefix) > self.max_prefix_length
+        found: dict[int, None] = {}
+        stack = [node]
+        while stack and len(found) < limit:
+            node = stack.pop()
+            for product_id in sorted(node.ids, key=self._names.__getitem__):
+                if not check_name or self._matches_prefix(product_id, prefix):
+                    found.setdefault(product_id)
+            stack.extend(
+                node.children[char] for char in sorted(node.children, reverse=True)
+            )
+        return list(found)[:limit]
+
+    def _by_trigrams(self, variants: list[str]) -> list[int]:
+        scores: dict[int, float] = {}
+        for variant in variants:
+            query = _trigrams(variant)
+            if not query:
+                continue
+            shared: dict[int, int] = {}
+            for trigram in query:
+                for product_id in self._postings.get(trigram, ()):
+                    shared[product_id] = shared.get(product_id, 0) + 1
+            for product_id, count in shared.items():
+                total = len(query) + self._trigram_counts[product_id] - count
+                similarity = count / total
+                if similarity >= self.similarity_threshold:
+                    scores[product_id] = max(scores.get(product_id, 0), similarity)
+        return sorted(scores, key=lambda product_id: -scores[product_id])
+
+    def ensure_current(self) -> None:
+        """
+        Строит индекс при первом обращении, а если он изменён другими
+        процессами - применяет изменения из журнала.
+        """
+        version = cache.get_or_set(self.version_key, 0, timeout=None)
+        if self._version == version:
+            return
+        from .models import Product
+
+        with self._lock:
+            if self._version == version:
+                return
+            changed = self._changed_ids(version)
+            if changed is None:
+                self.rebuild(
+                    Product.objects.filter(archived=False)
+                    .values_list("id", "name")
+                    .iterator()
+                )
+            else:
+                names = dict(
+                    Product.objects.filter(pk__in=changed, archived=False).values_list(
+                        "id", "name"
+                    )
+                )
+                for product_id in changed:
+                    if product_id in names:
+                        self.add(product_id, names[product_id])
+                    else:
+                        self.remove(product_id)
+            self._version = version
+
+    def mark_changed(self, product_id: Optional[int] = None) -> None:
+        """
+        Сообщает другим процессам об изменении услуги product_id;
+        без product_id (массовые изменения) их индексы перестраиваются целиком.
+        """
+        try:
+            version = cache.incr(self.version_key)
+        except ValueError:
+            version = None
+        if version is not None:
+            cache.set(
+                self.change_key(version), product_id, timeout=self.change_log_timeout
+            )
+        with self._lock:
+            if version is None or product_id is None:
+                self._version = None
+            elif self._version is not None and version == self._version + 1:
+                # Изменение этого процесса уже применено к индексу.
+                self._version = version
+
+    def change_key(self, version: int) -> str:
+        """Ключ записи журнала изменений для версии индекса."""
+        return f"{self.change_key_prefix}:{version}"
+
+    def _changed_ids(self, version: int) -> Optional[set[int]]:
+        """
+        Возвращает id услуг, изменённых после версии этого процесса,
+        или None, если журнал неполон и индекс нужно перестроить.
+        """
+        if self._version is None:
+            return None
+        behind = version - self._version
+        if not 0 < behind <= self.change_log_size:
+            return None
+        keys = [self.change_key(v) for v in range(self._version + 1, version + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys) or None in changes.values():
+            return None
+        return set(changes.values())
+
+
+product_name_index = ProductNameIndex()
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from service_product.models import Product
+from service_product.search import product_search_vector
+
+
+class Command(BaseCommand):
+    """
+    Команды:
+        ./manage.py rebuild_search_vectors
+
+        python manage.py rebuild_search_vectors --batch-size 50000 --only-missing
+
+    Заполняет поисковый вектор услуг (Product.search_vector).
+    Новые и изменённые услуги обновляет триггер базы данных, а существующие
+    заполняет миграция, поэтому команду нужно вызывать только после изменения
+    конфигурации поиска. Строки обновляются диапазонами id, каждый диапазон
+    в своей транзакции, чтобы не блокировать таблицу целиком.
+    """
+
+    help = "Backfill the full-text search vector of products."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="How many ids to update per query.",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Update only products without a search vector.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        products = Product.objects.all()
+        if options["only_missing"]:
+            products = products.filter(search_vector__isnull=True)
+
+        bounds = products.aggregate(first=Min("id"), last=Max("id"))
+        if bounds["first"] is None:
+            self.stdout.write("Nothing to update.")
+            return
+
+        batch_size = options["batch_size"]
+        updated = 0
+        for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+            updated += products.filter(id__gte=start, id__lt=start + batch_size).update(
+                search_vector=product_search_vector()
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated search vectors of {updated} products.")
+        )
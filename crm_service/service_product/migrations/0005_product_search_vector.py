@@ -0,0 +1,69 @@
+# Generated by Django 5.1.6 on 2026-10-17 22:25
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Триггер поддерживает search_vector при любой вставке и изменении названия
+# или описания, в том числе при bulk_create и queryset.update.
+# Существующие строки заполняет миграция (fill_search_vectors), после
+# изменения конфигурации поиска - команда ./manage.py rebuild_search_vectors.
+CREATE_TRIGGER = """
+CREATE FUNCTION service_products_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER service_products_search_vector_trigger
+BEFORE INSERT OR UPDATE OF name, description ON service_products
+FOR EACH ROW EXECUTE FUNCTION service_products_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS service_products_search_vector_trigger ON service_products;
+DROP FUNCTION IF EXISTS service_products_search_vector_update();
+"""
+
+
+def fill_search_vectors(apps, schema_editor):
+    """
+    Заполняет поисковый вектор существующих услуг тем же выражением,
+    что и триггер. Индекс строится после заполнения колонки.
+    """
+    Product = apps.get_model("service_product", "Product")
+    Product.objects.update(
+        search_vector=SearchVector("name", weight="A", config="russian")
+        + SearchVector("description", weight="B", config="russian")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_product", "0004_product_pagination_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="product_search_vector_gin"
+            ),
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+    ]
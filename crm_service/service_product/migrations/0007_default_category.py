@@ -0,0 +1,24 @@
+from django.db import migrations
+
+DEFAULT_CATEGORY_TITLE = "Other"
+
+
+def create_default_category(apps, schema_editor):
+    """Создаёт категорию по умолчанию, чтобы get_default_category не делал get_or_create."""
+    Category = apps.get_model("service_product", "Category")
+    if not Category.objects.filter(title=DEFAULT_CATEGORY_TITLE).exists():
+        Category.objects.create(
+            title=DEFAULT_CATEGORY_TITLE,
+            description="A common category for all products",
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_product", "0006_product_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_category, migrations.RunPython.noop),
+    ]
@@ -7,19 +7,29 @@ from django.db.models import (
     FloatField,
     BooleanField,
 )
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 from utils.mixins import TimestampMixin, ActorMixin
 
 
-def get_default_category():
+# Категория для услуг без категории, создаётся миграцией 0007_default_category.
+# Хранить лучше не перевод, а константу.
+DEFAULT_CATEGORY_TITLE = "Other"
+
+
+def get_default_category() -> int:
+    """
+    Возвращает pk категории по умолчанию.
+    Вызывается при создании каждой услуги без категории (в том числе в bulk_create),
+    поэтому pk берётся из кэша справочных данных: он хранится в памяти процесса
+    и сбрасывается во всех процессах при изменении категорий (см. core.reference_data).
+    """
     # импорт здесь, чтобы избежать циклов
-    from service_product.models import Category
-    obj, _ = Category.objects.get_or_create(
-        title="Other",  # хранить лучше не перевод, а константу
-        defaults={"description": "A common category for all products"},
-    )
-    return obj.pk  # можно вернуть и сам объект, и pk — FK примет оба варианта
+    from core.reference_data import reference_data
+
+    return reference_data.get("default_category")
 
 
 class Category(models.Model):
@@ -37,7 +47,9 @@ class Product(TimestampMixin, ActorMixin):
         cost (float): Стоимость услуги\n
         discount (int): Процент скидки на услугу (от 0 до 50)\n
         status (str): Статус услуги (активна, неактивна, в разработке)\n
-        archived (bool): Флаг, указывающий, архивирована ли услуга
+        archived (bool): Флаг, указывающий, архивирована ли услуга\n
+        search_vector (SearchVector): Поисковый вектор названия и описания,
+            заполняется триггером базы данных (см. service_product.search)
     """
 
     name: CharField = models.CharField(
@@ -89,6 +101,10 @@ class Product(TimestampMixin, ActorMixin):
         related_name="category",
         verbose_name=_("Category"),
     )
+    search_vector: SearchVectorField = SearchVectorField(
+        null=True,
+        editable=False,
+    )
 
     class Meta:
         """
@@ -99,12 +115,27 @@ class Product(TimestampMixin, ActorMixin):
             verbose_name_plural (str): Имя модели во множественном числе
             ordering (tuple): Порядок сортировки по умолчанию
             db_table (str): Имя таблицы в базе данных
+            indexes (list): Индексы под ключи курсорной пагинации API,
+                полнотекстовый и триграммный поиск
         """
 
         verbose_name: str = _("Product")
         verbose_name_plural: str = _("Products")
         ordering: tuple[str, str] = ("name", "created_at")
         db_table: str = "service_products"
+        indexes: list[models.Index] = [
+            models.Index(fields=["created_at", "id"], name="product_created_at_id_idx"),
+            models.Index(fields=["cost", "id"], name="product_cost_id_idx"),
+            GinIndex(fields=["search_vector"], name="product_search_vector_gin"),
+            GinIndex(
+                fields=["name"], opclasses=["gin_trgm_ops"], name="product_name_trgm_gin"
+            ),
+            GinIndex(
+                fields=["description"],
+                opclasses=["gin_trgm_ops"],
+                name="product_description_trgm_gin",
+            ),
+        ]
 
     def __str__(self) -> str:
         """Возвращает строковое представление объекта, а точнее название услуги."""
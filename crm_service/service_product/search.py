@@ -0,0 +1,116 @@
+"""
+Полнотекстовый поиск по услугам.
+
+Поисковый вектор хранится в колонке Product.search_vector (с GIN-индексом)
+и поддерживается триггером базы данных при вставке и изменении названия
+или описания, поэтому поиск не вычисляет to_tsvector для каждой строки.
+Название имеет вес A, описание - вес B.
+
+Нечёткий поиск (с опечатками и в неверной раскладке) использует
+триграммные GIN-индексы pg_trgm по названию и описанию.
+"""
+
+import threading
+import time
+from typing import Iterable, Optional
+
+from django.contrib.postgres.search import SearchVector, TrigramSimilarity
+from django.db import connection, transaction
+from django.db.models import Q
+
+from utils.keyboard import LayoutDetector
+from .models import Product
+
+SEARCH_CONFIG = "russian"
+
+# Корпус для частот биграмм: сколько услуг брать и как часто его обновлять.
+LAYOUT_CORPUS_SIZE = 5000
+LAYOUT_DETECTOR_TTL = 60 * 60
+
+_layout_detector: Optional[LayoutDetector] = None
+_layout_detector_built_at = 0.0
+_layout_detector_lock = threading.Lock()
+
+
+def product_search_vector() -> SearchVector:
+    """Выражение поискового вектора услуги, то же, что вычисляет триггер."""
+    return SearchVector("name", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "description", weight="B", config=SEARCH_CONFIG
+    )
+
+
+def search_products_by_similarity(
+    variants: Iterable[str], min_similarity: float, limit: int, offset: int = 0
+) -> list[Product]:
+    """
+    Нечёткий поиск услуг по нескольким вариантам запроса одним запросом.
+
+    Для каждого варианта строится выборка с оператором % (trigram_similar),
+    который использует GIN-индексы pg_trgm и отсекает кандидатов с похожестью
+    ниже pg_trgm.similarity_threshold. Выборки объединяются через UNION ALL
+    и сортируются по похожести (название + описание).
+    Услуга может попасть в выборку нескольких вариантов, поэтому берётся
+    с запасом и дубликаты отбрасываются с сохранением лучшей похожести.
+    min_similarity должен быть в пределах [0, 1], иначе ValueError.
+    """
+    if not 0 <= min_similarity <= 1:
+        raise ValueError(f"min_similarity must be between 0 and 1: {min_similarity}")
+    variants = list(dict.fromkeys(variant for variant in variants if variant))
+    if not variants:
+        return []
+
+    selections = [
+        Product.objects.filter(archived=False)
+        .filter(
+            Q(name__trigram_similar=variant) | Q(description__trigram_similar=variant)
+        )
+        .annotate(
+            similarity=TrigramSimilarity("name", variant)
+            + TrigramSimilarity("description", variant)
+        )
+        .defer("search_vector")
+        .order_by()
+        for variant in variants
+    ]
+    union = (
+        selections[0].union(*selections[1:], all=True).order_by("-similarity", "-id")
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Порог действует только до конца транзакции.
+        cursor.execute(
+            "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+            [str(min_similarity)],
+        )
+        rows = list(union[: (offset + limit) * len(variants)])
+
+    best: dict[int, Product] = {}
+    for product in rows:
+        best.setdefault(product.pk, product)
+    return list(best.values())[offset : offset + limit]
+
+
+def get_layout_detector() -> LayoutDetector:
+    """
+    Возвращает детектор раскладки, обученный на названиях и описаниях услуг.
+    Детектор хранится в памяти процесса и перестраивается раз в LAYOUT_DETECTOR_TTL.
+    """
+    global _layout_detector, _layout_detector_built_at
+
+    if (
+        _layout_detector is None
+        or time.monotonic() - _layout_detector_built_at > LAYOUT_DETECTOR_TTL
+    ):
+        with _layout_detector_lock:
+            if (
+                _layout_detector is None
+                or time.monotonic() - _layout_detector_built_at > LAYOUT_DETECTOR_TTL
+            ):
+                corpus = Product.objects.order_by("-id").values_list(
+                    "name", "description"
+                )[:LAYOUT_CORPUS_SIZE]
+                _layout_detector = LayoutDetector.from_texts(
+                    text for row in corpus for text in row
+                )
+                _layout_detector_built_at = time.monotonic()
+    return _layout_detector
@@ -1,6 +1,6 @@
 import re
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -40,8 +40,10 @@ class ProductService(BadWordsMixin, UserRoleService):
         return product
 
     @classmethod
-    def update_product(cls, dto: ProductUpdateDTO) -> Product:
-        """Обновление услуги"""
+    def update_product(
+        cls, dto: ProductUpdateDTO, instance: Optional[Product] = None
+    ) -> Product:
+        """Обновление услуги. instance - уже загруженная услуга, если есть."""
         try:
             cls.validate_product_data(dto)
         except ValidationError as error:
@@ -49,9 +51,7 @@ class ProductService(BadWordsMixin, UserRoleService):
             raise
 
         with transaction.atomic():
-            Product.objects.filter(id=dto.id).update(**dto.to_dict())
-            product = Product.objects.get(id=dto.id)
-            product.save()
+            product = cls._update_from_dto(Product, dto, instance)
 
         return product
 
@@ -0,0 +1,44 @@
+"""
+Поддержка индекса автодополнения услуг (service_product.autocomplete)
+в актуальном состоянии.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import product_name_index
+from .models import Product
+
+
+@receiver(post_save, sender=Product)
+def index_product_name(
+    sender, instance: Product, update_fields: frozenset | None = None, **kwargs
+) -> None:
+    """Добавляет услугу в индекс (или убирает архивную) после фиксации транзакции."""
+    if update_fields is not None and not {"name", "archived"} & update_fields:
+        return
+    product_id, name, archived = instance.pk, instance.name, instance.archived
+
+    def update_index() -> None:
+        if product_name_index.is_indexed(product_id, None if archived else name):
+            return
+        if archived:
+            product_name_index.remove(product_id)
+        else:
+            product_name_index.add(product_id, name)
+        product_name_index.mark_changed(product_id)
+
+    transaction.on_commit(update_index)
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product_name(sender, instance: Product, **kwargs) -> None:
+    """Удаляет услугу из индекса после фиксации транзакции."""
+    product_id = instance.pk
+
+    def update_index() -> None:
+        product_name_index.remove(product_id)
+        product_name_index.mark_changed(product_id)
+
+    transaction.on_commit(update_index)
@@ -0,0 +1,109 @@
+import pytest
+from django.core.cache import cache
+
+from service_product.autocomplete import ProductNameIndex
+from service_product.models import Product
+
+
+@pytest.fixture
+def index() -> ProductNameIndex:
+    index = ProductNameIndex()
+    index.rebuild(
+        [
+            (1, "Уборка офиса"),
+            (2, "Уборка квартиры"),
+            (3, "Ремонт офиса"),
+            (4, "Web design"),
+        ]
+    )
+    return index
+
+
+def test_prefix_matches_any_word_in_alphabetical_order(index) -> None:
+    assert index.search("офи") == [(3, "Ремонт офиса"), (1, "Уборка офиса")]
+    assert index.search("уборка к")[0] == (2, "Уборка квартиры")
+
+
+def test_wrong_keyboard_layout(index) -> None:
+    # "уборка" набранное в английской раскладке
+    assert [pk for pk, _ in index.search("e,jhrf")] == [2, 1]
+    # "web" набранное в русской раскладке
+    assert index.search("цуи") == [(4, "Web design")]
+
+
+def test_typos_are_found_by_trigrams(index) -> None:
+    assert index.search("web desing") == [(4, "Web design")]
+
+
+def test_index_follows_changes(index) -> None:
+    index.add(1, "Мойка окон")
+    index.remove(2)
+
+    assert index.search("убор") == []
+    assert index.search("мойк") == [(1, "Мойка окон")]
+
+
+def test_long_prefix_is_checked_against_name() -> None:
+    index = ProductNameIndex()
+    index.max_prefix_length = 4
+    index.rebuild([(1, "Консультация юриста"), (2, "Консервация")])
+
+    assert index.search("консуль") == [(1, "Консультация юриста")]
+
+
+@pytest.fixture
+def worker(db) -> ProductNameIndex:
+    """Индекс другого процесса, уже построенный по базе."""
+    index = ProductNameIndex()
+    index.ensure_current()
+    return index
+
+
+def test_other_process_applies_changes_without_rebuild(
+    worker, admin_user, django_capture_on_commit_callbacks, monkeypatch
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True):
+        renamed = Product.objects.create(name="Уборка", cost=100, created_by=admin_user)
+        archived = Product.objects.create(
+            name="Ремонт", cost=100, created_by=admin_user
+        )
+    worker.ensure_current()
+    monkeypatch.setattr(worker, "rebuild", pytest.fail)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        renamed.name = "Мойка окон"
+        renamed.save()
+        archived.archived = True
+        archived.save()
+    worker.ensure_current()
+
+    assert worker.search("мойк") == [(renamed.pk, "Мойка окон")]
+    assert worker.search("убор") == []
+    assert worker.search("ремо") == []
+
+
+def test_incomplete_change_log_rebuilds_index(
+    worker, admin_user, django_capture_on_commit_callbacks
+) -> None:
+    with django_capture_on_commit_callbacks(execute=True):
+        product = Product.objects.create(name="Уборка", cost=100, created_by=admin_user)
+    version = cache.get(ProductNameIndex.version_key)
+    cache.delete(worker.change_key(version))
+
+    worker.ensure_current()
+
+    assert worker.search("убор") == [(product.pk, "Уборка")]
+
+
+def test_bulk_change_rebuilds_index(worker, admin_user) -> None:
+    writer = ProductNameIndex()
+    writer.ensure_current()
+    product = Product.objects.bulk_create(
+        [Product(name="Уборка", cost=100, created_by=admin_user)]
+    )[0]
+
+    writer.mark_changed()
+    writer.ensure_current()
+    worker.ensure_current()
+
+    assert writer.search("убор") == worker.search("убор") == [(product.pk, "Уборка")]
@@ -0,0 +1,48 @@
+import pytest
+
+from core.reference_data import reference_data
+from service_product.models import (
+    DEFAULT_CATEGORY_TITLE,
+    Category,
+    Product,
+    get_default_category,
+)
+
+
+def cache_default_category(category_id: int) -> None:
+    """Кладёт pk в общий кэш под новой версией, как это сделал бы другой процесс."""
+    reference_data.invalidate("default_category")
+    version = reference_data.cache.get(reference_data.version_key("default_category"))
+    reference_data.cache.set(
+        reference_data.data_key("default_category", version), category_id
+    )
+
+
+def test_default_category_comes_from_reference_data() -> None:
+    cache_default_category(7)
+
+    assert get_default_category() == 7
+    assert Product(name="Audit").category_id == 7
+
+
+def test_default_category_follows_invalidation() -> None:
+    cache_default_category(7)
+    get_default_category()
+
+    cache_default_category(8)
+
+    assert get_default_category() == 8
+
+
+@pytest.mark.django_db
+def test_recreated_default_category(
+    admin_user, django_capture_on_commit_callbacks
+) -> None:
+    old_id = get_default_category()
+    with django_capture_on_commit_callbacks(execute=True):
+        Category.objects.filter(title=DEFAULT_CATEGORY_TITLE).delete()
+
+    product = Product.objects.create(name="Audit", cost=100, created_by=admin_user)
+
+    assert product.category.title == DEFAULT_CATEGORY_TITLE
+    assert product.category_id != old_id
@@ -0,0 +1,101 @@
+import importlib
+import io
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+
+from service_product.models import Product
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/products/get_full_text"
+
+
+@pytest.fixture
+def make_product(admin_user):
+    def make(name: str, description: str = "Description") -> Product:
+        return Product.objects.create(
+            name=name, description=description, cost=100, created_by=admin_user
+        )
+
+    return make
+
+
+def found(client, search: str) -> list[str]:
+    response = client.get(URL, {"search": search})
+    assert response.status_code == 200
+    return [product["name"] for product in response.json()]
+
+
+def vectors() -> dict[str, str]:
+    return dict(Product.objects.values_list("name", "search_vector"))
+
+
+def test_insert_fills_weighted_vector(admin_client, make_product) -> None:
+    make_product("Office cleaning", "Wet cleaning of premises")
+
+    vector = vectors()["Office cleaning"]
+    assert "'offic':1A" in vector
+    assert "'wet':3B" in vector
+    assert found(admin_client, "offices") == ["Office cleaning"]
+
+
+def test_update_of_name_and_description(admin_client, make_product) -> None:
+    product = make_product("Office cleaning")
+
+    product.name = "Window washing"
+    product.save()
+    assert found(admin_client, "windows") == ["Window washing"]
+    assert found(admin_client, "offices") == []
+
+    Product.objects.filter(pk=product.pk).update(description="Industrial climbing")
+    assert found(admin_client, "climbing") == ["Window washing"]
+
+
+def test_bulk_create_fills_vector(admin_client, admin_user) -> None:
+    Product.objects.bulk_create(
+        Product(
+            name=f"{item} repair",
+            description="Master visit",
+            cost=100,
+            created_by=admin_user,
+        )
+        for item in ("Roof", "Fence")
+    )
+
+    assert None not in vectors().values()
+    assert found(admin_client, "fences") == ["Fence repair"]
+
+
+def test_name_match_ranks_above_description_match(admin_client, make_product) -> None:
+    in_description = make_product("Cleaning", "Window washing and cleaning")
+    in_name = make_product("Window washing", "Same day visit")
+    assert in_description.pk < in_name.pk
+
+    assert found(admin_client, "washing") == ["Window washing", "Cleaning"]
+
+
+def test_rebuild_command_fills_missing_vectors(make_product) -> None:
+    make_product("Office cleaning")
+    make_product("Window washing")
+    Product.objects.filter(name="Window washing").update(search_vector=None)
+
+    stdout = io.StringIO()
+    call_command("rebuild_search_vectors", "--only-missing", stdout=stdout)
+
+    assert "Updated search vectors of 1 products." in stdout.getvalue()
+    assert "'window':1A" in vectors()["Window washing"]
+
+
+def test_migration_backfills_existing_products(admin_client, make_product) -> None:
+    migration = importlib.import_module(
+        "service_product.migrations.0005_product_search_vector"
+    )
+    make_product("Office cleaning")
+    Product.objects.update(search_vector=None)
+    assert found(admin_client, "offices") == []
+
+    migration.fill_search_vectors(apps, None)
+
+    assert found(admin_client, "offices") == ["Office cleaning"]
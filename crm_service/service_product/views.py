@@ -1,4 +1,3 @@
-from django.contrib.auth.models import User
 from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     PermissionRequiredMixin,
@@ -18,14 +17,19 @@ from django.views.generic import (
     UpdateView,
 )
 
-from core.base import MyDeleteView
+from core.base import MyDeleteView, QuerySetShapingMixin
 from .forms import ProductCreateForm
 from .models import Product
 from .dto_product import ProductCreateDTO, ProductUpdateDTO
 from .services import ProductService
 
 
-class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class ProductListView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    ListView,
+):
     """
     Представление для списка всех услуг.
     Пагинация настроена по выводу 10 услуг по умолчанию.
@@ -38,6 +42,7 @@ class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name: str = "service_product/products-list.html"
     queryset: QuerySet[Product, Product] = Product.objects.filter(archived=False)
     context_object_name: str = "products"
+    deferred_fields: tuple[str, ...] = ("description", "search_vector")
     paginate_by: int = 10
 
 
@@ -55,7 +60,7 @@ class ProductCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView)
          и создаём запись в базе данных.
         """
 
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         dto = ProductCreateDTO(**form.cleaned_data, created_by=user)
         try:
             product = ProductService.create_product(dto)
@@ -66,13 +71,19 @@ class ProductCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView)
         return redirect("service_product:service_detail", pk=product.pk)
 
 
-class ProductDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class ProductDetailView(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    QuerySetShapingMixin,
+    DetailView,
+):
     """Представление для отображения деталей услуги."""
 
     permission_required: str = "service_product.view_product"
     model: Product = Product
     template_name: str = "service_product/products-detail.html"
     context_object_name: str = "product"
+    deferred_fields: tuple[str, ...] = ("search_vector",)
 
 
 class ProductUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
@@ -87,10 +98,10 @@ class ProductUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateView)
         """
         Устанавливаем пользователя вносящего изменения, и обновляем данные об услуге.
         """
-        user = User.objects.get(id=self.request.user.pk)
+        user = self.request.user
         dto = ProductUpdateDTO(**form.cleaned_data, updated_by=user, id=self.object.pk)
         try:
-            product = ProductService.update_product(dto)
+            product = ProductService.update_product(dto, instance=self.object)
         except ValidationError as error:
             form.add_error(error.code, error.message)
             return self.form_invalid(form)
@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Административный интерфейс для модели Task."""
+
+    list_display: tuple = ("pk", "name", "status", "attempts", "run_at", "finished_at")
+    list_filter: tuple = ("status", "name")
+    search_fields: tuple = ("name", "dedup_key")
+    readonly_fields: tuple = ("created_at", "finished_at", "last_error")
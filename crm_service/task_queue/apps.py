@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TaskQueueConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "task_queue"
+
+    def ready(self) -> None:
+        """Регистрирует задачи из модулей tasks.py всех приложений."""
+        autodiscover_modules("tasks")
@@ -0,0 +1,174 @@
+"""
+Брокеры очереди задач.
+
+Брокер выбирается настройкой TASK_QUEUE_BROKER. По умолчанию используется
+DatabaseBroker: очередь хранится в таблице task_queue_task и не требует
+внешних сервисов, а задача, поставленная внутри транзакции, появляется
+в очереди только вместе с её данными. Другие брокеры (Redis, RabbitMQ)
+подключаются наследниками BaseBroker.
+"""
+
+import functools
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+from .registry import get_task
+
+logger = logging.getLogger("services")
+
+
+@dataclass
+class TaskMessage:
+    """Задача, полученная воркером от брокера."""
+
+    id: Any
+    name: str
+    kwargs: dict = field(default_factory=dict)
+    attempts: int = 1
+    max_attempts: int = 3
+
+
+class BaseBroker:
+    """Интерфейс брокера."""
+
+    def enqueue(
+        self,
+        name: str,
+        kwargs: dict,
+        *,
+        run_at: Optional[datetime] = None,
+        dedup_key: Optional[str] = None,
+        max_attempts: int = 3,
+    ) -> None:
+        """Ставит задачу в очередь."""
+        raise NotImplementedError
+
+    def reserve(self, limit: int) -> list[TaskMessage]:
+        """Берёт в работу до limit готовых задач."""
+        raise NotImplementedError
+
+    def complete(self, message: TaskMessage) -> None:
+        """Отмечает задачу выполненной."""
+        raise NotImplementedError
+
+    def retry(self, message: TaskMessage, error: str, delay: float) -> None:
+        """Возвращает задачу в очередь через delay секунд."""
+        raise NotImplementedError
+
+    def fail(self, message: TaskMessage, error: str) -> None:
+        """Отмечает задачу окончательно завершившейся ошибкой."""
+        raise NotImplementedError
+
+
+class DatabaseBroker(BaseBroker):
+    """
+    Очередь в базе данных.
+
+    Воркеры берут задачи через SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+    несколько воркеров не получают одну задачу и не ждут друг друга.
+    """
+
+    def enqueue(
+        self,
+        name: str,
+        kwargs: dict,
+        *,
+        run_at: Optional[datetime] = None,
+        dedup_key: Optional[str] = None,
+        max_attempts: int = 3,
+    ) -> None:
+        # ON CONFLICT DO NOTHING: повтор с тем же ключом не прерывает транзакцию.
+        Task.objects.bulk_create(
+            [
+                Task(
+                    name=name,
+                    kwargs=kwargs,
+                    dedup_key=dedup_key,
+                    max_attempts=max_attempts,
+                    run_at=run_at or timezone.now(),
+                )
+            ],
+            ignore_conflicts=dedup_key is not None,
+        )
+
+    def reserve(self, limit: int) -> list[TaskMessage]:
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                Task.objects.filter(
+                    status__in=(Task.Status.PENDING, Task.Status.RUNNING),
+                    run_at__lte=now,
+                )
+                .order_by("run_at")
+                .select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)[:limit]
+            )
+            if not ids:
+                return []
+            Task.objects.filter(pk__in=ids).update(
+                status=Task.Status.RUNNING,
+                run_at=now + timedelta(seconds=settings.TASK_QUEUE_LEASE),
+                attempts=F("attempts") + 1,
+            )
+            rows = Task.objects.filter(pk__in=ids).values_list(
+                "pk", "name", "kwargs", "attempts", "max_attempts"
+            )
+            return [TaskMessage(*row) for row in rows]
+
+    def complete(self, message: TaskMessage) -> None:
+        Task.objects.filter(pk=message.id).update(
+            status=Task.Status.DONE, finished_at=timezone.now(), last_error=""
+        )
+
+    def retry(self, message: TaskMessage, error: str, delay: float) -> None:
+        Task.objects.filter(pk=message.id).update(
+            status=Task.Status.PENDING,
+            run_at=timezone.now() + timedelta(seconds=delay),
+            last_error=error,
+        )
+
+    def fail(self, message: TaskMessage, error: str) -> None:
+        Task.objects.filter(pk=message.id).update(
+            status=Task.Status.FAILED, finished_at=timezone.now(), last_error=error
+        )
+
+
+class ImmediateBroker(BaseBroker):
+    """
+    Выполняет задачу в текущем процессе сразу после фиксации транзакции.
+    Подходит для разработки и тестов, когда воркер не запущен.
+    """
+
+    def enqueue(
+        self,
+        name: str,
+        kwargs: dict,
+        *,
+        run_at: Optional[datetime] = None,
+        dedup_key: Optional[str] = None,
+        max_attempts: int = 3,
+    ) -> None:
+        registered = get_task(name)
+        transaction.on_commit(lambda: registered(**kwargs), robust=True)
+
+    def reserve(self, limit: int) -> list[TaskMessage]:
+        return []
+
+
+@functools.cache
+def _load_broker(path: str) -> BaseBroker:
+    return import_string(path)()
+
+
+def get_broker() -> BaseBroker:
+    """Возвращает брокер из настройки TASK_QUEUE_BROKER."""
+    return _load_broker(settings.TASK_QUEUE_BROKER)
@@ -0,0 +1,52 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from task_queue.scheduler import Scheduler
+from task_queue.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Выполняет фоновые задачи и запускает периодические задачи по расписанию."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Сколько задач брать за одно обращение к брокеру.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+        parser.add_argument(
+            "--no-scheduler",
+            action="store_true",
+            help="Не ставить в очередь периодические задачи из TASK_QUEUE_SCHEDULE.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить одну порцию задач и завершиться.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        worker = Worker(
+            scheduler=None if options["no_scheduler"] else Scheduler(),
+            batch_size=options["batch_size"],
+        )
+        if options["once"]:
+            done = worker.run_once()
+            self.stdout.write(f"Processed {done} tasks.")
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        self.stdout.write("Task worker started.")
+        worker.run(stop, poll_interval=options["poll_interval"])
+        self.stdout.write("Task worker stopped.")
@@ -0,0 +1,86 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Task(models.Model):
+    """
+    Задача в очереди DatabaseBroker.
+
+    Взятая в работу задача получает статус RUNNING, а run_at сдвигается на
+    срок аренды: если воркер упадёт, задача снова станет доступной после
+    этого срока. Поэтому выборка готовых задач - один диапазонный запрос
+    по частичному индексу (status, run_at).
+
+    Атрибуты:
+        name (CharField): Имя зарегистрированной задачи.
+        kwargs (JSONField): Именованные аргументы задачи.
+        status (CharField): Состояние задачи.
+        dedup_key (CharField): Ключ, по которому в очередь не попадёт вторая такая же задача.
+        attempts (PositiveSmallIntegerField): Сколько раз задача бралась в работу.
+        max_attempts (PositiveSmallIntegerField): После стольких неудач задача не повторяется.
+        run_at (DateTimeField): Не раньше какого времени выполнять задачу.
+        last_error (TextField): Текст последней ошибки.
+        created_at (DateTimeField): Время постановки в очередь.
+        finished_at (DateTimeField): Время завершения или окончательной ошибки.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    name: models.CharField = models.CharField(max_length=150, verbose_name=_("Name"))
+    kwargs: models.JSONField = models.JSONField(
+        default=dict, encoder=DjangoJSONEncoder, verbose_name=_("Arguments")
+    )
+    status: models.CharField = models.CharField(
+        max_length=10,
+        choices=Status,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+    )
+    dedup_key: models.CharField = models.CharField(
+        max_length=255, null=True, blank=True, verbose_name=_("Deduplication key")
+    )
+    attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=0, verbose_name=_("Attempts")
+    )
+    max_attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=3, verbose_name=_("Max attempts")
+    )
+    run_at: models.DateTimeField = models.DateTimeField(
+        default=timezone.now, verbose_name=_("Run at")
+    )
+    last_error: models.TextField = models.TextField(
+        blank=True, verbose_name=_("Last error")
+    )
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    finished_at: models.DateTimeField = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Task")
+        verbose_name_plural = _("Tasks")
+        indexes = [
+            models.Index(
+                fields=["run_at"],
+                condition=Q(status__in=["pending", "running"]),
+                name="task_queue_ready_idx",
+            ),
+            models.Index(
+                fields=["finished_at"],
+                condition=Q(status__in=["done", "failed"]),
+                name="task_queue_finished_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"], name="task_queue_unique_dedup_key"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,92 @@
+"""
+Реестр фоновых задач.
+
+Задача - обычная функция с именованными аргументами, которые сериализуются
+в JSON. Декоратор task регистрирует её под именем "<приложение>.<функция>";
+модули tasks.py приложений импортируются при запуске (см. TaskQueueConfig).
+
+    @task(max_attempts=5)
+    def send_contract_created_email(contract_id: int) -> None: ...
+
+    send_contract_created_email.enqueue(contract_id=contract.pk)
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+
+class RegisteredTask:
+    """
+    Зарегистрированная задача.
+
+    Атрибуты:
+        func (Callable): Функция задачи.
+        name (str): Имя, под которым задача хранится в очереди.
+        max_attempts (int): Сколько раз выполнять задачу, пока она завершается ошибкой.
+    """
+
+    def __init__(self, func: Callable[..., Any], name: str, max_attempts: int) -> None:
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **kwargs) -> Any:
+        """Выполняет задачу синхронно, в текущем процессе."""
+        return self.func(**kwargs)
+
+    def enqueue(
+        self,
+        *,
+        run_at: Optional[datetime] = None,
+        dedup_key: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Ставит задачу в очередь брокера TASK_QUEUE_BROKER.
+        Args:
+            run_at: не раньше какого времени выполнять задачу
+            dedup_key: задача с уже использованным ключом в очередь не попадает
+            kwargs: аргументы задачи
+        """
+        from .brokers import get_broker
+
+        get_broker().enqueue(
+            self.name,
+            kwargs,
+            run_at=run_at,
+            dedup_key=dedup_key,
+            max_attempts=self.max_attempts,
+        )
+
+    def __repr__(self) -> str:
+        return f"<RegisteredTask {self.name}>"
+
+
+tasks: dict[str, RegisteredTask] = {}
+
+
+def task(
+    name: Optional[str] = None, *, max_attempts: int = 3
+) -> Callable[[Callable[..., Any]], RegisteredTask]:
+    """Декоратор, регистрирующий функцию как фоновую задачу."""
+
+    def decorator(func: Callable[..., Any]) -> RegisteredTask:
+        app_label = func.__module__.split(".")[0]
+        registered = RegisteredTask(
+            func, name or f"{app_label}.{func.__name__}", max_attempts
+        )
+        if tasks.get(registered.name, registered).func is not func:
+            raise ValueError(f"Task {registered.name!r} is already registered.")
+        tasks[registered.name] = registered
+        return registered
+
+    return decorator
+
+
+def get_task(name: str) -> RegisteredTask:
+    """Возвращает задачу по имени."""
+    try:
+        return tasks[name]
+    except KeyError:
+        raise KeyError(f"Task {name!r} is not registered.") from None
@@ -0,0 +1,46 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from .brokers import BaseBroker, get_broker
+
+logger = logging.getLogger("services")
+
+
+class Scheduler:
+    """
+    Периодический запуск задач из TASK_QUEUE_SCHEDULE ({имя задачи: период в секундах}).
+
+    Время делится на интервалы длиной в период, и в каждом интервале задача
+    ставится в очередь с ключом дедупликации "schedule:<имя>:<номер интервала>".
+    Поэтому планировщик можно запускать в каждом воркере: задача всё равно
+    попадёт в очередь один раз за период.
+    """
+
+    def __init__(
+        self,
+        schedule: Optional[dict[str, int]] = None,
+        broker: Optional[BaseBroker] = None,
+    ) -> None:
+        self.schedule = settings.TASK_QUEUE_SCHEDULE if schedule is None else schedule
+        self.broker = broker
+        self._last_slots: dict[str, int] = {}
+
+    def run_due(self, now: Optional[datetime] = None) -> list[str]:
+        """Ставит в очередь задачи, для которых начался новый интервал."""
+        now = now or timezone.now()
+        broker = self.broker or get_broker()
+        enqueued = []
+        for name, period in self.schedule.items():
+            slot = int(now.timestamp() // period)
+            if self._last_slots.get(name) == slot:
+                continue
+            broker.enqueue(name, {}, dedup_key=f"schedule:{name}:{slot}")
+            self._last_slots[name] = slot
+            enqueued.append(name)
+        if enqueued:
+            logger.info("Scheduled tasks: %s", ", ".join(enqueued))
+        return enqueued
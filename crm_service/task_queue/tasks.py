@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Task
+from .registry import task
+
+
+@task()
+def purge_finished() -> None:
+    """Удаляет завершённые задачи старше TASK_QUEUE_RETENTION секунд."""
+    cutoff = timezone.now() - timedelta(seconds=settings.TASK_QUEUE_RETENTION)
+    Task.objects.filter(
+        status__in=(Task.Status.DONE, Task.Status.FAILED), finished_at__lt=cutoff
+    ).delete()
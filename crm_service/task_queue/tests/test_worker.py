@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.conf import settings
+
+from task_queue.brokers import BaseBroker, TaskMessage
+from task_queue.registry import get_task, task, tasks
+from task_queue.scheduler import Scheduler
+from task_queue.worker import Worker
+
+
+class MemoryBroker(BaseBroker):
+    """Брокер в памяти: хранит очередь и записывает результаты."""
+
+    def __init__(self) -> None:
+        self.queue: list[TaskMessage] = []
+        self.enqueued: list[tuple[str, dict, str | None]] = []
+        self.results: list[tuple[str, object]] = []
+
+    def enqueue(self, name, kwargs, *, run_at=None, dedup_key=None, max_attempts=3):
+        if any(key == dedup_key for *__, key in self.enqueued if key is not None):
+            return
+        self.enqueued.append((name, kwargs, dedup_key))
+        self.queue.append(
+            TaskMessage(len(self.enqueued), name, kwargs, 0, max_attempts)
+        )
+
+    def reserve(self, limit):
+        reserved, self.queue = self.queue[:limit], self.queue[limit:]
+        for message in reserved:
+            message.attempts += 1
+        return reserved
+
+    def complete(self, message):
+        self.results.append(("done", message.id))
+
+    def retry(self, message, error, delay):
+        self.results.append(("retry", delay))
+        self.queue.append(message)
+
+    def fail(self, message, error):
+        self.results.append(("failed", error))
+
+
+calls: list[int] = []
+
+
+@task("tests.record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@task("tests.flaky", max_attempts=2)
+def flaky() -> None:
+    raise ConnectionError("SMTP is down")
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    calls.clear()
+    memory = MemoryBroker()
+    monkeypatch.setattr("task_queue.brokers.get_broker", lambda: memory)
+    return memory
+
+
+def test_enqueued_task_is_executed_by_worker(broker) -> None:
+    record.enqueue(value=1)
+    record.enqueue(value=2)
+
+    assert Worker(broker, batch_size=10).run_once() == 2
+    assert calls == [1, 2]
+    assert broker.results == [("done", 1), ("done", 2)]
+
+
+def test_failed_task_is_retried_with_backoff_then_failed(broker) -> None:
+    flaky.enqueue()
+    worker = Worker(broker)
+
+    worker.run_once()
+    worker.run_once()
+
+    assert broker.results == [
+        ("retry", settings.TASK_QUEUE_RETRY_DELAY),
+        ("failed", "ConnectionError: SMTP is down"),
+    ]
+
+
+def test_expired_lease_after_last_attempt_fails_without_running(broker) -> None:
+    Worker(broker).execute(TaskMessage(1, "tests.record", {"value": 1}, 4, 3))
+
+    assert calls == []
+    assert broker.results[0][0] == "failed"
+
+
+def test_unknown_task_fails(broker) -> None:
+    Worker(broker).execute(TaskMessage(1, "tests.missing", {}, 1, 1))
+
+    assert broker.results == [
+        ("failed", "KeyError: \"Task 'tests.missing' is not registered.\"")
+    ]
+
+
+def test_retry_delay_is_capped() -> None:
+    assert Worker.retry_delay(1) == settings.TASK_QUEUE_RETRY_DELAY
+    assert Worker.retry_delay(2) == settings.TASK_QUEUE_RETRY_DELAY * 2
+    assert Worker.retry_delay(50) == 60 * 60
+
+
+def test_scheduler_enqueues_once_per_period(broker) -> None:
+    first = Scheduler({"tests.record": 60}, broker)
+    second = Scheduler({"tests.record": 60}, broker)
+    start = datetime(2026, 1, 1, 12, 0, 5, tzinfo=timezone.utc)
+
+    assert first.run_due(start) == ["tests.record"]
+    assert first.run_due(start.replace(second=50)) == []
+    second.run_due(start.replace(second=50))
+    first.run_due(start.replace(minute=1))
+
+    assert [key for *__, key in broker.enqueued] == [
+        f"schedule:tests.record:{int(start.timestamp() // 60)}",
+        f"schedule:tests.record:{int(start.timestamp() // 60) + 1}",
+    ]
+
+
+def test_scheduled_tasks_are_registered() -> None:
+    for name in settings.TASK_QUEUE_SCHEDULE:
+        assert get_task(name).name == name
+
+
+def test_task_name_collision_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        task("tests.record")(lambda value: None)
+    assert tasks["tests.record"] is record
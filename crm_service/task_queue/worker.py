@@ -0,0 +1,77 @@
+import logging
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .brokers import BaseBroker, TaskMessage, get_broker
+from .registry import get_task
+from .scheduler import Scheduler
+
+logger = logging.getLogger("services")
+
+
+class Worker:
+    """
+    Воркер очереди: берёт задачи у брокера порциями и выполняет их.
+
+    Задача, завершившаяся ошибкой, повторяется с экспоненциальной задержкой,
+    пока не исчерпает max_attempts. Задача, чья аренда истекла (воркер упал
+    во время выполнения), считается неудачной попыткой.
+    """
+
+    def __init__(
+        self,
+        broker: Optional[BaseBroker] = None,
+        scheduler: Optional[Scheduler] = None,
+        batch_size: int = 10,
+    ) -> None:
+        self.broker = broker or get_broker()
+        self.scheduler = scheduler
+        self.batch_size = batch_size
+
+    def run(self, stop: threading.Event, poll_interval: float = 1.0) -> None:
+        """Выполняет задачи, пока не установлен stop; без задач ждёт poll_interval."""
+        while not stop.is_set():
+            close_old_connections()
+            if not self.run_once():
+                stop.wait(poll_interval)
+        close_old_connections()
+
+    def run_once(self) -> int:
+        """Выполняет одну порцию задач и возвращает её размер."""
+        if self.scheduler is not None:
+            self.scheduler.run_due()
+        messages = self.broker.reserve(self.batch_size)
+        for message in messages:
+            self.execute(message)
+        return len(messages)
+
+    def execute(self, message: TaskMessage) -> None:
+        """Выполняет задачу и сообщает брокеру результат."""
+        if message.attempts > message.max_attempts:
+            self.broker.fail(message, "Lease expired after the last attempt.")
+            logger.error("Task %s #%s lease expired", message.name, message.id)
+            return
+        try:
+            registered = get_task(message.name)
+            registered(**message.kwargs)
+        except Exception as error:
+            text = f"{type(error).__name__}: {error}"
+            if message.attempts >= message.max_attempts:
+                self.broker.fail(message, text)
+                logger.exception("Task %s #%s failed", message.name, message.id)
+            else:
+                self.broker.retry(message, text, self.retry_delay(message.attempts))
+                logger.warning(
+                    "Task %s #%s will be retried: %s", message.name, message.id, text
+                )
+        else:
+            self.broker.complete(message)
+            logger.info("Task %s #%s done", message.name, message.id)
+
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        """Задержка перед повтором: TASK_QUEUE_RETRY_DELAY, удваиваемая с каждой попыткой."""
+        return min(settings.TASK_QUEUE_RETRY_DELAY * 2 ** (attempts - 1), 60 * 60)
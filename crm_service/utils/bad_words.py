@@ -0,0 +1,106 @@
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class BadWordsMatcher:
+    """
+    Автомат Ахо-Корасик для поиска запрещённых слов.
+
+    Строится один раз по списку слов и проверяет текст за один линейный проход,
+    независимо от количества слов в списке.
+
+    Режимы поиска:
+        whole_words=True: слово должно быть отделено от соседних символов
+            не буквенно-цифровыми символами ("spam!" и "spam-offer" найдут "spam",
+            а "spammer" - нет).
+        whole_words=False: поиск подстроки, например внутри адреса сайта
+            ("myspamshop.com" найдёт "spam").
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._transitions: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # длины слов, которые заканчиваются в состоянии (с учётом fail-ссылок)
+        self._outputs: list[tuple[int, ...]] = [()]
+        for word in words:
+            word = word.strip().lower()
+            if word:
+                self._add_word(word)
+        self._build_fail_links()
+
+    def _add_word(self, word: str) -> None:
+        """Добавляет слово в бор."""
+        state = 0
+        for char in word:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][char] = next_state
+                self._transitions.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = next_state
+        self._outputs[state] += (len(word),)
+
+    def _build_fail_links(self) -> None:
+        """Строит fail-ссылки обходом бора в ширину."""
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._transitions[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._transitions[fail]:
+                    fail = self._fail[fail]
+                fallback = self._transitions[fail].get(char, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                self._outputs[next_state] += self._outputs[self._fail[next_state]]
+
+    def contains(self, text: Optional[str], whole_words: bool = True) -> bool:
+        """Проверяет, содержит ли текст хотя бы одно запрещённое слово."""
+        if not text:
+            return False
+        text = text.lower()
+        last_index = len(text) - 1
+        transitions, fail, outputs = self._transitions, self._fail, self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            for length in outputs[state]:
+                if not whole_words:
+                    return True
+                start = index - length + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                    index == last_index or not text[index + 1].isalnum()
+                ):
+                    return True
+        return False
+
+
+_matcher: Optional[BadWordsMatcher] = None
+_matcher_source: Optional[tuple[Path, int]] = None
+_matcher_lock = threading.Lock()
+
+
+def get_bad_words_matcher(file_with_words: Path) -> BadWordsMatcher:
+    """
+    Возвращает скомпилированный автомат для файла со словами.
+
+    Автомат хранится в памяти процесса и перестраивается только тогда,
+    когда меняется путь к файлу или время его изменения.
+    """
+    global _matcher, _matcher_source
+
+    source = (Path(file_with_words), os.stat(file_with_words).st_mtime_ns)
+    if _matcher is None or _matcher_source != source:
+        with _matcher_lock:
+            if _matcher is None or _matcher_source != source:
+                with open(file=file_with_words, mode="r", encoding="utf-8") as file:
+                    _matcher = BadWordsMatcher(file)
+                _matcher_source = source
+    return _matcher
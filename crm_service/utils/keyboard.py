@@ -1,4 +1,8 @@
 # utils/keyboard.py
+import math
+import re
+from collections import Counter
+from typing import Iterable
 
 EN_RU_MAP = {
     # буквы
@@ -42,3 +46,109 @@ def switch_layout(text: str) -> tuple[str, str, str]:
     if not t:
         return "", "", ""
     return t, t.translate(EN2RU), t.translate(RU2EN)
+
+
+def switch_layout_many(terms: Iterable[str]) -> list[tuple[str, str, str]]:
+    """
+    Пакетный вариант switch_layout: (оригинал, en->ru, ru->en) для каждого запроса.
+    Все запросы переводятся одним вызовом str.translate на раскладку.
+    """
+    terms = [(term or "").strip().replace("\n", " ") for term in terms]
+    joined = "\n".join(terms)
+    en2ru = joined.translate(EN2RU).split("\n")
+    ru2en = joined.translate(RU2EN).split("\n")
+    return [
+        (term, en, ru) if term else ("", "", "")
+        for term, en, ru in zip(terms, en2ru, ru2en)
+    ]
+
+
+class LayoutDetector:
+    """
+    Выбор наиболее правдоподобного варианта запроса среди раскладок.
+
+    Каждый вариант оценивается средней логарифмической вероятностью
+    биграмм символов (P(b | a), со сглаживанием), посчитанных по корпусу
+    текстов, например по названиям и описаниям услуг. Текст, набранный
+    в неверной раскладке, состоит из редких сочетаний букв
+    (и знаков препинания внутри слов) и получает низкую оценку.
+    """
+
+    # Граница слова, чтобы учитывать типичные начала и окончания слов.
+    boundary = " "
+    # Минимум биграмм в корпусе, при котором оценкам можно доверять.
+    min_corpus_bigrams = 500
+
+    def __init__(self, bigrams: Counter, unigrams: Counter) -> None:
+        self._bigrams = bigrams
+        self._unigrams = unigrams
+        self._alphabet_size = max(len(unigrams), 1)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> "LayoutDetector":
+        """Строит таблицы частот биграмм по корпусу текстов."""
+        bigrams: Counter = Counter()
+        unigrams: Counter = Counter()
+        for text in texts:
+            for word in cls._words(text):
+                unigrams.update(word[:-1])
+                bigrams.update(zip(word, word[1:]))
+        return cls(bigrams, unigrams)
+
+    @classmethod
+    def _words(cls, text: str) -> list[str]:
+        """Слова текста в нижнем регистре с границами (знаки внутри слова сохраняются)."""
+        return [
+            f"{cls.boundary}{word}{cls.boundary}"
+            for word in re.split(r"\s+", (text or "").lower())
+            if word
+        ]
+
+    @property
+    def is_trained(self) -> bool:
+        """Достаточно ли корпуса, чтобы отбрасывать варианты."""
+        return self._bigrams.total() >= self.min_corpus_bigrams
+
+    def score(self, text: str) -> float:
+        """Средний логарифм вероятности биграмм текста (чем больше, тем правдоподобнее)."""
+        log_probability, count = 0.0, 0
+        for word in self._words(text):
+            for pair in zip(word, word[1:]):
+                log_probability += math.log(
+                    (self._bigrams[pair] + 1)
+                    / (self._unigrams[pair[0]] + self._alphabet_size)
+                )
+                count += 1
+        return log_probability / count if count else -math.inf
+
+    def best_variants(
+        self, text: str, limit: int = 2, margin: float = 1.0
+    ) -> list[str]:
+        """
+        Возвращает до limit самых правдоподобных вариантов запроса
+        (как есть, en->ru, ru->en), лучший - первым.
+        Следующие варианты возвращаются, только если их оценка отстаёт
+        от лучшей не больше чем на margin. Пока корпус мал,
+        возвращаются все варианты без отбора.
+        """
+        variants = list(dict.fromkeys(v for v in switch_layout(text) if v))
+        return self._pick(variants, limit, margin)
+
+    def best_variants_many(
+        self, texts: Iterable[str], limit: int = 2, margin: float = 1.0
+    ) -> list[list[str]]:
+        """Пакетный вариант best_variants для списка запросов."""
+        return [
+            self._pick(list(dict.fromkeys(v for v in variants if v)), limit, margin)
+            for variants in switch_layout_many(texts)
+        ]
+
+    def _pick(self, variants: list[str], limit: int, margin: float) -> list[str]:
+        if not self.is_trained or len(variants) < 2:
+            return variants
+        scores = {variant: self.score(variant) for variant in variants}
+        ranked = sorted(variants, key=scores.__getitem__, reverse=True)
+        best = scores[ranked[0]]
+        return [
+            variant for variant in ranked[:limit] if best - scores[variant] <= margin
+        ]
@@ -0,0 +1,39 @@
+import os
+
+from utils.bad_words import BadWordsMatcher, get_bad_words_matcher
+
+
+def test_matcher_respects_word_boundaries():
+    matcher = BadWordsMatcher(["spam", "free money"])
+
+    assert matcher.contains("Buy SPAM now")
+    assert matcher.contains("spam-offer!")
+    assert matcher.contains("Get free money today")
+    assert not matcher.contains("spammer")
+    assert not matcher.contains("")
+
+
+def test_matcher_substring_mode_finds_words_inside_urls():
+    matcher = BadWordsMatcher(["spam", "he", "she", "hers"])
+
+    assert matcher.contains("https://myspamshop.com", whole_words=False)
+    assert matcher.contains("ushers", whole_words=False)
+    assert not matcher.contains("https://example.com", whole_words=False)
+
+
+def test_matcher_is_rebuilt_when_file_changes(tmp_path):
+    words_file = tmp_path / "bad_words.txt"
+    words_file.write_text("spam\n", encoding="utf-8")
+
+    matcher = get_bad_words_matcher(words_file)
+    assert get_bad_words_matcher(words_file) is matcher
+    assert matcher.contains("spam")
+
+    words_file.write_text("scam\n", encoding="utf-8")
+    stat = words_file.stat()
+    os.utime(words_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    reloaded = get_bad_words_matcher(words_file)
+    assert reloaded is not matcher
+    assert reloaded.contains("scam")
+    assert not reloaded.contains("spam")
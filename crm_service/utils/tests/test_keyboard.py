@@ -0,0 +1,51 @@
+import pytest
+
+from utils.keyboard import LayoutDetector, switch_layout, switch_layout_many
+
+CORPUS = [
+    "Уборка офиса и квартиры после ремонта",
+    "Ремонт компьютеров и настройка сети",
+    "Консультация юриста по договору поставки",
+    "Разработка сайта и поддержка интернет магазина",
+    "Привет, это услуга доставки продуктов на дом",
+    "Web design and website development for small business",
+    "Search engine optimization and online marketing services",
+    "Cleaning services for offices and apartments",
+] * 5
+
+
+@pytest.fixture(scope="module")
+def detector() -> LayoutDetector:
+    return LayoutDetector.from_texts(CORPUS)
+
+
+def test_switch_layout_many_matches_switch_layout() -> None:
+    terms = ["ghbdtn", "руддщ", "", "Уборка офиса"]
+
+    assert switch_layout_many(terms) == [switch_layout(term) for term in terms]
+
+
+def test_wrong_layout_variant_is_preferred(detector) -> None:
+    assert detector.best_variants("ghbdtn")[0] == "привет"
+    assert detector.best_variants("eckeuf")[0] == "услуга"
+    assert detector.best_variants("вуышпт")[0] == "design"
+
+
+def test_correct_query_is_kept_and_garbage_dropped(detector) -> None:
+    variants = detector.best_variants("уборка офиса")
+
+    assert variants[0] == "уборка офиса"
+    assert "e,jhrf jabcf" not in variants
+
+
+def test_batch_detection(detector) -> None:
+    assert [v[0] for v in detector.best_variants_many(["ghbdtn", "cleaning"])] == [
+        "привет",
+        "cleaning",
+    ]
+
+
+def test_small_corpus_returns_all_variants() -> None:
+    detector = LayoutDetector.from_texts(["привет"])
+
+    assert detector.best_variants("ghbdtn") == ["ghbdtn", "привет"]